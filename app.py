@@ -7,7 +7,7 @@ import os
 import math
 from datetime import date
 from modules.database import init_db
-from modules.models import BookStatus
+from modules.models import BookStatus, BookFilters, SortOrder
 from modules import services
 import views.list_view
 import views.book_detail
@@ -71,14 +71,10 @@ def set_page(page_num):
     update_page_state(page_num)
 
 # --- 資料準備 ---
-all_books = services.get_books()
-
-total_count = len(all_books)
-this_month_count = len([
-    b for b in all_books 
-    if b.added_date and b.added_date.year == date.today().year and b.added_date.month == date.today().month
-])
-all_tags = sorted(list(set(tag for book in all_books for tag in book.tags)))
+# // 【關鍵修正點】 統計與篩選選項改由 SQL 計算，不再每次 rerun 載入整個書庫
+total_count = services.count_books()
+this_month_count = services.count_books(BookFilters(added_from=date.today().replace(day=1)))
+all_tags = services.get_all_tags()
 
 # --- UI 結構: 側邊欄 ---
 with st.sidebar:
@@ -109,10 +105,11 @@ with st.sidebar:
     st.divider()
 
     st.title("篩選器")
-    search_query = st.text_input("關鍵字搜尋", placeholder="書名或作者...", on_change=reset_page)
+    search_query = st.text_input("關鍵字搜尋", placeholder="書名、作者、文案或心得...", on_change=reset_page)
     tag_filter = st.multiselect("標籤篩選", options=all_tags, default=[], on_change=reset_page)
-    sort_order = st.selectbox("排序方式", ["最新入庫", "最早入庫"], on_change=reset_page)
+    sort_order = st.selectbox("排序方式", options=[s for s in SortOrder], format_func=lambda x: x.value, on_change=reset_page)
     status_filter = st.multiselect("閱讀狀態", options=[s for s in BookStatus], format_func=lambda x: x.value, on_change=reset_page)
+    author_filter = st.multiselect("作者篩選", options=services.get_all_authors(), default=[], on_change=reset_page)
     
     st.divider()
     
@@ -172,51 +169,25 @@ st.divider()
 
 # --- 資料過濾與排序 (僅在非設定模式下需要) ---
 if st.session_state.view_mode != "settings":
-    filtered_books = all_books
-    if tag_filter:
-        filtered_books = [b for b in filtered_books if any(tag in b.tags for tag in tag_filter)]
-    if status_filter:
-        filtered_books = [b for b in filtered_books if b.status in status_filter]
-    if search_query:
-        filtered_books = [b for b in filtered_books if search_query in b.title or search_query in b.author]
-
-    def get_key(obj, attr):
-        val = getattr(obj, attr)
-        return val if val else ""
-
-    if sort_order == "最新入庫":
-        # === 複合排序策略 (最新優先，但同日期時作者/書名要 A-Z) ===
-        # Python 的 sort 是穩定的 (Stable)，所以我們要「倒著」寫次要條件
-        
-        # 3. 最次要：書名 (正向 A -> Z)
-        filtered_books.sort(key=lambda x: get_key(x, "title"))
-        
-        # 2. 次要：作者 (正向 A -> Z)
-        filtered_books.sort(key=lambda x: get_key(x, "author"))
-        
-        # 1. 最主要：日期 (反向 新 -> 舊)
-        filtered_books.sort(key=lambda x: x.added_date, reverse=True)
-        
-    else:
-        # === 最早入庫 (全部正向) ===
-        # 日期(舊->新) -> 作者(A->Z) -> 書名(A->Z)
-        filtered_books.sort(key=lambda x: (
-            x.added_date, 
-            get_key(x, "author"), 
-            get_key(x, "title")
-        ))
+    # // 【關鍵修正點】 篩選、複合排序 (日期 -> 作者 -> 書名) 與分頁皆下推至 SQL
+    filters = BookFilters(tags=tag_filter, statuses=status_filter, authors=author_filter, keyword=search_query)
 
     # 分頁運算
     items_limit = st.session_state.items_per_page
-    total_items = len(filtered_books)
+    total_items = services.count_books(filters)
     total_pages = math.ceil(total_items / items_limit) if total_items > 0 else 1
 
     if st.session_state.current_page > total_pages:
         st.session_state.current_page = total_pages
 
-    start_idx = (st.session_state.current_page - 1) * items_limit
-    end_idx = start_idx + items_limit
-    current_page_books = filtered_books[start_idx:end_idx]
+    if st.session_state.view_mode == "calendar":
+        # 日曆/儀表板需要完整的篩選結果
+        filtered_books = services.query_book_summaries(filters, sort_order)
+        current_page_books = []
+    else:
+        start_idx = (st.session_state.current_page - 1) * items_limit
+        # 列表/畫廊只讀取摘要欄位，完整資料於開啟詳情時再載入
+        current_page_books = services.query_book_summaries(filters, sort_order, limit=items_limit, offset=start_idx)
 else:
     # 設定模式下，初始化一些變數避免報錯 (雖然不會用到)
     total_items = 0
@@ -276,7 +247,8 @@ elif st.session_state.view_mode == "gallery":
     views.gallery_view.render_view(current_page_books, cols_num=5)
 
 elif st.session_state.view_mode == "calendar":
-    views.calendar_view.render_view(filtered_books)
+    views.calendar_view.render_view(filtered_books, tag_counts=services.get_tag_counts(10, filters),
+                                    kpi=services.get_kpi_stats(filters))
 
 elif st.session_state.view_mode == "settings":
     # // 【關鍵修正點】 渲染設定頁面
@@ -2,29 +2,40 @@
 # 修正原因：透過正則表達式移除書名中的括號與備註內容，確保比對時只針對核心書名，防止重複匯入。
 # 替換/新增指示：請完全覆蓋 batch_importer.py。
 
+import asyncio
 import os
-import time
 import pandas as pd
 import uuid
 import random
 import re
+import time
 from datetime import datetime, date, timedelta
 from difflib import SequenceMatcher
-from opencc import OpenCC
 from dataclasses import dataclass
-from typing import Optional, List
+from typing import Iterable, List, Optional
 
-from modules import scraper, ai_agent, database
+from modules import scraper, ai_agent, ai_pool, database, text_normalize, resilience
 from modules.scraper import RawBookData
 from modules.models import Book, BookStatus
 
-cc = OpenCC('s2twp')
+CC_CONFIG = 's2twp'
+_BRACKETED_RE = re.compile(r'[\(\[\{【（].*?[\)\]\}】）]')
+_STATUS_SUFFIX_RE = re.compile(r'(全文完|完結|連載中|番外)')
+_PUNCTUATION_RE = re.compile(r'[ 　，,《》【】\[\]「」:：]')
 
 # ==========================================
 # 0. 使用者設定
 # ==========================================
 DATE_STRATEGY = "NONE" 
 DEFAULT_RATING_SOURCE_B = 0 
+DB_FLUSH_SIZE = 50  # 累積多少本後批次寫入資料庫 (單一交易)
+
+# 匯入管線 (run_pipeline) 各階段的並行數與佇列上限
+SCRAPE_CONCURRENCY = 16               # 同時爬取的網址數 (各網站另受站點註冊的 limit 限制)
+AI_CONCURRENCY = ai_pool.AI_WORKERS   # 同時進行的 AI 批次請求 (另受 RPM/TPM 配額限制)
+QUEUE_SIZE = 100                      # 階段之間的佇列上限；下游塞滿時上游暫停 (背壓)
+BATCH_WAIT_SECONDS = 2.0              # AI / 入庫階段湊滿一批的最長等待時間
+PROGRESS_INTERVAL = 5.0               # 進度與吞吐量的列印間隔 (秒)
 
 # ==========================================
 # 1. 資料結構與比對
@@ -41,30 +52,45 @@ class CsvBookCandidate:
     original_source: str
     completed_date: Optional[date] = None
 
+@dataclass
+class BookDraft:
+    """已完成爬取與驗證、等待 AI 分析的書籍"""
+    candidate: CsvBookCandidate
+    title: str
+    author: str
+    source_name: str
+    url: str
+    desc: str
+    user_review: str
+    ai_input: Optional[RawBookData]
+
 def normalize_text(text: str, aggressive=False) -> str:
     """
     正規化字串
     aggressive=True: 暴力模式，移除所有括號及其內容 (ex: "書名(全)" -> "書名")
     """
     if not text: return ""
-    text = cc.convert(str(text))
+    text = text_normalize.convert(str(text), CC_CONFIG)
     
     if aggressive:
         # 移除括號內的內容 (包含括號本身)
         # 支援: (), [], {}, 【】, （）
-        text = re.sub(r'[\(\[\{【（].*?[\)\]\}】）]', '', text)
+        text = _BRACKETED_RE.sub('', text)
         # 移除常見後綴
-        text = re.sub(r'(全文完|完結|連載中|番外)', '', text)
+        text = _STATUS_SUFFIX_RE.sub('', text)
 
     # 移除標點與空白
-    for char in [" ", "　", "，", ",", "《", "》", "【", "】", "[", "]", "「", "」", ":", "："]:
-        text = text.replace(char, "")
+    text = _PUNCTUATION_RE.sub('', text)
         
     return text.lower()
 
 def to_traditional(text: str) -> str:
     if not text: return ""
-    return cc.convert(str(text))
+    return text_normalize.convert(str(text), CC_CONFIG)
+
+def to_traditional_many(texts: List[str]) -> List[str]:
+    """批次簡轉繁 (一次 OpenCC 呼叫)"""
+    return text_normalize.convert_many([str(t) if t else "" for t in texts], CC_CONFIG)
 
 def verify_identity(csv_book: CsvBookCandidate, scraped_data: RawBookData) -> tuple[bool, str]:
     # 作者比對
@@ -158,60 +184,85 @@ def load_source_b_booklist(file_path: str) -> List[CsvBookCandidate]:
 # ==========================================
 # 3. 主匯入邏輯
 # ==========================================
-def process_candidate(candidate: CsvBookCandidate, existing_books: dict, report_list: list):
-    print(f"\n📘 正在處理：{candidate.title} / {candidate.author}")
-    
-    # --- 1. 暴力重複檢查 ---
-    cand_key_norm = f"{normalize_text(candidate.title, aggressive=True)}_{normalize_text(candidate.author)}"
-    
-    for b in existing_books.values():
-        # 如果網址完全一樣 -> 擋
-        if candidate.url and "http" in candidate.url and b.url == candidate.url:
-            print(f"   ⏭️ 跳過：網址已存在")
-            return "SKIPPED_URL_EXIST"
-            
-        # 如果 書名+作者 (經過清洗) 一樣 -> 擋
-        db_key_norm = f"{normalize_text(b.title, aggressive=True)}_{normalize_text(b.author)}"
-        if cand_key_norm == db_key_norm:
-             print(f"   ⏭️ 跳過：書名與作者已存在 ({b.title})")
-             return "SKIPPED_TITLE_EXIST"
+class DuplicateIndex:
+    """既有書籍的網址與正規化 (書名, 作者) 鍵；只建立一次，每筆候選的重複檢查為 O(1)"""
+    def __init__(self, books: Iterable[Book]):
+        self.urls = set()
+        self.titles = {}  # {(書名, 作者): 原書名}
+        for b in books:
+            if b.url: self.urls.add(b.url)
+            self.titles.setdefault(self.key(b.title, b.author), b.title)
 
-    # --- 2. 爬取與驗證 ---
-    scraped_data = None
+    @staticmethod
+    def key(title: str, author: str) -> tuple:
+        # 書名開啟暴力清洗模式 (移除括號與狀態後綴)
+        return normalize_text(title, aggressive=True), normalize_text(author)
+
+def find_duplicate(candidate: CsvBookCandidate, existing: DuplicateIndex, verbose: bool = True) -> Optional[str]:
+    """暴力重複檢查：回傳跳過原因 (SKIPPED_*)，不重複時回傳 None"""
+    # 如果網址完全一樣 -> 擋
+    if candidate.url and "http" in candidate.url and candidate.url in existing.urls:
+        if verbose: print("   ⏭️ 跳過：網址已存在")
+        return "SKIPPED_URL_EXIST"
+
+    # 如果 書名+作者 (經過清洗) 一樣 -> 擋
+    title = existing.titles.get(existing.key(candidate.title, candidate.author))
+    if title is not None:
+        if verbose: print(f"   ⏭️ 跳過：書名與作者已存在 ({title})")
+        return "SKIPPED_TITLE_EXIST"
+    return None
+
+def is_scrapable(candidate: CsvBookCandidate) -> bool:
+    return bool(candidate.url) and "http" in candidate.url and "drive.google" not in candidate.url
+
+def draft_candidate(candidate: CsvBookCandidate, scraped_data: Optional[RawBookData], report_list: list,
+                    scrape_error: Optional[Exception] = None, verbose: bool = True) -> BookDraft:
+    """
+    驗證爬取結果並組合等待 AI 分析的草稿 (不連線)
+    驗證失敗或沒有爬取結果時以 CSV 資料降級，失敗原因寫入 report_list。
+    """
+    log = print if verbose else (lambda *args: None)
     verification_passed = False
     failure_reason = None
+    failure_kind = None
+    retryable = False
     is_egg_blog = "egg19910707" in candidate.url or "blog.fc2.com" in candidate.url
     
-    if candidate.url and "http" in candidate.url and "drive.google" not in candidate.url:
-        try:
-            print(f"   🕷️ 嘗試爬取：{candidate.url[:40]}...")
-            scraped_data = scraper.scrape_book(candidate.url)
-            if scraped_data:
-                passed, msg = verify_identity(candidate, scraped_data)
-                if passed:
-                    print(f"   ✅ 驗證成功")
-                    verification_passed = True
-                else:
-                    print(f"   ⚠️ 驗證失敗：{msg}")
-                    failure_reason = f"身份不符: {msg}"
-                    verification_passed = False
+    if scrape_error is not None:
+        log(f"   ⚠️ 爬取異常 ({scrape_error})")
+        failure_reason = f"爬蟲錯誤: {scrape_error}"
+        failure_kind = "exception"
+    elif is_scrapable(candidate):
+        if scraped_data:
+            passed, msg = verify_identity(candidate, scraped_data)
+            if passed:
+                log("   ✅ 驗證成功")
+                verification_passed = True
             else:
-                 print("   ⚠️ 爬蟲回傳空值")
-                 failure_reason = "網站無法連線"
-        except Exception as e:
-            print(f"   ⚠️ 爬取異常 ({e})")
-            failure_reason = f"爬蟲錯誤: {e}"
+                log(f"   ⚠️ 驗證失敗：{msg}")
+                failure_reason = f"身份不符: {msg}"
+                failure_kind = "identity_mismatch"
+        else:
+            log("   ⚠️ 爬蟲回傳空值")
+            failure = resilience.last_failure(candidate.url)
+            failure_reason = failure.describe() if failure else "網站無法連線"
+            failure_kind = failure.kind.value if failure else "unknown"
+            retryable = failure.retryable if failure else False
     elif candidate.url and "drive.google" in candidate.url:
         failure_reason = "Google Drive"
+        failure_kind = "google_drive"
 
     if candidate.url and failure_reason and "http" in candidate.url and not is_egg_blog:
         report_list.append({
             "書名": candidate.title,
             "原始網址": candidate.url,
-            "失敗原因": failure_reason
+            "失敗類型": failure_kind,
+            "失敗原因": failure_reason,
+            # 暫時性錯誤 (逾時、5xx、斷路) 之後重跑即可，不必手動修正網址
+            "可重試": retryable,
         })
 
-    # --- 3. 資料準備 ---
+    # --- 資料準備 ---
     final_title = candidate.title
     final_author = candidate.author
     final_desc = ""
@@ -239,49 +290,255 @@ def process_candidate(candidate: CsvBookCandidate, existing_books: dict, report_
     if candidate.original_source == "Gaming_CSV":
         final_user_review = candidate.description_text
 
-    # --- 4. AI 決策 ---
+    # --- AI 決策 ---
     ai_prompt_desc = final_desc
     if final_user_review: ai_prompt_desc += f"\n{final_user_review}"
     
-    ai_result = None
+    raw_data_for_ai = None
     if len(ai_prompt_desc) > 20: 
         raw_data_for_ai = RawBookData(title=final_title, author=final_author, description=ai_prompt_desc, source_name=final_source_name, url=final_url)
+    else:
+        log("   🛑 資訊不足，跳過 AI 分析")
+
+    return BookDraft(candidate, final_title, final_author, final_source_name, final_url,
+                     final_desc, final_user_review, raw_data_for_ai)
+
+def process_candidate(candidate: CsvBookCandidate, existing: DuplicateIndex, report_list: list) -> str:
+    """
+    處理單筆候選書籍：爬取 → 驗證 → AI 分析 → 入庫 (逐步同步執行)
+    existing 為 DuplicateIndex(既有書籍)；大量匯入請使用 run_pipeline，各階段才能重疊進行。
+    """
+    print(f"\n📘 正在處理：{candidate.title} / {candidate.author}")
+    
+    # --- 1. 暴力重複檢查 ---
+    duplicate = find_duplicate(candidate, existing)
+    if duplicate: return duplicate
+
+    # --- 2. 爬取與驗證 ---
+    scraped_data = None
+    scrape_error = None
+    if is_scrapable(candidate):
+        print(f"   🕷️ 嘗試爬取：{candidate.url[:40]}...")
+        try:
+            scraped_data = scraper.scrape_book(candidate.url)
+        except Exception as e:
+            scrape_error = e
+    draft = draft_candidate(candidate, scraped_data, report_list, scrape_error)
+
+    # --- 3. AI 分析與入庫 ---
+    ai_result = None
+    if draft.ai_input:
         try:
-            time.sleep(1.0)
-            ai_result = ai_agent.analyze_book(raw_data_for_ai)
+            # 節流由 ai_agent 的 RPM/TPM 配額處理
+            ai_result = ai_agent.analyze_book(draft.ai_input)
         except: pass
-    else:
-        print("   🛑 資訊不足，跳過 AI 分析")
+    try:
+        database.insert_book(build_book(draft, ai_result))
+        print("   💾 入庫成功！")
+        return "SUCCESS"
+    except Exception: return "DB_ERROR"
 
+def build_book(draft: BookDraft, ai_result) -> Book:
+    """合併 CSV、爬蟲與 AI 結果為 Book (所有文字欄位一次批次簡轉繁)"""
+    candidate = draft.candidate
     final_tags = list(set(candidate.tags + (ai_result.tags if ai_result else [])))
-    final_tags = [to_traditional(t) for t in final_tags]
+
+    # 所有文字欄位與標籤一次批次簡轉繁
+    fields = [draft.title, draft.author, draft.source_name, draft.desc, draft.user_review,
+              ai_result.summary if ai_result else "", ai_result.plot if ai_result else ""]
+    converted = to_traditional_many(fields + final_tags)
+    (final_title, final_author, final_source_name, final_desc, final_user_review,
+     ai_summary, ai_plot) = converted[:len(fields)]
+    final_tags = converted[len(fields):]
 
     final_date = candidate.completed_date
     if DATE_STRATEGY == "NONE" and final_date is None:
         final_date = None 
 
-    new_book = Book(
+    return Book(
         id=str(uuid.uuid4()),
-        title=to_traditional(final_title),
-        author=to_traditional(final_author),
-        source=to_traditional(final_source_name),
-        url=final_url,
+        title=final_title,
+        author=final_author,
+        source=final_source_name,
+        url=draft.url,
         status=candidate.status,
         tags=final_tags,
-        ai_summary=to_traditional(ai_result.summary) if ai_result else "待補完 (請點擊重新分析)",
-        official_desc=to_traditional(final_desc),
-        ai_plot_analysis=to_traditional(ai_result.plot) if ai_result else "資訊不足，AI 暫未分析",
+        ai_summary=ai_summary if ai_result else "待補完 (請點擊重新分析)",
+        official_desc=final_desc,
+        ai_plot_analysis=ai_plot if ai_result else "資訊不足，AI 暫未分析",
         added_date=date.today(),
         completed_date=final_date,
         user_rating=candidate.user_rating,
-        user_review=to_traditional(final_user_review)
+        user_review=final_user_review
     )
-    
+
+async def analyze_drafts_async(drafts: List[BookDraft]) -> dict:
+    """以 ai_agent.analyze_books_async 批次分析草稿，回傳 {id(draft): AIAnalysisResult | None}"""
+    needs_ai = [draft for draft in drafts if draft.ai_input]
+    if not needs_ai: return {}
     try:
-        database.insert_book(new_book)
-        print(f"   💾 入庫成功！(ID: {new_book.id[:6]})")
-        return "SUCCESS"
-    except Exception: return "DB_ERROR"
+        analyzed = await ai_agent.analyze_books_async([draft.ai_input for draft in needs_ai])
+    except Exception as e:
+        print(f"   ⚠️ AI 批次分析失敗 ({e})")
+        return {}
+    return {id(draft): result for draft, result in zip(needs_ai, analyzed)}
+
+def write_drafts(items: list) -> database.BulkUpsertResult:
+    """[(草稿, AI 結果)] 組合為 Book 後以單一批次交易寫入資料庫"""
+    books = [build_book(draft, ai_result) for draft, ai_result in items]
+    result = database.bulk_upsert_books(books)
+    for index, err in result.failures:
+        print(f"   ❌ 入庫失敗：{books[index].title} ({err})")
+    print(f"💾 批次入庫：成功 {result.success} 本，失敗 {result.failed} 本")
+    return result
+
+# ==========================================
+# 4. 匯入管線 (爬取+驗證 → AI 分析 → 入庫)
+# ==========================================
+_DONE = object()  # 佇列結束標記 (每個下游工作者各放一個)
+
+async def _take_batch(queue: asyncio.Queue, size: int, wait: float) -> list:
+    """取出一批 (至少 1 筆、最多 size 筆)：第一筆到達後最多再等 wait 秒湊滿，取到結束標記即停止"""
+    loop = asyncio.get_running_loop()
+    batch = [await queue.get()]
+    deadline = loop.time() + wait
+    while len(batch) < size and batch[-1] is not _DONE:
+        try:
+            batch.append(await asyncio.wait_for(queue.get(), max(0.0, deadline - loop.time())))
+        except asyncio.TimeoutError:
+            break
+    return batch
+
+class PipelineProgress:
+    """
+    各階段的完成數、吞吐量 (本/分) 與使用率 (工作時間 / 可用工作者時間) 及佇列深度
+    使用率接近 100% 的階段就是整體瓶頸，調高它的並行數 (或配額) 才會加快匯入。
+    """
+    def __init__(self, total: int, workers: dict, queues: dict):
+        self.total = total
+        self.workers = workers
+        self.queues = queues
+        self.done = {stage: 0 for stage in workers}
+        self.busy = {stage: 0.0 for stage in workers}
+        self.skipped = 0
+        self.started = time.monotonic()
+
+    def add(self, stage: str, seconds: float, count: int = 1):
+        self.done[stage] += count
+        self.busy[stage] += seconds
+
+    def utilization(self, stage: str) -> float:
+        elapsed = max(time.monotonic() - self.started, 1e-9)
+        return min(1.0, self.busy[stage] / (elapsed * self.workers[stage]))
+
+    def line(self) -> str:
+        elapsed = max(time.monotonic() - self.started, 1e-9)
+        stages = " | ".join(f"{stage} {count} 本 ({count / elapsed * 60:.0f}/分, 使用率 {self.utilization(stage):.0%})"
+                            for stage, count in self.done.items())
+        depth = " / ".join(f"{name} {queue.qsize()}" for name, queue in self.queues.items())
+        return f"⏱️ {elapsed:.0f}s | 略過 {self.skipped}/{self.total} | {stages} | 佇列 {depth}"
+
+    async def report_every(self, interval: float):
+        while True:
+            await asyncio.sleep(interval)
+            print(self.line())
+
+    def summary(self):
+        print(self.line())
+        if any(self.done.values()):
+            slowest = max(self.done, key=self.utilization)
+            print(f"🐢 最慢的階段：{slowest} (使用率 {self.utilization(slowest):.0%})")
+
+async def run_pipeline(candidates: List[CsvBookCandidate], existing_books: dict, report_list: list,
+                       scrape_workers: int = SCRAPE_CONCURRENCY, ai_workers: int = AI_CONCURRENCY) -> dict:
+    """
+    分段匯入管線：去重 → 爬取+驗證 → AI 批次分析 → 批次入庫
+    各階段以有上限的佇列相連 (下游塞滿時上游暫停，記憶體用量固定) 並各自有並行上限，
+    整體速度取決於最慢的階段，而不是各階段延遲的總和。回傳 {"SUCCESS", "SKIPPED", "ERROR"} 計數。
+    """
+    stats = {"SUCCESS": 0, "SKIPPED": 0, "ERROR": 0}
+    # 既有書籍的重複檢查鍵只建立一次；feed 在事件迴圈中執行，每筆候選不能再掃描整個書庫
+    existing = DuplicateIndex(existing_books.values())
+    scrape_queue, ai_queue, db_queue = (asyncio.Queue(QUEUE_SIZE) for _ in range(3))
+    progress = PipelineProgress(len(candidates), {"爬取": scrape_workers, "AI": ai_workers, "入庫": 1},
+                                {"爬取": scrape_queue, "AI": ai_queue, "入庫": db_queue})
+
+    async def feed():
+        for candidate in candidates:
+            if find_duplicate(candidate, existing, verbose=False):
+                stats["SKIPPED"] += 1
+                progress.skipped += 1
+                continue
+            await scrape_queue.put(candidate)
+        for _ in range(scrape_workers):
+            await scrape_queue.put(_DONE)
+
+    async def scrape_stage(scrape):
+        while (candidate := await scrape_queue.get()) is not _DONE:
+            started = time.monotonic()
+            scraped_data, scrape_error = None, None
+            if is_scrapable(candidate):
+                try:
+                    scraped_data = await scrape(candidate.url)
+                except Exception as e:
+                    scrape_error = e
+            try:
+                draft = draft_candidate(candidate, scraped_data, report_list, scrape_error, verbose=False)
+            except Exception as e:
+                print(f"❌ 錯誤: {candidate.title} ({e})")
+                stats["ERROR"] += 1
+                continue
+            progress.add("爬取", time.monotonic() - started)
+            await ai_queue.put(draft)
+
+    async def ai_stage():
+        while True:
+            batch = await _take_batch(ai_queue, ai_agent.BATCH_SIZE, BATCH_WAIT_SECONDS)
+            drafts = [draft for draft in batch if draft is not _DONE]
+            if drafts:
+                started = time.monotonic()
+                ai_results = await analyze_drafts_async(drafts)
+                progress.add("AI", time.monotonic() - started, len(drafts))
+                for draft in drafts:
+                    await db_queue.put((draft, ai_results.get(id(draft))))
+            if len(drafts) < len(batch):
+                return
+
+    async def db_stage():
+        # SQLite 只有一個寫入者，入庫階段固定單一工作者
+        while True:
+            batch = await _take_batch(db_queue, DB_FLUSH_SIZE, BATCH_WAIT_SECONDS)
+            items = [item for item in batch if item is not _DONE]
+            if items:
+                started = time.monotonic()
+                try:
+                    result = await asyncio.to_thread(write_drafts, items)
+                    stats["SUCCESS"] += result.success
+                    stats["ERROR"] += result.failed
+                except Exception as e:
+                    print(f"❌ 批次入庫錯誤: {e}")
+                    stats["ERROR"] += len(items)
+                progress.add("入庫", time.monotonic() - started, len(items))
+            if len(items) < len(batch):
+                return
+
+    print(f"🚚 匯入管線：爬取 {scrape_workers} / AI {ai_workers} / 入庫 1 個工作者，佇列上限 {QUEUE_SIZE}")
+    reporter = asyncio.ensure_future(progress.report_every(PROGRESS_INTERVAL))
+    analyzers = [asyncio.ensure_future(ai_stage()) for _ in range(ai_workers)]
+    writer = asyncio.ensure_future(db_stage())
+    try:
+        async with scraper.async_scraper(scrape_workers) as scrape:
+            await asyncio.gather(feed(), *(scrape_stage(scrape) for _ in range(scrape_workers)))
+        for _ in range(ai_workers):
+            await ai_queue.put(_DONE)
+        await asyncio.gather(*analyzers)
+        await db_queue.put(_DONE)
+        await writer
+    finally:
+        for task in (reporter, *analyzers, writer):
+            task.cancel()
+    progress.summary()
+    return stats
 
 def main():
     database.init_db()
@@ -296,20 +553,11 @@ def main():
 
     failure_report = []
     print(f"📊 開始匯入 {len(candidates)} 筆資料...")
-    stats = {"SUCCESS": 0, "SKIPPED": 0, "ERROR": 0}
-    
-    for i, cand in enumerate(candidates):
-        try:
-            result = process_candidate(cand, existing_books, failure_report)
-            if "SKIPPED" in result: stats["SKIPPED"] += 1
-            elif result == "SUCCESS": stats["SUCCESS"] += 1
-            else: stats["ERROR"] += 1
-        except Exception as e:
-            print(f"❌ 錯誤: {e}")
-            stats["ERROR"] += 1
+    stats = asyncio.run(run_pipeline(candidates, existing_books, failure_report))
+    print(f"📊 匯入結束：成功 {stats['SUCCESS']} 本，略過 {stats['SKIPPED']} 本，失敗 {stats['ERROR']} 本")
             
     if failure_report:
         pd.DataFrame(failure_report).to_csv("import_failures.csv", index=False, encoding="utf-8-sig")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
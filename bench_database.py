@@ -0,0 +1,244 @@
+# 新增 [bench_database.py] 區塊 A: 資料庫效能基準測試 (Benchmark)
+# 修正原因：量化連線池 + WAL PRAGMA 相較「每次呼叫開關連線」的寫入/讀取吞吐量差異。
+# 替換/新增指示：這是新檔案，請放置於專案根目錄。執行方式：python bench_database.py
+
+import os
+import sqlite3
+import tempfile
+import time
+import uuid
+import json
+from datetime import date
+
+from modules import database
+from modules.models import Book, BookStatus
+
+N_BOOKS = 2000
+N_READS = 200
+
+def _make_book(i: int) -> Book:
+    return Book(
+        id=str(uuid.uuid4()),
+        title=f"測試書籍 {i}",
+        author=f"作者 {i % 50}",
+        url=f"https://example.com/{i}",
+        status=BookStatus.UNREAD,
+        tags=["言情", "現代", f"標籤{i % 20}"],
+        ai_summary="短評" * 10,
+        official_desc="文案" * 200,
+        ai_plot_analysis="分析" * 100,
+        added_date=date.today(),
+    )
+
+# --- 舊版行為 (Baseline)：每次呼叫都 makedirs + connect + close ---
+def _legacy_connection(db_path: str):
+    os.makedirs(os.path.dirname(db_path), exist_ok=True)
+    conn = sqlite3.connect(db_path)
+    conn.row_factory = sqlite3.Row
+    return conn
+
+def _legacy_insert(db_path: str, book: Book):
+    conn = _legacy_connection(db_path)
+    data = book.model_dump()
+    data['tags'] = json.dumps(data['tags'], ensure_ascii=False)
+    data['status'] = data['status'].value
+    data['added_date'] = data['added_date'].isoformat()
+    data['completed_date'] = None
+    conn.execute('''
+        INSERT OR REPLACE INTO books (
+            id, title, author, source, url, status, tags, ai_summary, official_desc, ai_plot_analysis,
+            added_date, completed_date, user_rating, user_review
+        ) VALUES (
+            :id, :title, :author, :source, :url, :status, :tags, :ai_summary, :official_desc, :ai_plot_analysis,
+            :added_date, :completed_date, :user_rating, :user_review
+        )
+    ''', data)
+    conn.commit()
+    conn.close()
+
+def _legacy_read(db_path: str):
+    conn = _legacy_connection(db_path)
+    rows = conn.execute('SELECT * FROM books ORDER BY added_date DESC, title ASC').fetchall()
+    conn.close()
+    return rows
+
+def _report(label: str, count: int, elapsed: float):
+    print(f"{label:<28} {count:>6} 次  {elapsed:>8.3f} s  {count / elapsed:>10.1f} ops/s")
+
+def bench_legacy(books, workdir: str):
+    db_path = os.path.join(workdir, "legacy", "library.db")
+    # 舊版 init_db 使用預設 PRAGMA (rollback journal + synchronous=FULL)
+    database.DB_PATH = db_path
+    database.init_db()
+    database.close_connections()
+    conn = sqlite3.connect(db_path)
+    conn.execute("PRAGMA journal_mode=DELETE")
+    conn.close()
+
+    start = time.perf_counter()
+    for b in books:
+        _legacy_insert(db_path, b)
+    _report("[Before] insert_book", len(books), time.perf_counter() - start)
+
+    start = time.perf_counter()
+    for _ in range(N_READS):
+        _legacy_read(db_path)
+    _report("[Before] get_all_books (raw)", N_READS, time.perf_counter() - start)
+
+def bench_pooled(books, workdir: str):
+    database.DB_PATH = os.path.join(workdir, "pooled", "library.db")
+    database.init_db()
+
+    start = time.perf_counter()
+    for b in books:
+        database.insert_book(b)
+    _report("[After]  insert_book", len(books), time.perf_counter() - start)
+
+    start = time.perf_counter()
+    for _ in range(N_READS):
+        with database.get_connection() as conn:
+            conn.execute('SELECT * FROM books ORDER BY added_date DESC, title ASC').fetchall()
+    _report("[After]  get_all_books (raw)", N_READS, time.perf_counter() - start)
+    database.close_connections()
+
+def bench_bulk(books, workdir: str):
+    database.DB_PATH = os.path.join(workdir, "bulk", "library.db")
+    database.init_db()
+
+    start = time.perf_counter()
+    result = database.bulk_upsert_books(books)
+    _report("[Bulk]   bulk_upsert_books", result.success, time.perf_counter() - start)
+    database.close_connections()
+
+N_SEARCH_BOOKS = 50000
+SEARCH_QUERIES = ["測試書籍 4999", "書籍 1234", "重生之", "作者 7"]  # "作者 7" 皆為短詞，走子字串掃描
+
+def bench_search(workdir: str):
+    database.DB_PATH = os.path.join(workdir, "search", "library.db")
+    database.init_db()
+    database.bulk_upsert_books(_make_book(i) for i in range(N_SEARCH_BOOKS))
+
+    for q in SEARCH_QUERIES:
+        start = time.perf_counter()
+        hits = database.search_books(q, limit=50)
+        elapsed = (time.perf_counter() - start) * 1000
+        print(f"[FTS]    search_books({q!r:<14}) {len(hits):>4} 筆  {elapsed:>8.2f} ms  ({N_SEARCH_BOOKS} 本)")
+    database.close_connections()
+
+DECODE_SIZES = [10000, 50000, 100000]
+
+def _legacy_decode(row: sqlite3.Row) -> Book:
+    """舊版 _row_to_book：dict(Row) + 逐欄位 Python 轉換 + Book(**data)"""
+    data = dict(row)
+    data.pop('word_count', None)
+    data.pop('chapters', None)
+    data['tags'] = json.loads(data['tags']) if data['tags'] else []
+    if data.get('added_date'):
+        data['added_date'] = date.fromisoformat(data['added_date'])
+    if data.get('completed_date'):
+        data['completed_date'] = date.fromisoformat(data['completed_date'])
+    else:
+        data['completed_date'] = None
+    return Book(**data)
+
+def bench_decode(workdir: str):
+    sql = 'SELECT * FROM books ORDER BY added_date DESC, title ASC'
+    for size in DECODE_SIZES:
+        database.DB_PATH = os.path.join(workdir, f"decode_{size}", "library.db")
+        database.init_db()
+        database.bulk_upsert_books(_make_book(i) for i in range(size))
+
+        with database.get_connection() as conn:
+            # 只量測解碼本身 (資料列先讀入記憶體)
+            rows = conn.execute(sql).fetchall()
+            cur = conn.cursor()
+            cur.row_factory = None
+            values = cur.execute(sql).fetchall()
+            names = [d[0] for d in cur.description]
+
+        start = time.perf_counter()
+        [_legacy_decode(row) for row in rows]
+        legacy = time.perf_counter() - start
+
+        start = time.perf_counter()
+        [database._decode_row(names, v) for v in values]
+        fast = time.perf_counter() - start
+        print(f"[Decode] {size:>6} 列  舊版 {legacy:>7.3f} s  信任路徑 {fast:>7.3f} s  ({legacy / fast:.2f}x)")
+        database.close_connections()
+
+N_SUMMARY_BOOKS = 20000
+
+def bench_summary(workdir: str):
+    """比較完整 Book 與 BookSummary 投影的讀取時間與記憶體佔用"""
+    import tracemalloc
+    database.DB_PATH = os.path.join(workdir, "summary", "library.db")
+    database.init_db()
+    database.bulk_upsert_books(_make_book(i) for i in range(N_SUMMARY_BOOKS))
+
+    for label, loader in [("query_books", database.query_books), ("query_book_summaries", database.query_book_summaries)]:
+        tracemalloc.start()
+        start = time.perf_counter()
+        result = loader()
+        elapsed = time.perf_counter() - start
+        current, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f"[Proj]   {label:<22} {len(result):>6} 本  {elapsed:>7.3f} s  {current / 1024 / 1024:>8.1f} MB")
+        del result
+    database.close_connections()
+
+N_RERUNS = 50
+
+def bench_rerun(workdir: str):
+    """模擬 app.py 一次 rerun 的資料讀取 (統計、標籤選項、分頁查詢)，比較快取/索引前後延遲"""
+    from modules import services
+    from modules.models import BookFilters, SortOrder
+    database.DB_PATH = os.path.join(workdir, "rerun", "library.db")
+    database.init_db()
+    database.bulk_upsert_books(_make_book(i) for i in range(N_SUMMARY_BOOKS))
+
+    def rerun():
+        filters = BookFilters(tags=["標籤3"])
+        services.count_books()
+        services.count_books(BookFilters(added_from=date.today().replace(day=1)))
+        services.get_all_tags()
+        services.count_books(filters)
+        services.query_book_summaries(filters, SortOrder.NEWEST, limit=20, offset=0)
+
+    start = time.perf_counter()
+    for _ in range(N_RERUNS):
+        services._cache.clear()
+        services._index = None
+        rerun()
+    cold = (time.perf_counter() - start) / N_RERUNS * 1000
+
+    start = time.perf_counter()
+    for _ in range(N_RERUNS):
+        rerun()
+    warm = (time.perf_counter() - start) / N_RERUNS * 1000
+    print(f"[Cache]  rerun 無快取 {cold:>7.2f} ms  有快取 {warm:>7.2f} ms  {services.get_cache_stats()}")
+    database.close_connections()
+
+def main():
+    print("=== 資料庫連線效能測試 ===\n")
+    books = [_make_book(i) for i in range(N_BOOKS)]
+    original_path = database.DB_PATH
+    with tempfile.TemporaryDirectory() as workdir:
+        try:
+            bench_legacy(books, workdir)
+            bench_pooled(books, workdir)
+            bench_bulk(books, workdir)
+            bench_search(workdir)
+            bench_decode(workdir)
+            bench_summary(workdir)
+            bench_rerun(workdir)
+        finally:
+            database.close_connections()
+            database.DB_PATH = original_path
+    print("\n=== 測試結束 ===")
+
+if __name__ == "__main__":
+    main()
+
+# // 功能: 資料庫效能基準測試
+# // input: 無 (自動產生測試資料於暫存目錄)
+# // output: 終端機列印 Before/After 吞吐量
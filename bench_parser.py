@@ -0,0 +1,77 @@
+# 新增 [bench_parser.py] 區塊 A: 解析器效能基準測試 (Parser Benchmark)
+# 修正原因：量化 lxml XPath 快速路徑相較「一律建立 BeautifulSoup 樹」的解析吞吐量差異。
+#           頁面為 fixtures/html 的合成頁面加上章節列表填充 (約 120 KB)，非真實網站頁面。
+# 替換/新增指示：這是新檔案，請放置於專案根目錄。執行方式：python bench_parser.py
+
+import re
+import time
+from bs4 import BeautifulSoup
+from opencc import OpenCC
+
+from fixture_harness import load_fixtures
+from modules import scraper, text_normalize
+
+N_ROUNDS = 20
+# 模擬真實頁面中簡介之後的章節列表 / 推薦區塊，使頁面大小接近實際的書籍頁 (約 120 KB)
+FILLER = ("<table class='chapters'>"
+          + "<tr><td><a href='/chapter/1'>第一章 章節標題</a></td><td>2025-01-01</td><td>3000</td></tr>" * 1500
+          + "</table>")
+
+def _corpus() -> dict:
+    """
+    fixtures/html 的每個頁面加上 FILLER
+    注意：fixture 為手寫的合成頁面 (見 README)，加大後只是大小接近真實頁面，結構仍比真實頁面單純；
+    數字適合比較兩條路徑的相對差異，不代表真實頁面的解析時間。
+    """
+    corpus = {}
+    for fixture in load_fixtures():
+        html = fixture.html.replace("</body>", FILLER + "</body>")
+        corpus[f"{fixture.strategy}/{fixture.name}"] = (fixture.url, scraper._get_scraper(fixture.url), html)
+    return corpus
+
+def _soup_only(strategy, html: str, url: str):
+    """對照組：一律建立 BeautifulSoup 樹後走舊路徑"""
+    return strategy._parse_soup(BeautifulSoup(html, "lxml"), url)
+
+def _bench(label: str, func, rounds: int) -> float:
+    start = time.perf_counter()
+    for _ in range(rounds):
+        func()
+    elapsed = time.perf_counter() - start
+    return rounds / elapsed
+
+N_CLEAN = 2000
+CLEAN_SAMPLES = ["《重生之我是大魔王》- 晋江文学城 小说", "作者：猫猫", "一觉醒来，我成了大魔王。" * 40]
+
+def _legacy_clean_title(cc, raw_title: str) -> str:
+    """舊版 _clean_title：每次呼叫都重組 SEO 正則並重新轉換"""
+    raw_title = cc.convert(raw_title)
+    title = re.sub(r'[《》【】\[\]〈〉]', '', raw_title).strip()
+    title = re.split(r'[|_｜]', title)[0].strip()
+    seo_keywords = r"(小說|全文|閱讀|最新|章節|下載|txt|筆趣閣|半夏|晉江|起點|無彈窗|手機版|online|read|fc2|blog|博客來|誠品|eslite|books|bookwalker|套書|POPO|原創)"
+    return re.sub(fr"([-,\s]+.*{seo_keywords}.*$)", "", title, flags=re.IGNORECASE).strip()
+
+def bench_clean():
+    cc = OpenCC('s2t')
+    texts = [CLEAN_SAMPLES[i % len(CLEAN_SAMPLES)] for i in range(N_CLEAN)]
+    slow = _bench("clean", lambda: [_legacy_clean_title(cc, t) for t in texts], 1) * N_CLEAN
+    fast = _bench("clean", lambda: [text_normalize.clean_title(t) for t in texts], 1) * N_CLEAN
+    print(f"[Clean]  clean_title  舊版 {slow:>10.1f} 次/s  預編譯+記憶 {fast:>10.1f} 次/s  ({fast / slow:.2f}x)")
+
+def main():
+    print("=== 解析器效能測試 ===\n")
+    bench_clean()
+    for name, (url, strategy, html) in _corpus().items():
+        slow = _bench(name, lambda: _soup_only(strategy, html, url), N_ROUNDS)
+        fast = _bench(name, lambda: strategy.parse(html, url), N_ROUNDS)
+        assert strategy.parse(html, url) == _soup_only(strategy, html, url), name
+        print(f"[Parse]  {name:<22} {len(html) // 1024:>4} KB  BeautifulSoup {slow:>7.1f} 頁/s  "
+              f"快速路徑 {fast:>7.1f} 頁/s  ({fast / slow:.2f}x)")
+    print("\n=== 測試結束 ===")
+
+if __name__ == "__main__":
+    main()
+
+# // 功能: 解析器效能基準測試
+# // input: fixtures/html 合成頁面 (加上章節列表填充)
+# // output: 終端機列印每秒解析頁數
@@ -0,0 +1,106 @@
+# 新增 [fixture_harness.py] 區塊 A: 解析器離線重播工具 (Fixture Replay Harness)
+# 修正原因：以 fixtures/html 中的 HTML 頁面離線執行各爬蟲策略的 parse，不需連上實際網站即可做回歸測試與效能量測。
+#           目前內建的頁面為手寫的合成頁面 (見 README)；真實頁面請以 record 錄製。
+# 替換/新增指示：這是新檔案，請放置於專案根目錄。
+#   python fixture_harness.py                          # 重播全部 fixture 並比對預期結果
+#   python fixture_harness.py record <資料夾> <名稱> <網址>  # 從網站錄製一個新 fixture
+#   python fixture_harness.py update                   # 解析器行為有意變更後，重新產生預期結果
+
+import json
+import os
+import sys
+from dataclasses import asdict, dataclass
+from typing import List
+
+from modules import scraper
+
+FIXTURE_DIR = os.path.join("fixtures", "html")
+
+@dataclass
+class Fixture:
+    strategy: str   # fixtures/html 底下的資料夾 (依網站分類)
+    name: str
+    url: str        # 用來選擇爬蟲策略，也是 RawBookData.url
+    html: str
+    expected: dict
+
+    @property
+    def base_path(self) -> str:
+        return os.path.join(FIXTURE_DIR, self.strategy, self.name)
+
+def load_fixtures(strategy: str = None) -> List[Fixture]:
+    """讀取所有 fixture (每個頁面為 <名稱>.html + <名稱>.json)"""
+    fixtures = []
+    folders = [strategy] if strategy else sorted(os.listdir(FIXTURE_DIR))
+    for folder in folders:
+        folder_path = os.path.join(FIXTURE_DIR, folder)
+        for filename in sorted(os.listdir(folder_path)):
+            if not filename.endswith(".html"):
+                continue
+            name = filename[:-len(".html")]
+            with open(os.path.join(folder_path, filename), encoding="utf-8") as f:
+                html = f.read()
+            with open(os.path.join(folder_path, name + ".json"), encoding="utf-8") as f:
+                meta = json.load(f)
+            fixtures.append(Fixture(folder, name, meta["url"], html, meta.get("expected", {})))
+    return fixtures
+
+def replay(fixture: Fixture) -> scraper.RawBookData:
+    """以網址對應的策略離線解析 fixture 頁面"""
+    return scraper._get_scraper(fixture.url).parse(fixture.html, fixture.url)
+
+def save_fixture(fixture: Fixture):
+    os.makedirs(os.path.dirname(fixture.base_path), exist_ok=True)
+    with open(fixture.base_path + ".html", "w", encoding="utf-8") as f:
+        f.write(fixture.html)
+    with open(fixture.base_path + ".json", "w", encoding="utf-8") as f:
+        json.dump({"url": fixture.url, "expected": fixture.expected}, f, ensure_ascii=False, indent=2)
+        f.write("\n")
+
+def record(strategy: str, name: str, url: str) -> Fixture:
+    """從網站下載頁面 (經過爬蟲的連線池與快取) 並存成 fixture"""
+    response = scraper._fetch(scraper._get_scraper(url), url)
+    if response is None or response.status_code >= 400:
+        raise RuntimeError(f"無法下載 {url}")
+    fixture = Fixture(strategy, name, url, response.text, {})
+    fixture.expected = asdict(replay(fixture))
+    save_fixture(fixture)
+    return fixture
+
+def update_expected():
+    for fixture in load_fixtures():
+        fixture.expected = asdict(replay(fixture))
+        save_fixture(fixture)
+        print(f"📝 {fixture.strategy}/{fixture.name}")
+
+def main():
+    if len(sys.argv) >= 2 and sys.argv[1] == "record":
+        fixture = record(*sys.argv[2:5])
+        print(f"📼 已錄製 {fixture.base_path}.html")
+        print(json.dumps(fixture.expected, ensure_ascii=False, indent=2))
+        return
+    if len(sys.argv) >= 2 and sys.argv[1] == "update":
+        update_expected()
+        return
+
+    print("=== 重播解析器 Fixture ===\n")
+    failed = 0
+    for fixture in load_fixtures():
+        actual = asdict(replay(fixture))
+        if actual == fixture.expected:
+            print(f"✅ {fixture.strategy}/{fixture.name}")
+        else:
+            failed += 1
+            print(f"❌ {fixture.strategy}/{fixture.name}")
+            for key, value in actual.items():
+                if fixture.expected.get(key) != value:
+                    print(f"    {key}: 預期 {fixture.expected.get(key)!r} / 實際 {value!r}")
+    print(f"\n=== 測試結束 (失敗 {failed} 筆) ===")
+    sys.exit(1 if failed else 0)
+
+if __name__ == "__main__":
+    main()
+
+# // 功能: 解析器離線重播 (錄製 / 重播 / 更新預期結果)
+# // input: fixtures/html/<網站>/<名稱>.html + .json
+# // output: 終端機列印比對結果
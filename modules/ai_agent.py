@@ -1,12 +1,18 @@
 from google import genai
 from google.genai import types
 import streamlit as st
+import asyncio
 import json
 import os
 import re
-from typing import List, Optional
+import threading
+from concurrent.futures import as_completed
+from typing import Callable, Dict, List, Optional, Tuple
 from pydantic import BaseModel
 from .scraper import RawBookData
+from . import ai_cache
+from . import ai_pool
+from . import resilience
 
 class AIAnalysisResult(BaseModel):
     tags: List[str]
@@ -19,66 +25,130 @@ def _get_api_key():
     except Exception:
         return os.getenv("GEMINI_API_KEY")
 
-def analyze_book(raw_data: RawBookData) -> Optional[AIAnalysisResult]:
-    api_key = _get_api_key()
-    if not api_key:
-        print("❌ 錯誤: 找不到 Gemini API Key")
+# 共用的 genai.Client (thread-safe，所有呼叫重用同一組連線)；API Key 只在第一次建立時讀取
+_client = None
+_client_lock = threading.Lock()
+
+def _get_client():
+    global _client
+    with _client_lock:
+        if _client is None:
+            api_key = _get_api_key()
+            if not api_key:
+                print("❌ 錯誤: 找不到 Gemini API Key")
+                return None
+            # 【遷移重點 1】 建立 Client 物件 (舊版是隱式 configure)
+            _client = genai.Client(api_key=api_key)
+        return _client
+
+MODEL_NAME = "gemini-2.5-flash"  # 若帳號有權限也可改為 "gemini-2.5-pro"
+# 修改提示內容 (人設、輸出欄位、標籤規則) 時請遞增，舊的快取結果即不再使用
+PROMPT_VERSION = 2
+
+# 配額與工作池：所有 Gemini 呼叫共用 RPM/TPM 額度；批次分析在工作池中並行
+_quota = ai_pool.AdaptiveQuota()
+_pool = ai_pool.AiWorkerPool()
+# 429 重試：抖動指數退避，伺服器提供 retryDelay 時以其為下限
+AI_RETRY = resilience.RetryPolicy(max_attempts=5, base_delay=2.0, max_delay=60.0)
+_RETRY_DELAY_RE = re.compile(r"retryDelay['\"]?\s*[:=]\s*['\"]?(\d+(?:\.\d+)?)s")
+
+def _is_rate_limited(error: Exception) -> bool:
+    """只看 API 錯誤的 code / status (google.genai.errors.APIError)，訊息文字中剛好出現 429 不算"""
+    return getattr(error, "code", None) == 429 or getattr(error, "status", None) == "RESOURCE_EXHAUSTED"
+
+def _throttle_or_raise(error: Exception, attempt: int):
+    """429 且仍可重試時暫停所有工作並降低速率 (暫停由下一次 acquire 等待)；其餘錯誤直接拋出"""
+    if not _is_rate_limited(error) or attempt == AI_RETRY.max_attempts:
+        raise error
+    match = _RETRY_DELAY_RE.search(str(error))
+    delay = AI_RETRY.delay(attempt, match.group(1) if match else None)
+    print(f"⏳ Gemini 配額用盡 (429)，暫停 {delay:.1f} 秒並降低速率")
+    _quota.throttled(delay)
+
+def _generate(client, contents: str, config, tokens: int):
+    """
+    所有 Gemini 呼叫的單一入口：先向配額取得 (1 個請求 + 預估 tokens) 額度，
+    429 時暫停所有工作、降低速率後重試。
+    """
+    for attempt in range(1, AI_RETRY.max_attempts + 1):
+        _quota.acquire(tokens)
+        try:
+            # 【遷移重點 3】 呼叫 client.models.generate_content
+            response = client.models.generate_content(model=MODEL_NAME, contents=contents, config=config)
+        except Exception as e:
+            _throttle_or_raise(e, attempt)
+            continue
+        _quota.succeeded()
+        return response
+
+async def _generate_async(client, contents: str, config, tokens: int):
+    """_generate 的 asyncio 版本 (client.aio)，與同步呼叫共用同一組配額"""
+    for attempt in range(1, AI_RETRY.max_attempts + 1):
+        await _quota.acquire_async(tokens)
+        try:
+            response = await client.aio.models.generate_content(model=MODEL_NAME, contents=contents, config=config)
+        except Exception as e:
+            _throttle_or_raise(e, attempt)
+            continue
+        _quota.succeeded()
+        return response
+
+def pool_stats() -> dict:
+    """AI 工作池的佇列深度、吞吐量與目前的配額速率"""
+    return {**_pool.stats(), **_quota.stats()}
+
+# 分析結果快取 (data/ai_cache.db)；相同輸入 + 模型 + 提示版本直接回傳
+_ai_cache = ai_cache.AiCache()
+
+def _cache_key(raw_data: RawBookData) -> str:
+    return ai_cache.content_key(raw_data.title, raw_data.author, raw_data.source_name, raw_data.description,
+                                MODEL_NAME, PROMPT_VERSION)
+
+def _cached_result(raw_data: RawBookData) -> Optional[AIAnalysisResult]:
+    try:
+        cached = _ai_cache.get(_cache_key(raw_data))
+        return AIAnalysisResult.model_validate(cached.result) if cached else None
+    except Exception as e:
+        print(f"⚠️ AI 快取讀取失敗: {e}")
         return None
 
-    # 【遷移重點 1】 建立 Client 物件 (舊版是隱式 configure)
-    client = genai.Client(api_key=api_key)
-    
-    model_name = "gemini-2.5-flash" # 先用目前新 SDK 支援度最穩定的 2.0 Flash 測試，確認後可改 2.5
-    # 注意：如果您的帳號有權限使用 gemini-2.5-pro，也可以填入 "gemini-2.5-pro"
+def _store_result(raw_data: RawBookData, result: Optional[AIAnalysisResult]):
+    if result is None: return
+    try:
+        _ai_cache.put(_cache_key(raw_data), MODEL_NAME, result.model_dump())
+    except Exception as e:
+        print(f"⚠️ AI 快取寫入失敗: {e}")
 
+# 批次分析：一次請求打包多本書 (以 token 預算限制單次請求大小)
+BATCH_SIZE = 10
+BATCH_TOKEN_BUDGET = 24000      # 單次請求的輸入 + 預估輸出 token 上限
+OUTPUT_TOKENS_PER_BOOK = 400    # 每本書的預估輸出 (tags + 40 字評論 + 150 字大綱)
+
+def _generation_config(response_schema, system_instruction: str) -> types.GenerateContentConfig:
     # 【遷移重點 2】 設定檔改用 types.GenerateContentConfig
     # 新版 SDK 將 generation_config 和 safety_settings 整合在這裡
-    config = types.GenerateContentConfig(
+    return types.GenerateContentConfig(
+        system_instruction=system_instruction,
         temperature=0.7,
         top_p=0.95,
         top_k=40,
         response_mime_type="application/json",
+        response_schema=response_schema,
         
         # 安全設定：全面解除 (BLOCK_NONE)
         safety_settings=[
-            types.SafetySetting(
-                category="HARM_CATEGORY_HARASSMENT",
-                threshold="BLOCK_NONE"
-            ),
-            types.SafetySetting(
-                category="HARM_CATEGORY_HATE_SPEECH",
-                threshold="BLOCK_NONE"
-            ),
-            types.SafetySetting(
-                category="HARM_CATEGORY_SEXUALLY_EXPLICIT",
-                threshold="BLOCK_NONE"
-            ),
-            types.SafetySetting(
-                category="HARM_CATEGORY_DANGEROUS_CONTENT",
-                threshold="BLOCK_NONE"
-            ),
+            types.SafetySetting(category=category, threshold="BLOCK_NONE")
+            for category in ("HARM_CATEGORY_HARASSMENT", "HARM_CATEGORY_HATE_SPEECH",
+                             "HARM_CATEGORY_SEXUALLY_EXPLICIT", "HARM_CATEGORY_DANGEROUS_CONTENT")
         ]
     )
 
-    try:
-        prompt = f"""
+_PERSONA = """
         你是一位閱讀量豐富的資深小說愛好者。
         你對各類網文套路非常熟悉，品味中肯，擅長用精練的語言向朋友推薦或介紹書籍。
-        
-        請閱讀以下這本小說的資訊，並回傳 JSON 格式的分析結果。
-
-        【書籍資訊】
-        書名：{raw_data.title}
-        作者：{raw_data.author}
-        來源：{raw_data.source_name}
-        文案：
-        {raw_data.description}
-
-        【任務要求】
-        1. 僅輸出 JSON 格式，嚴禁任何解釋性文字。
-        2. 語系：繁體中文 (台灣)。
-        3. 若簡介內容極少，請根據標題進行合理推測，若完全無法判斷請填入 "未知"。
+"""
 
+_ANALYSIS_RULES = """
         # Output 
         1. "tags": "類別", "背景", "屬性1", "屬性2,
         2. "summary": "40字內讀者視角評論",
@@ -89,47 +159,313 @@ def analyze_book(raw_data: RawBookData) -> Optional[AIAnalysisResult]:
         - 第一個標籤必須是【核心類別】(言情/非言情/耽美/輕小說/無CP/同人)。
         - 第二個標籤必須是【時代背景】(古代/現代/未來/民國/異世架空)。
         - 後續標籤為【核心屬性】(優先用: 重生, 系統, 甜寵, 虐戀, 破鏡重圓, 馬甲文, 娛樂圈, 校園, 職場, 種田文, 網遊, 豪門, 升級流, 救贖)。
+"""
 
-        請直接回傳 JSON。
-        """
+_TASK_RULES = """
+        【任務要求】
+        1. 僅輸出 JSON 格式，嚴禁任何解釋性文字。
+        2. 語系：繁體中文 (台灣)。
+        3. 若簡介內容極少，請根據標題進行合理推測，若完全無法判斷請填入 "未知"。
+"""
 
-        print(f"🤖 AI ({model_name}) 正在閱讀《{raw_data.title}》...")
-        
-        # 【遷移重點 3】 呼叫 client.models.generate_content
-        response = client.models.generate_content(
-            model=model_name,
-            contents=prompt,
-            config=config
-        )
-        
-        # 新版 SDK 其實有 response.parsed (如果我們定義了 schema)，
-        # 但為了保持彈性處理 Markdown JSON，我們還是先讀 text 再手動 parse
-        if not response.text:
-            print("⚠️ AI 回應為空。")
-            return None
+# 提示的固定部分只在載入時組合一次，放在 system_instruction；
+# 每次請求只送書籍資訊，固定前綴可被 Gemini 的隱式快取 (implicit caching) 重用
+_BOOK_INSTRUCTION = f"""{_PERSONA}
+        使用者會提供一本小說的資訊 (書名、作者、來源、文案)，請閱讀後回傳 JSON 格式的分析結果。
+{_TASK_RULES}{_ANALYSIS_RULES}"""
 
-        # 解析 JSON
-        try:
-            result_json = json.loads(response.text)
-        except json.JSONDecodeError:
-            # 清洗 Markdown 格式 (```json ... ```)
-            clean_text = re.sub(r"```json|```", "", response.text).strip()
-            result_json = json.loads(clean_text)
-        
-        return AIAnalysisResult(
-            tags=result_json.get("tags", []),
-            summary=result_json.get("summary", "AI 暫無評論"),
-            plot=result_json.get("plot", "無法生成摘要")
-        )
+def _book_prompt(raw_data: RawBookData) -> str:
+    return (f"【書籍資訊】\n書名：{raw_data.title}\n作者：{raw_data.author}\n"
+            f"來源：{raw_data.source_name}\n文案：\n{raw_data.description}")
+
+def _parse_response(response, schema):
+    """
+    依 response_schema 取回結果：SDK 已解析的 response.parsed 優先，
+    否則以 schema 直接驗證回應 JSON (宣告 schema 後不會再有 Markdown 包裝，不需額外清洗)
+    """
+    if isinstance(response.parsed, schema):
+        return response.parsed
+    if not response.text:
+        return None
+    return schema.model_validate_json(response.text)
+
+def _book_result(raw_data: RawBookData, response) -> Optional[AIAnalysisResult]:
+    parsed = _parse_response(response, AIAnalysisResult)
+    if parsed is None:
+        print("⚠️ AI 回應為空。")
+        return None
+    result = AIAnalysisResult(tags=parsed.tags, summary=parsed.summary, plot=parsed.plot)
+    _store_result(raw_data, result)
+    return result
 
+def _report_failure(error: Exception):
+    print(f"❌ AI 分析失敗: {error}")
+    # 如果是 404，提示使用者可能需要確認模型名稱
+    if "404" in str(error):
+        print(f"💡 提示: 請確認模型名稱 '{MODEL_NAME}' 是否對您的 API Key 開放。")
+
+def _cache_hit(raw_data: RawBookData, refresh: bool) -> Optional[AIAnalysisResult]:
+    if refresh: return None
+    cached = _cached_result(raw_data)
+    if cached is not None:
+        print(f"💾 AI 快取命中《{raw_data.title}》")
+    return cached
+
+def analyze_book(raw_data: RawBookData, refresh: bool = False) -> Optional[AIAnalysisResult]:
+    """分析單本書；相同輸入已有快取時直接回傳，refresh=True 時略過快取重新分析 (結果仍會寫回快取)"""
+    cached = _cache_hit(raw_data, refresh)
+    if cached is not None:
+        return cached
+    client = _get_client()
+    if client is None:
+        return None
+    try:
+        print(f"🤖 AI ({MODEL_NAME}) 正在閱讀《{raw_data.title}》...")
+        prompt = _book_prompt(raw_data)
+        response = _generate(client, prompt, _BOOK_CONFIG, _request_tokens(prompt, _BOOK_PROMPT_TOKENS, 1))
+        return _book_result(raw_data, response)
+    except Exception as e:
+        _report_failure(e)
+        return None
+
+async def analyze_book_async(raw_data: RawBookData, refresh: bool = False) -> Optional[AIAnalysisResult]:
+    """analyze_book 的 asyncio 版本 (client.aio)；可與爬蟲等其他協程在同一個事件迴圈中重疊進行"""
+    cached = _cache_hit(raw_data, refresh)
+    if cached is not None:
+        return cached
+    client = _get_client()
+    if client is None:
+        return None
+    try:
+        print(f"🤖 AI ({MODEL_NAME}) 正在閱讀《{raw_data.title}》...")
+        prompt = _book_prompt(raw_data)
+        response = await _generate_async(client, prompt, _BOOK_CONFIG, _request_tokens(prompt, _BOOK_PROMPT_TOKENS, 1))
+        return _book_result(raw_data, response)
     except Exception as e:
-        print(f"❌ AI 分析失敗: {e}")
-        # 如果是 404，提示使用者可能需要確認模型名稱
-        if "404" in str(e):
-             print(f"💡 提示: 請確認模型名稱 '{model_name}' 是否對您的 API Key 開放。")
+        _report_failure(e)
         return None
 
+# === 批次分析 ===
+class BookAnalysis(AIAnalysisResult):
+    id: str
+
+class BatchAnalysisResult(BaseModel):
+    """批次回應的 schema：每本書一筆，以請求中的 id 對應"""
+    results: List[BookAnalysis]
+
+_CJK_RE = re.compile(r'[\u3000-\u9fff\uac00-\ud7af\uf900-\ufaff\uff00-\uffef]')
+
+def _estimate_tokens(text: str) -> int:
+    """粗估 token 數：中日韓文字約 1 字 1 token，其餘約 4 字元 1 token"""
+    if not text: return 0
+    cjk = len(_CJK_RE.findall(text))
+    return cjk + (len(text) - cjk) // 4 + 1
+
+def _book_payload(book_id: str, raw_data: RawBookData) -> dict:
+    return {"id": book_id, "title": raw_data.title, "author": raw_data.author,
+            "source": raw_data.source_name, "description": raw_data.description}
+
+_BATCH_INSTRUCTION = f"""{_PERSONA}
+        使用者會提供一個 JSON 陣列，每個物件是一本小說 (id, title, author, source, description)。
+        請逐本分析，回傳 {{"results": [...]}}，每本書恰好一筆，並原樣帶回該書的 id。
+{_TASK_RULES}        4. 每本書獨立判斷，不要互相參考。
+{_ANALYSIS_RULES}"""
+
+# 固定的設定 (含 system_instruction 與 response_schema) 只建立一次，所有請求共用
+_BOOK_CONFIG = _generation_config(AIAnalysisResult, _BOOK_INSTRUCTION)
+_BATCH_CONFIG = _generation_config(BatchAnalysisResult, _BATCH_INSTRUCTION)
+_BOOK_PROMPT_TOKENS = _estimate_tokens(_BOOK_INSTRUCTION)
+_BATCH_PROMPT_TOKENS = _estimate_tokens(_BATCH_INSTRUCTION) + 50
+
+def _request_tokens(contents: str, instruction_tokens: int, books: int) -> int:
+    """單次請求向配額申請的 token 數 = 固定指示 + 本次內容 + 預估輸出"""
+    return instruction_tokens + _estimate_tokens(contents) + OUTPUT_TOKENS_PER_BOOK * books
+
+def _plan_batches(items: List[Tuple[str, RawBookData]], batch_size: int,
+                  token_budget: int) -> List[List[Tuple[str, RawBookData]]]:
+    """依序裝箱：每批不超過 batch_size 本，且 (提示 + 書籍資訊 + 預估輸出) 不超過 token 預算；單本超過預算時自成一批"""
+    batches, current, used = [], [], _BATCH_PROMPT_TOKENS
+    for book_id, raw_data in items:
+        cost = _estimate_tokens(json.dumps(_book_payload(book_id, raw_data), ensure_ascii=False)) + OUTPUT_TOKENS_PER_BOOK
+        if current and (len(current) >= batch_size or used + cost > token_budget):
+            batches.append(current)
+            current, used = [], _BATCH_PROMPT_TOKENS
+        current.append((book_id, raw_data))
+        used += cost
+    if current:
+        batches.append(current)
+    return batches
+
+def _batch_prompt(batch: List[Tuple[str, RawBookData]]) -> str:
+    return json.dumps([_book_payload(book_id, raw) for book_id, raw in batch], ensure_ascii=False, indent=1)
+
+def _batch_results(batch: List[Tuple[str, RawBookData]], response) -> Dict[str, AIAnalysisResult]:
+    parsed = _parse_response(response, BatchAnalysisResult)
+    if parsed is None:
+        return {}
+    wanted = {book_id for book_id, _ in batch}
+    return {item.id: AIAnalysisResult(tags=item.tags, summary=item.summary, plot=item.plot)
+            for item in parsed.results if item.id in wanted}
+
+def _request_batch(client, batch: List[Tuple[str, RawBookData]]) -> Dict[str, AIAnalysisResult]:
+    """送出一次批次請求，回傳 {id: 分析結果} (只包含請求中的 id)"""
+    prompt = _batch_prompt(batch)
+    response = _generate(client, prompt, _BATCH_CONFIG, _request_tokens(prompt, _BATCH_PROMPT_TOKENS, len(batch)))
+    return _batch_results(batch, response)
+
+async def _request_batch_async(client, batch: List[Tuple[str, RawBookData]]) -> Dict[str, AIAnalysisResult]:
+    prompt = _batch_prompt(batch)
+    response = await _generate_async(client, prompt, _BATCH_CONFIG,
+                                     _request_tokens(prompt, _BATCH_PROMPT_TOKENS, len(batch)))
+    return _batch_results(batch, response)
+
+def _split_retry(batch: List[Tuple[str, RawBookData]], results: Dict[str, AIAnalysisResult]):
+    """
+    一批書的拆批重試流程 (同步 / asyncio 共用，不含傳輸)：回應缺漏或整批失敗時，將缺少的書對半切開重試，
+    最後只剩一本仍失敗時改用單本分析。
+    yield ("batch", 子批次) 時送回 {id: 結果} (請求失敗送回 None)；yield ("book", RawBookData) 時送回單本結果。
+    """
+    stack = [batch]
+    while stack:
+        current = stack.pop()
+        got = yield "batch", current
+        results.update(got or {})
+        missing = [(book_id, raw) for book_id, raw in current if book_id not in results]
+        if not missing:
+            continue
+        if len(missing) == 1:
+            book_id, raw = missing[0]
+            results[book_id] = yield "book", raw
+            continue
+        print(f"🔁 批次缺少 {len(missing)} 本，拆開重試")
+        half = len(missing) // 2
+        stack += [missing[half:], missing[:half]]
+
+def _analyze_batch(client, batch: List[Tuple[str, RawBookData]]) -> Dict[str, AIAnalysisResult]:
+    """以同步 client 執行 _split_retry，回傳 {id: 分析結果}"""
+    results: Dict[str, AIAnalysisResult] = {}
+    steps, reply = _split_retry(batch, results), None
+    try:
+        while True:
+            kind, item = steps.send(reply)
+            if kind == "book":
+                reply = analyze_book(item, refresh=True)
+                continue
+            try:
+                reply = _request_batch(client, item)
+            except Exception as e:
+                print(f"⚠️ 批次分析失敗 ({len(item)} 本): {e}")
+                reply = None
+    except StopIteration:
+        return results
+
+async def _analyze_batch_async(client, batch: List[Tuple[str, RawBookData]]) -> Dict[str, AIAnalysisResult]:
+    """_analyze_batch 的 asyncio 版本 (client.aio)"""
+    results: Dict[str, AIAnalysisResult] = {}
+    steps, reply = _split_retry(batch, results), None
+    try:
+        while True:
+            kind, item = steps.send(reply)
+            if kind == "book":
+                reply = await analyze_book_async(item, refresh=True)
+                continue
+            try:
+                reply = await _request_batch_async(client, item)
+            except Exception as e:
+                print(f"⚠️ 批次分析失敗 ({len(item)} 本): {e}")
+                reply = None
+    except StopIteration:
+        return results
+
+class _BatchRun:
+    """
+    analyze_books / analyze_books_async 共用的規劃與結果合併 (快取、裝箱、寫回快取、進度)
+    兩者只差在批次如何送出 (工作池執行緒 / 協程)。
+    """
+    def __init__(self, books: List[RawBookData], batch_size: int, token_budget: int,
+                 progress: Optional[Callable[[int, int], None]], refresh: bool):
+        self.items = [(f"b{i}", raw) for i, raw in enumerate(books)]
+        self.progress = progress
+        self.results: Dict[str, AIAnalysisResult] = {}
+        if not refresh:
+            for book_id, raw in self.items:
+                cached = _cached_result(raw)
+                if cached is not None:
+                    self.results[book_id] = cached
+        self.done = len(self.results)
+        if self.results:
+            print(f"💾 AI 快取命中 {len(self.results)} 本")
+            if progress:
+                progress(self.done, len(self.items))
+        pending = [(book_id, raw) for book_id, raw in self.items if book_id not in self.results]
+        self.batches = _plan_batches(pending, batch_size, token_budget) if pending else []
+        self.pending = len(pending)
+
+    def merge(self, batch: List[Tuple[str, RawBookData]], analyzed: Dict[str, AIAnalysisResult]):
+        for book_id, raw in batch:
+            if book_id in analyzed:
+                _store_result(raw, analyzed[book_id])
+        self.results.update(analyzed)
+        self.done += len(batch)
+        if self.progress:
+            self.progress(self.done, len(self.items))
+
+    def ordered(self) -> List[Optional[AIAnalysisResult]]:
+        return [self.results.get(book_id) for book_id, _ in self.items]
+
+def analyze_books(books: List[RawBookData], batch_size: int = BATCH_SIZE, token_budget: int = BATCH_TOKEN_BUDGET,
+                  progress: Optional[Callable[[int, int], None]] = None,
+                  refresh: bool = False) -> List[Optional[AIAnalysisResult]]:
+    """
+    批次分析多本書：每次請求打包最多 batch_size 本 (並受 token_budget 限制)，
+    以 response schema 依書籍 id 取回結果。回傳順序與 books 相同，失敗為 None。
+    已有快取的書不送出 (refresh=True 時全部重新分析)；progress(已完成本數, 總本數) 於每批完成後呼叫。
+    """
+    run = _BatchRun(books, batch_size, token_budget, progress, refresh)
+    client = _get_client() if run.batches else None
+    if client is None:
+        return run.ordered()
+    print(f"🤖 AI ({MODEL_NAME}) 批次分析 {run.pending} 本，共 {len(run.batches)} 次請求 "
+          f"(工作池 {_pool.workers} 執行緒，{_quota.rpm} RPM / {_quota.tpm} TPM)...")
+
+    # 批次在工作池中並行 (受 RPM/TPM 配額排程)；進度回呼在呼叫端執行緒觸發
+    futures = {_pool.submit(_analyze_batch, client, batch): batch for batch in run.batches}
+    for future in as_completed(futures):
+        try:
+            run.merge(futures[future], future.result())
+        except Exception as e:
+            print(f"❌ AI 批次工作失敗: {e}")
+    stats = pool_stats()
+    print(f"📈 AI 工作池：最近一分鐘完成 {stats['per_minute']} 批，佇列 {stats['queued']}，429 共 {stats['throttles']} 次")
+    return run.ordered()
+
+async def analyze_books_async(books: List[RawBookData], batch_size: int = BATCH_SIZE,
+                              token_budget: int = BATCH_TOKEN_BUDGET,
+                              progress: Optional[Callable[[int, int], None]] = None,
+                              refresh: bool = False) -> List[Optional[AIAnalysisResult]]:
+    """
+    analyze_books 的 asyncio 版本 (client.aio)：批次以協程並行 (同時最多 AI_WORKERS 個請求，受同一組 RPM/TPM 配額)，
+    不佔用工作池執行緒，可與 scraper.scrape_many_async 在同一個事件迴圈中重疊進行。參數與回傳值同 analyze_books。
+    """
+    run = _BatchRun(books, batch_size, token_budget, progress, refresh)
+    client = _get_client() if run.batches else None
+    if client is None:
+        return run.ordered()
+    print(f"🤖 AI ({MODEL_NAME}) 非同步批次分析 {run.pending} 本，共 {len(run.batches)} 次請求...")
+    in_flight = asyncio.Semaphore(_pool.workers)
+
+    async def send(batch):
+        async with in_flight:
+            return batch, await _analyze_batch_async(client, batch)
+
+    for task in asyncio.as_completed([send(batch) for batch in run.batches]):
+        try:
+            run.merge(*await task)
+        except Exception as e:
+            print(f"❌ AI 批次工作失敗: {e}")
+    return run.ordered()
+
 # // 功能: AI 分析代理人 (Google GenAI SDK 版)
-# // input: RawBookData
+# // input: RawBookData (analyze_books / analyze_books_async 為多本)
 # // output: AIAnalysisResult
 # // 其他補充: 完全遷移至新版 SDK，架構更穩定
\ No newline at end of file
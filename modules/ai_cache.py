@@ -0,0 +1,77 @@
+# 新增 [modules/ai_cache.py] 區塊 A: AI 分析結果快取 (Persistent AI Cache)
+# 修正原因：重跑「僅重跑 AI 分析」、設定頁的 AI 資料補全或 batch_importer 時，
+#           相同的書名 + 作者 + 來源 + 文案不再重新呼叫 Gemini。
+#           以「提示輸入 + 模型名稱 + 提示版本」的內容雜湊為鍵，存在 data/ai_cache.db，
+#           依建立時間 (過期) 與總大小 (LRU) 淘汰。
+# 替換/新增指示：這是新檔案，請放置於 modules 資料夾。由 ai_agent.analyze_book / analyze_books 使用。
+
+import hashlib
+import json
+import os
+import time
+from dataclasses import dataclass
+from typing import Optional
+from .sqlite_cache import SqliteCacheStore
+
+CACHE_PATH = os.path.join("data", "ai_cache.db")
+CACHE_MAX_AGE_SECONDS = 180 * 24 * 60 * 60   # 超過此時間的結果視為過期 (模型與標籤習慣會演進)
+CACHE_MAX_BYTES = 50 * 1024 * 1024           # 總大小上限，超過時依最近使用時間 (LRU) 淘汰
+
+def content_key(title: str, author: str, source_name: str, description: str,
+                model: str, prompt_version: int) -> str:
+    """提示中實際用到的欄位 + 模型 + 提示版本的 SHA-256 (網址等不影響結果的欄位不列入)"""
+    payload = json.dumps({"title": title, "author": author, "source": source_name, "description": description,
+                          "model": model, "prompt_version": prompt_version}, ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+@dataclass
+class CachedAnalysis:
+    result: dict         # AIAnalysisResult.model_dump()
+    model: str
+    created_at: float
+
+    @property
+    def age(self) -> float:
+        return time.time() - self.created_at
+
+class AiCache(SqliteCacheStore):
+    """SQLite 的 AI 分析結果快取 (thread-safe)"""
+    TABLE = "analyses"
+    COLUMNS = """
+        model TEXT NOT NULL,
+        result TEXT NOT NULL,
+        created_at REAL NOT NULL"""
+
+    def __init__(self, path: str = CACHE_PATH, max_age: float = CACHE_MAX_AGE_SECONDS,
+                 max_bytes: int = CACHE_MAX_BYTES):
+        super().__init__(path, max_bytes)
+        self.max_age = max_age
+
+    def get(self, key: str) -> Optional[CachedAnalysis]:
+        """讀取未過期的結果並更新最近使用時間；未命中或已過期回傳 None"""
+        with self._lock:
+            conn = self._connect()
+            row = conn.execute("SELECT model, result, created_at FROM analyses WHERE key = ?", (key,)).fetchone()
+            if row is None or time.time() - row[2] >= self.max_age:
+                self.misses += 1
+                return None
+            conn.execute("UPDATE analyses SET last_access = ? WHERE key = ?", (time.time(), key))
+            conn.commit()
+            self.hits += 1
+        return CachedAnalysis(json.loads(row[1]), row[0], row[2])
+
+    def put(self, key: str, model: str, result: dict):
+        """寫入結果 (相同鍵覆蓋)，並淘汰過期與超出容量的項目"""
+        text = json.dumps(result, ensure_ascii=False)
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            conn.execute("INSERT OR REPLACE INTO analyses (key, model, result, created_at, last_access, size) "
+                         "VALUES (?, ?, ?, ?, ?, ?)", (key, model, text, now, now, len(text.encode("utf-8"))))
+            conn.execute("DELETE FROM analyses WHERE created_at < ?", (now - self.max_age,))
+            self._evict(conn)
+            conn.commit()
+
+# // 功能: AI 分析結果快取 (內容雜湊鍵 + 過期 + LRU)
+# // input: 提示輸入 / 模型 / 提示版本
+# // output: CachedAnalysis
@@ -0,0 +1,139 @@
+# 新增 [modules/ai_pool.py] 區塊 A: AI 工作池與配額排程 (AI Worker Pool / Quota Scheduling)
+# 修正原因：AI 呼叫原本在 Streamlit 執行緒上逐一執行、以固定 sleep 節流，完全不考慮每分鐘請求數 (RPM)
+#           與每分鐘 token 數 (TPM) 的配額。改為有上限的工作池，每次呼叫前向配額取得額度；
+#           遇到 429 時暫停所有工作並降低速率 (之後逐步恢復)，並統計佇列深度與吞吐量。
+# 替換/新增指示：這是新檔案，請放置於 modules 資料夾。由 ai_agent.py 建立並使用。
+
+import asyncio
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Optional
+
+from .rate_limit import TokenBucket
+
+# 預設值對應 Gemini 2.5 Flash 免費額度；付費帳號可用環境變數調高
+AI_RPM = int(os.getenv("GEMINI_RPM", "10"))
+AI_TPM = int(os.getenv("GEMINI_TPM", "250000"))
+AI_WORKERS = int(os.getenv("AI_WORKERS", "4"))
+AI_MAX_QUEUE = 64           # 等待中的工作上限，超過時 submit 會阻塞 (背壓)
+BURST_SECONDS = 10          # 瞬間可用的額度 = 每秒速率 x 此秒數 (避免一分鐘內超發)
+MIN_RATE_FRACTION = 0.1     # 連續 429 時速率最低降到設定值的比例
+RECOVERY_STEP = 0.05        # 每次成功後恢復的速率比例
+
+class AdaptiveQuota:
+    """
+    RPM / TPM 雙 Token Bucket (thread-safe)
+    - acquire(tokens) / acquire_async(tokens)：取得 1 個請求 + 預估 token 數的額度，不足時阻塞 (或 await)
+    - throttled(delay)：收到 429 時所有呼叫暫停 delay 秒，速率減半
+    - succeeded()：成功後速率逐步恢復到設定值
+    """
+    def __init__(self, rpm: int = AI_RPM, tpm: int = AI_TPM):
+        self.rpm = rpm
+        self.tpm = tpm
+        self.scale = 1.0
+        self.throttles = 0
+        self._requests = TokenBucket(rpm / 60, max(1.0, rpm / 60 * BURST_SECONDS))
+        self._tokens = TokenBucket(tpm / 60, max(1.0, tpm / 60 * BURST_SECONDS))
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def _apply_scale(self):
+        self._requests.set_rate(self.rpm / 60 * self.scale)
+        self._tokens.set_rate(self.tpm / 60 * self.scale)
+
+    def acquire(self, tokens: int = 0):
+        while (wait := self._paused_until - time.monotonic()) > 0:
+            time.sleep(wait)
+        self._requests.acquire()
+        if tokens:
+            # 單次請求超過瞬間額度時以額度上限計算，否則會永遠等不到
+            self._tokens.acquire(min(float(tokens), self._tokens.capacity))
+
+    async def acquire_async(self, tokens: int = 0):
+        """acquire 的 asyncio 版本 (等待時讓出事件迴圈)"""
+        while (wait := self._paused_until - time.monotonic()) > 0:
+            await asyncio.sleep(wait)
+        await self._requests.acquire_async()
+        if tokens:
+            await self._tokens.acquire_async(min(float(tokens), self._tokens.capacity))
+
+    def throttled(self, delay: float):
+        with self._lock:
+            self.throttles += 1
+            self.scale = max(MIN_RATE_FRACTION, self.scale / 2)
+            self._apply_scale()
+            self._paused_until = max(self._paused_until, time.monotonic() + delay)
+
+    def succeeded(self):
+        if self.scale >= 1.0: return
+        with self._lock:
+            self.scale = min(1.0, self.scale + RECOVERY_STEP)
+            self._apply_scale()
+
+    def stats(self) -> dict:
+        return {"rpm": round(self.rpm * self.scale, 1), "tpm": round(self.tpm * self.scale),
+                "throttles": self.throttles, "paused": max(0.0, round(self._paused_until - time.monotonic(), 1))}
+
+class AiWorkerPool:
+    """
+    有上限的 AI 工作池：最多 workers 個同時進行的呼叫，等待中的工作超過 max_queue 時 submit 阻塞
+    結果以 Future 取回；呼叫端 (Streamlit 執行緒) 可用 as_completed 更新進度。
+    """
+    def __init__(self, workers: int = AI_WORKERS, max_queue: int = AI_MAX_QUEUE):
+        self.workers = workers
+        self.submitted = 0
+        self.started = 0
+        self.completed = 0
+        self.failed = 0
+        self._finished_at = deque(maxlen=1000)
+        self._slots = threading.BoundedSemaphore(workers + max_queue)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def _run(self, fn: Callable, args, kwargs):
+        with self._lock:
+            self.started += 1
+        ok = False
+        try:
+            result = fn(*args, **kwargs)
+            ok = True
+            return result
+        finally:
+            with self._lock:
+                if ok: self.completed += 1
+                else: self.failed += 1
+                self._finished_at.append(time.monotonic())
+            self._slots.release()
+
+    def submit(self, fn: Callable, *args, **kwargs) -> Future:
+        self._slots.acquire()
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="ai-worker")
+            self.submitted += 1
+        try:
+            return self._executor.submit(self._run, fn, args, kwargs)
+        except Exception:
+            self._slots.release()
+            raise
+
+    def stats(self) -> dict:
+        """佇列深度、進行中數量與最近一分鐘的吞吐量 (完成數/分鐘)"""
+        now = time.monotonic()
+        with self._lock:
+            recent = sum(1 for t in self._finished_at if now - t <= 60)
+            return {"queued": self.submitted - self.started, "in_flight": self.started - self.completed - self.failed,
+                    "completed": self.completed, "failed": self.failed, "per_minute": recent}
+
+    def shutdown(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+# // 功能: AI 工作池 (有上限的執行緒池 + RPM/TPM 配額 + 429 自適應退避)
+# // input: 工作函式 / 預估 token 數
+# // output: Future / 佇列與吞吐量統計
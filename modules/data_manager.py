@@ -61,17 +61,22 @@ def import_json(json_content: str) -> Dict[str, Any]:
     """從 JSON 還原資料庫"""
     try:
         data = json.loads(json_content)
-        success = 0
         error = 0
+        books = []
         
         for item in data:
             try:
-                book = Book(**item)
-                database.insert_book(book)
-                success += 1
+                books.append(Book(**item))
             except Exception as e:
                 print(f"JSON Import Error: {e}")
                 error += 1
+        
+        # // 【關鍵修正點】 改為批次交易寫入，避免每筆 commit 一次
+        result = database.bulk_upsert_books(books)
+        for index, err in result.failures:
+            print(f"JSON Import Error ({books[index].title}): {err}")
+        success = result.success
+        error += result.failed
                 
         return {"status": "success", "msg": f"還原成功 {success} 筆，失敗 {error} 筆"}
     except Exception as e:
@@ -123,8 +128,8 @@ def process_csv_import(file_buffer) -> Dict[str, Any]:
             
         else:
             # 完整匯入模式
-            success = 0
             fail = 0
+            new_books = []
             
             for _, row in df.iterrows():
                 try:
@@ -184,13 +189,19 @@ def process_csv_import(file_buffer) -> Dict[str, Any]:
                         ai_plot_analysis=clean_str(row.get("ai_plot_analysis")) or "待補完 (請點擊重新分析)"
                     )
                     
-                    database.insert_book(new_book)
-                    success += 1
+                    new_books.append(new_book)
                     
                 except Exception as e:
                     print(f"Row Import Failed: {e}")
                     fail += 1
             
+            # // 【關鍵修正點】 整批寫入 (分段交易)，單筆失敗不影響其他資料
+            result = database.bulk_upsert_books(new_books)
+            for index, err in result.failures:
+                print(f"Row Import Failed ({new_books[index].title}): {err}")
+            success = result.success
+            fail += result.failed
+            
             return {
                 "status": "success", 
                 "mode": "direct_insert",
@@ -3,102 +3,755 @@
 import sqlite3
 import json
 import os
-from typing import List, Optional
+import queue
+import threading
+import atexit
+from contextlib import contextmanager
+from functools import lru_cache
+from dataclasses import dataclass, field
+from typing import Iterable, List, Optional, Tuple
 from datetime import date
-from .models import Book, BookStatus
+from .models import Book, BookStatus, BookFilters, BookSummary, SortOrder, SUMMARY_PREVIEW_CHARS
 
 DB_PATH = os.path.join("data", "library.db")
 
+# // 【關鍵修正點】 連線層 PRAGMA 設定：每條連線建立時套用一次
+# WAL 讓讀寫互不阻塞，synchronous=NORMAL 在 WAL 下仍可保證一致性且大幅減少 fsync
+DB_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "mmap_size": 256 * 1024 * 1024,  # 256 MB
+    "cache_size": -64000,            # 負值代表 KiB (約 64 MB)
+    "temp_store": "MEMORY",
+    "busy_timeout": 5000,            # 毫秒，避免批次匯入與 UI 同時寫入時直接報錯
+}
+
+# 連線池上限 (Streamlit 每次 rerun 皆可能換執行緒，因此以借出/歸還模式共用連線)
+POOL_SIZE = 8
+
+class ConnectionPool:
+    """
+    SQLite 長連線池
+    連線以 check_same_thread=False 建立，但同一時間只會借給一個執行緒使用。
+    """
+    def __init__(self, db_path: str, pragmas: dict, max_size: int = POOL_SIZE):
+        self.db_path = db_path
+        self.pragmas = dict(pragmas)
+        self.max_size = max_size
+        self._idle = queue.LifoQueue(maxsize=max_size)
+        self._lock = threading.Lock()
+        self._all = []
+        self._closed = False
+
+    def _open(self) -> sqlite3.Connection:
+        db_dir = os.path.dirname(self.db_path)
+        if db_dir:
+            os.makedirs(db_dir, exist_ok=True)
+        conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        for key, value in self.pragmas.items():
+            conn.execute(f"PRAGMA {key}={value}")
+        return conn
+
+    def acquire(self) -> sqlite3.Connection:
+        if self._closed:
+            raise RuntimeError("連線池已關閉")
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        conn = self._open()
+        with self._lock:
+            self._all.append(conn)
+        return conn
+
+    def release(self, conn: sqlite3.Connection):
+        if self._closed:
+            conn.close()
+            return
+        try:
+            self._idle.put_nowait(conn)
+        except queue.Full:
+            # 超出池容量的臨時連線直接關閉
+            with self._lock:
+                if conn in self._all:
+                    self._all.remove(conn)
+            conn.close()
+
+    def close(self):
+        """關閉池內所有連線 (程式結束時呼叫)"""
+        self._closed = True
+        with self._lock:
+            conns, self._all = self._all, []
+        for conn in conns:
+            try:
+                conn.close()
+            except sqlite3.Error:
+                pass
+
+_pool: Optional[ConnectionPool] = None
+_pool_lock = threading.Lock()
+
+def _get_pool() -> ConnectionPool:
+    """取得目前 DB_PATH 對應的連線池 (DB_PATH 被替換時自動重建)"""
+    global _pool
+    pool = _pool
+    if pool is not None and pool.db_path == DB_PATH and not pool._closed:
+        return pool
+    with _pool_lock:
+        if _pool is None or _pool.db_path != DB_PATH or _pool._closed:
+            if _pool is not None:
+                _pool.close()
+            _pool = ConnectionPool(DB_PATH, DB_PRAGMAS)
+        return _pool
+
+@contextmanager
 def get_connection():
-    os.makedirs(os.path.dirname(DB_PATH), exist_ok=True)
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
-    return conn
+    """
+    從連線池借出連線 (with 區塊)
+    區塊正常結束時 commit，發生例外時 rollback，最後歸還連線。
+    """
+    pool = _get_pool()
+    conn = pool.acquire()
+    try:
+        yield conn
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        pool.release(conn)
 
-def init_db():
-    conn = get_connection()
-    c = conn.cursor()
-    # // 【關鍵修正點】 CREATE TABLE 移除 word_count 與 chapters
-    c.execute('''
-        CREATE TABLE IF NOT EXISTS books (
-            id TEXT PRIMARY KEY,
-            title TEXT NOT NULL,
-            author TEXT,
-            source TEXT,
-            url TEXT,
-            status TEXT,
-            tags TEXT,
-            ai_summary TEXT,
-            official_desc TEXT,
-            ai_plot_analysis TEXT,
-            added_date TEXT,
-            completed_date TEXT,
-            user_rating INTEGER,
-            user_review TEXT
+def close_connections():
+    """關閉連線池 (Shutdown Hook)"""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.close()
+            _pool = None
+
+atexit.register(close_connections)
+
+# === Schema 版本管理 (Migrations) ===
+# 每個 migration 只會在資料庫檔案上執行一次，完成後寫入 schema_version。
+# 讀取路徑因此可以假設 schema 永遠是最新版，不需逐列做相容處理。
+
+# books 表的正式欄位 (順序即 CREATE TABLE 順序)
+BOOK_COLUMNS = [
+    "id", "title", "author", "source", "url",
+    "status", "tags", "ai_summary", "official_desc", "ai_plot_analysis",
+    "added_date", "completed_date", "user_rating", "user_review",
+]
+
+# 歷史版本曾存在、現已廢棄的欄位
+_DEAD_COLUMNS = ["word_count", "chapters"]
+
+_BOOKS_DDL = '''
+    CREATE TABLE IF NOT EXISTS {name} (
+        id TEXT PRIMARY KEY,
+        title TEXT NOT NULL,
+        author TEXT,
+        source TEXT,
+        url TEXT,
+        status TEXT,
+        tags TEXT,
+        ai_summary TEXT,
+        official_desc TEXT,
+        ai_plot_analysis TEXT,
+        added_date TEXT,
+        completed_date TEXT,
+        user_rating INTEGER,
+        user_review TEXT
+    )
+'''
+
+def _migration_1_books(conn: sqlite3.Connection):
+    """建立 books 主表"""
+    conn.execute(_BOOKS_DDL.format(name="books"))
+
+def _migration_2_drop_dead_columns(conn: sqlite3.Connection):
+    """移除舊版的 word_count / chapters 欄位"""
+    existing = {row[1] for row in conn.execute("PRAGMA table_info(books)")}
+    dead = [c for c in _DEAD_COLUMNS if c in existing]
+    if not dead:
+        return
+    if sqlite3.sqlite_version_info >= (3, 35, 0):
+        for column in dead:
+            conn.execute(f"ALTER TABLE books DROP COLUMN {column}")
+        return
+    # 舊版 SQLite 不支援 DROP COLUMN：重建資料表 (保留 rowid)
+    cols = ", ".join(BOOK_COLUMNS)
+    conn.execute(_BOOKS_DDL.format(name="books_migrating"))
+    conn.execute(f"INSERT INTO books_migrating (rowid, {cols}) SELECT rowid, {cols} FROM books")
+    conn.execute("DROP TABLE books")
+    conn.execute("ALTER TABLE books_migrating RENAME TO books")
+
+def _migration_3_indexes(conn: sqlite3.Connection):
+    """篩選/排序用索引 (列表頁的三鍵排序可直接走索引，不必全表排序)"""
+    for stmt in [
+        "CREATE INDEX IF NOT EXISTS idx_books_status ON books(status, added_date)",
+        "CREATE INDEX IF NOT EXISTS idx_books_added ON books(added_date, author, title)",
+        "CREATE INDEX IF NOT EXISTS idx_books_added_desc ON books(added_date DESC, author, title)",
+        "CREATE INDEX IF NOT EXISTS idx_books_completed ON books(completed_date)",
+        "CREATE INDEX IF NOT EXISTS idx_books_author ON books(author)",
+    ]:
+        conn.execute(stmt)
+
+def _migration_4_book_tags(conn: sqlite3.Connection):
+    """
+    正規化標籤表：books.tags (JSON) 仍為主資料，book_tags 為同步維護的索引表
+    建立時由 JSON 欄位一次性回填。
+    """
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS book_tags (
+            book_id TEXT NOT NULL,
+            tag TEXT NOT NULL,
+            PRIMARY KEY (book_id, tag)
+        )
+    ''')
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_book_tags_tag ON book_tags(tag, book_id)")
+    conn.execute("DELETE FROM book_tags")
+    conn.execute('''
+        INSERT OR IGNORE INTO book_tags (book_id, tag)
+        SELECT books.id, json_each.value
+        FROM books, json_each(books.tags)
+        WHERE books.tags IS NOT NULL AND json_valid(books.tags)
+    ''')
+
+# // 【關鍵修正點】 全文檢索 (FTS5 external content)：由 trigger 與 books 表同步
+# trigram 分詞對中文書名不需斷詞即可做子字串比對；舊版 SQLite 不支援時退回 unicode61
+FTS_COLUMNS = ["title", "author", "official_desc", "ai_summary", "ai_plot_analysis", "user_review"]
+# bm25 欄位權重 (順序同 FTS_COLUMNS)：書名 > 作者 > AI 短評 > 其他長文
+_FTS_WEIGHTS = "10.0, 5.0, 1.0, 2.0, 1.0, 1.0"
+# trigram 分詞最短可索引的字數，較短的關鍵字改走子字串掃描
+_FTS_MIN_TERM = 3
+
+def _fts_tokenizer(conn: sqlite3.Connection) -> Optional[str]:
+    """可用的 FTS5 分詞器 (SQLite 未編入 FTS5 時回傳 None)"""
+    for tokenizer in ("trigram", "unicode61"):
+        try:
+            conn.execute(f"CREATE VIRTUAL TABLE temp._fts_probe USING fts5(x, tokenize='{tokenizer}')")
+            conn.execute("DROP TABLE temp._fts_probe")
+            return tokenizer
+        except sqlite3.OperationalError:
+            continue
+    return None
+
+def _migration_5_fts(conn: sqlite3.Connection):
+    """建立 books_fts 與同步 trigger，並由 books 表重建索引"""
+    tokenizer = _fts_tokenizer(conn)
+    if tokenizer is None:
+        # 未編入 FTS5 的 SQLite：不建全文索引，搜尋一律走子字串比對 (見 _fts_ready)
+        print("⚠️ 此 SQLite 未支援 FTS5，略過全文檢索索引，搜尋改用子字串比對")
+        return
+    cols = ", ".join(FTS_COLUMNS)
+    new_cols = ", ".join(f"new.{c}" for c in FTS_COLUMNS)
+    old_cols = ", ".join(f"old.{c}" for c in FTS_COLUMNS)
+    conn.execute(
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS books_fts USING fts5({cols}, content='books', content_rowid='rowid', "
+        f"tokenize='{tokenizer}')"
+    )
+    conn.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS books_fts_ai AFTER INSERT ON books BEGIN
+            INSERT INTO books_fts(rowid, {cols}) VALUES (new.rowid, {new_cols});
+        END
+    ''')
+    conn.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS books_fts_ad AFTER DELETE ON books BEGIN
+            INSERT INTO books_fts(books_fts, rowid, {cols}) VALUES ('delete', old.rowid, {old_cols});
+        END
+    ''')
+    conn.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS books_fts_au AFTER UPDATE ON books BEGIN
+            INSERT INTO books_fts(books_fts, rowid, {cols}) VALUES ('delete', old.rowid, {old_cols});
+            INSERT INTO books_fts(rowid, {cols}) VALUES (new.rowid, {new_cols});
+        END
+    ''')
+    conn.execute("INSERT INTO books_fts(books_fts) VALUES ('rebuild')")
+
+# 依版本號排序；新增 migration 時只能往後追加，不可修改已發佈的項目
+MIGRATIONS = [
+    (1, _migration_1_books),
+    (2, _migration_2_drop_dead_columns),
+    (3, _migration_3_indexes),
+    (4, _migration_4_book_tags),
+    (5, _migration_5_fts),
+]
+
+SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+def get_schema_version(conn: sqlite3.Connection) -> int:
+    """讀取資料庫目前的 schema 版本 (尚未建立版本表時為 0)"""
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS schema_version (
+            version INTEGER PRIMARY KEY,
+            description TEXT,
+            applied_at TEXT
         )
     ''')
+    row = conn.execute("SELECT MAX(version) FROM schema_version").fetchone()
+    return row[0] or 0
+
+def migrate(conn: sqlite3.Connection) -> List[int]:
+    """
+    依序套用尚未執行的 migration (每個 migration 為獨立交易)
+    回傳本次套用的版本號列表。
+    """
+    current = get_schema_version(conn)
     conn.commit()
-    conn.close()
+    applied = []
+    for version, func in MIGRATIONS:
+        if version <= current:
+            continue
+        try:
+            conn.execute("BEGIN")
+            func(conn)
+            conn.execute(
+                "INSERT INTO schema_version (version, description, applied_at) VALUES (?, ?, datetime('now'))",
+                (version, (func.__doc__ or func.__name__).strip().splitlines()[0])
+            )
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        print(f"🗃️ 資料庫已升級至 schema v{version}")
+        applied.append(version)
+    return applied
+
+def init_db():
+    """初始化/升級資料庫 (啟動時呼叫一次)"""
+    with get_connection() as conn:
+        migrate(conn)
+    _fts_tables.pop(DB_PATH, None)
+
+# 各資料庫檔案是否有 books_fts (DB_PATH -> bool)
+_fts_tables = {}
+
+def _fts_ready() -> bool:
+    """目前的資料庫是否有全文索引 (SQLite 未支援 FTS5 時 migration 5 不會建立)"""
+    ready = _fts_tables.get(DB_PATH)
+    if ready is None:
+        with get_connection() as conn:
+            row = conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'books_fts'").fetchone()
+        ready = _fts_tables[DB_PATH] = row is not None
+    return ready
 
 # --- 輔助函式 ---
+@lru_cache(maxsize=8192)
+def _decode_tags(raw: str) -> tuple:
+    """tags JSON 解碼 (同一組標籤字串大量重複，以 tuple 快取避免共用可變 list)"""
+    return tuple(json.loads(raw))
+
+def _decode_row(names: List[str], values: tuple) -> Book:
+    """
+    將資料列轉換為 Book 物件 (信任路徑：資料來自本資料庫，schema 已由 migration 保證)
+    只在 Python 端處理 JSON 欄位；日期字串與狀態 Enum 直接交給 pydantic-core 轉換，
+    NULL 欄位略過以套用模型預設值。
+    """
+    data = {k: v for k, v in zip(names, values) if v is not None}
+    tags = data.get('tags')
+    data['tags'] = _decode_tags(tags) if tags else ()
+    return Book.model_validate(data)
+
 def _row_to_book(row: sqlite3.Row) -> Book:
     """將資料庫 Row 轉換為 Book 物件"""
-    data = dict(row)
-    
-    # // 【關鍵修正點】 為了相容舊資料庫，如果讀取到已刪除的欄位，將其移除以免報錯
-    data.pop('word_count', None)
-    data.pop('chapters', None)
-
-    # 處理 JSON 欄位
-    data['tags'] = json.loads(data['tags']) if data['tags'] else []
-    # 處理日期欄位
-    if data.get('added_date'):
-        data['added_date'] = date.fromisoformat(data['added_date'])
-    if data.get('completed_date'):
-        data['completed_date'] = date.fromisoformat(data['completed_date'])
-    else:
-        data['completed_date'] = None
-        
-    return Book(**data)
+    return _decode_row(row.keys(), tuple(row))
 
-# --- CRUD 操作 ---
+def _fetch_books(conn: sqlite3.Connection, sql: str, params=()) -> List[Book]:
+    """執行查詢並批次解碼為 Book (以 tuple 讀取，省去 sqlite3.Row 與逐列 keys() 開銷)"""
+    cur = conn.cursor()
+    cur.row_factory = None
+    cur.execute(sql, params)
+    names = [d[0] for d in cur.description]
+    return [_decode_row(names, values) for values in cur.fetchall()]
 
-def insert_book(book: Book):
-    """新增書籍"""
-    conn = get_connection()
-    c = conn.cursor()
-    
+def _book_to_params(book: Book) -> dict:
+    """將 Book 物件轉換為 SQL 參數 (tags 以 JSON 字串儲存)"""
     data = book.model_dump()
     data['tags'] = json.dumps(data['tags'], ensure_ascii=False)
     data['status'] = data['status'].value
     data['added_date'] = data['added_date'].isoformat() if data['added_date'] else None
     data['completed_date'] = data['completed_date'].isoformat() if data['completed_date'] else None
-    
-    # // 【關鍵修正點】 INSERT 語句移除 :word_count 與 :chapters
-    # 注意：即便舊資料庫有這兩個欄位，這裡不寫入也不會報錯 (會填入 NULL)
-    c.execute('''
-        INSERT OR REPLACE INTO books (
-            id, title, author, source, url, 
-            status, tags, ai_summary, official_desc, ai_plot_analysis,
-            added_date, completed_date, user_rating, user_review
-        ) VALUES (
-            :id, :title, :author, :source, :url, 
-            :status, :tags, :ai_summary, :official_desc, :ai_plot_analysis,
-            :added_date, :completed_date, :user_rating, :user_review
-        )
-    ''', data)
-    
-    conn.commit()
-    conn.close()
+    return data
+
+# // 【關鍵修正點】 INSERT 語句移除 :word_count 與 :chapters
+# 注意：即便舊資料庫有這兩個欄位，這裡不寫入也不會報錯 (會填入 NULL)
+# 使用 UPSERT (ON CONFLICT DO UPDATE) 取代 INSERT OR REPLACE，更新時保留原本的 rowid
+_UPSERT_SQL = '''
+    INSERT INTO books (
+        id, title, author, source, url, 
+        status, tags, ai_summary, official_desc, ai_plot_analysis,
+        added_date, completed_date, user_rating, user_review
+    ) VALUES (
+        :id, :title, :author, :source, :url, 
+        :status, :tags, :ai_summary, :official_desc, :ai_plot_analysis,
+        :added_date, :completed_date, :user_rating, :user_review
+    )
+    ON CONFLICT(id) DO UPDATE SET
+        title = excluded.title,
+        author = excluded.author,
+        source = excluded.source,
+        url = excluded.url,
+        status = excluded.status,
+        tags = excluded.tags,
+        ai_summary = excluded.ai_summary,
+        official_desc = excluded.official_desc,
+        ai_plot_analysis = excluded.ai_plot_analysis,
+        added_date = excluded.added_date,
+        completed_date = excluded.completed_date,
+        user_rating = excluded.user_rating,
+        user_review = excluded.user_review
+'''
+
+# 批次寫入預設的每筆交易筆數
+BULK_CHUNK_SIZE = 500
+
+@dataclass
+class BulkUpsertResult:
+    """批次寫入結果：成功筆數與失敗明細 (index 為輸入序列中的位置)"""
+    success: int = 0
+    failures: List[Tuple[int, str]] = field(default_factory=list)
+
+    @property
+    def failed(self) -> int:
+        return len(self.failures)
+
+# --- 資料版本 (Generation) ---
+# 每次透過本模組寫入後遞增，讓上層快取能判斷資料是否變動
+_generation = 0
+_generation_lock = threading.Lock()
+
+def _bump_generation():
+    global _generation
+    with _generation_lock:
+        _generation += 1
+
+def get_generation() -> tuple:
+    """
+    目前的資料版本
+    由本程序的寫入計數與資料庫檔案 (含 WAL) 的修改時間組成，
+    其他程序 (如 batch_importer) 寫入時也能被偵測到。
+    """
+    stamps = []
+    for path in (DB_PATH, DB_PATH + "-wal"):
+        try:
+            st = os.stat(path)
+            stamps.append((st.st_mtime_ns, st.st_size))
+        except OSError:
+            stamps.append(None)
+    return (DB_PATH, _generation, *stamps)
+
+_last_write = threading.local()
+
+@contextmanager
+def _write_transaction():
+    """
+    單次寫入交易 (with 區塊)
+    先以 BEGIN IMMEDIATE 取得寫入鎖再記錄寫入前的資料版本，提交後記錄寫入後的版本；
+    再以 PRAGMA data_version 確認期間沒有其他連線 (其他程序或執行緒) 提交，
+    才把 (寫入前, 寫入後) 記給本執行緒，供 last_write_span() 取用。
+    """
+    _last_write.span = None
+    with get_connection() as conn:
+        conn.execute("BEGIN IMMEDIATE")
+        before = get_generation()
+        version = conn.execute("PRAGMA data_version").fetchone()[0]
+        yield conn
+        conn.commit()
+        _bump_generation()
+        after = get_generation()
+        if conn.execute("PRAGMA data_version").fetchone()[0] == version:
+            _last_write.span = (before, after)
+
+def last_write_span() -> Optional[Tuple[tuple, tuple]]:
+    """
+    取出本執行緒上一次單次寫入的 (寫入前, 寫入後) 資料版本 (取出後即清除)
+    期間混入其他寫入、或上一次寫入並非單次寫入時回傳 None。
+    """
+    span = getattr(_last_write, "span", None)
+    _last_write.span = None
+    return span
+
+# --- CRUD 操作 ---
+
+def _sync_tags(conn: sqlite3.Connection, entries: List[Tuple[str, List[str]]]):
+    """以 (book_id, tags) 覆寫 book_tags 表中對應書籍的標籤"""
+    conn.executemany("DELETE FROM book_tags WHERE book_id = ?", [(book_id,) for book_id, _ in entries])
+    conn.executemany(
+        "INSERT OR IGNORE INTO book_tags (book_id, tag) VALUES (?, ?)",
+        [(book_id, tag) for book_id, tags in entries for tag in tags if tag]
+    )
+
+def insert_book(book: Book):
+    """新增書籍"""
+    data = _book_to_params(book)
+    with _write_transaction() as conn:
+        conn.execute(_UPSERT_SQL, data)
+        _sync_tags(conn, [(book.id, book.tags)])
+
+def bulk_upsert_books(books: Iterable[Book], chunk_size: int = BULK_CHUNK_SIZE) -> BulkUpsertResult:
+    """
+    批次新增/更新書籍
+    每 chunk_size 筆共用一個交易 (executemany)，單筆失敗不會中斷整批。
+    """
+    result = BulkUpsertResult()
+    chunk = []  # [(index, params, tags)]
+
+    def flush(conn):
+        if not chunk:
+            return
+        try:
+            conn.executemany(_UPSERT_SQL, [params for _, params, _ in chunk])
+            _sync_tags(conn, [(params['id'], tags) for _, params, tags in chunk])
+            conn.commit()
+            result.success += len(chunk)
+        except sqlite3.Error:
+            # 整批失敗時退回逐筆寫入，找出真正有問題的資料列
+            conn.rollback()
+            for index, params, tags in chunk:
+                try:
+                    conn.execute("SAVEPOINT bulk_row")
+                    conn.execute(_UPSERT_SQL, params)
+                    _sync_tags(conn, [(params['id'], tags)])
+                    conn.execute("RELEASE bulk_row")
+                    result.success += 1
+                except sqlite3.Error as e:
+                    conn.execute("ROLLBACK TO bulk_row")
+                    conn.execute("RELEASE bulk_row")
+                    result.failures.append((index, str(e)))
+            conn.commit()
+        chunk.clear()
+
+    try:
+        with get_connection() as conn:
+            for index, book in enumerate(books):
+                try:
+                    chunk.append((index, _book_to_params(book), list(book.tags)))
+                except Exception as e:
+                    result.failures.append((index, str(e)))
+                    continue
+                if len(chunk) >= chunk_size:
+                    flush(conn)
+            flush(conn)
+    finally:
+        if result.success:
+            _bump_generation()
+    return result
 
 def get_all_books() -> List[Book]:
     """取得所有書籍"""
-    conn = get_connection()
-    c = conn.cursor()
-    c.execute('SELECT * FROM books ORDER BY added_date DESC, title ASC')
-    rows = c.fetchall()
-    conn.close()
-    return [_row_to_book(row) for row in rows]
+    with get_connection() as conn:
+        return _fetch_books(conn, 'SELECT * FROM books ORDER BY added_date DESC, title ASC')
+
+# 排序方式對應的 ORDER BY (日期 -> 作者 A-Z -> 書名 A-Z)，與 idx_books_added / idx_books_added_desc 對齊
+_ORDER_BY = {
+    SortOrder.NEWEST: "added_date DESC, author ASC, title ASC, id ASC",
+    SortOrder.OLDEST: "added_date ASC, author ASC, title ASC, id ASC",
+}
+
+def _split_terms(query: str) -> Tuple[List[str], List[str]]:
+    """
+    將搜尋字串拆為 (FTS 可用詞, 過短詞)
+    詞尾的 * 代表前綴查詢；過短詞 (少於 3 字) trigram 無法索引，改以子字串比對。
+    資料庫沒有全文索引時所有詞都走子字串比對。
+    """
+    fts_terms, short_terms = [], []
+    min_term = _FTS_MIN_TERM if _fts_ready() else float("inf")
+    for raw in query.split():
+        is_prefix = raw.endswith("*")
+        term = raw.rstrip("*")
+        if not term:
+            continue
+        if len(term) >= min_term:
+            phrase = '"' + term.replace('"', '""') + '"'
+            fts_terms.append(phrase + ("*" if is_prefix else ""))
+        else:
+            short_terms.append(term)
+    return fts_terms, short_terms
+
+def _short_terms_clause(short_terms: List[str], table: str = "books") -> Tuple[List[str], list]:
+    """過短詞的子字串比對條件 (不分大小寫，任一欄位命中即可)"""
+    clauses, params = [], []
+    for term in short_terms:
+        clauses.append("(" + " OR ".join(f"instr(lower({table}.{c}), lower(?)) > 0" for c in FTS_COLUMNS) + ")")
+        params.extend([term] * len(FTS_COLUMNS))
+    return clauses, params
+
+def _keyword_clause(query: str) -> Tuple[str, list]:
+    """關鍵字條件：長詞走 FTS 索引，短詞走子字串比對，所有詞需同時成立"""
+    fts_terms, short_terms = _split_terms(query)
+    clauses, params = _short_terms_clause(short_terms)
+    if fts_terms:
+        clauses.insert(0, "books.rowid IN (SELECT rowid FROM books_fts WHERE books_fts MATCH ?)")
+        params.insert(0, " AND ".join(fts_terms))
+    if not clauses:
+        return "", []
+    return "(" + " AND ".join(clauses) + ")", params
+
+def _build_where(filters: Optional[BookFilters]) -> Tuple[str, list]:
+    """將 BookFilters 轉為 WHERE 子句與參數"""
+    if filters is None:
+        return "", []
+    clauses, params = [], []
+    if filters.tags:
+        marks = ",".join("?" * len(filters.tags))
+        clauses.append(f"id IN (SELECT book_id FROM book_tags WHERE tag IN ({marks}))")
+        params.extend(filters.tags)
+    if filters.statuses:
+        marks = ",".join("?" * len(filters.statuses))
+        clauses.append(f"status IN ({marks})")
+        params.extend(s.value for s in filters.statuses)
+    if filters.authors:
+        marks = ",".join("?" * len(filters.authors))
+        clauses.append(f"author IN ({marks})")
+        params.extend(filters.authors)
+    if filters.keyword:
+        keyword_sql, keyword_params = _keyword_clause(filters.keyword)
+        if keyword_sql:
+            clauses.append(keyword_sql)
+            params.extend(keyword_params)
+    if filters.added_from:
+        clauses.append("added_date >= ?")
+        params.append(filters.added_from.isoformat())
+    if filters.added_to:
+        clauses.append("added_date <= ?")
+        params.append(filters.added_to.isoformat())
+    if not clauses:
+        return "", []
+    return "WHERE " + " AND ".join(clauses), params
+
+def query_books(filters: Optional[BookFilters] = None, sort: SortOrder = SortOrder.NEWEST,
+                limit: Optional[int] = None, offset: int = 0) -> List[Book]:
+    """
+    條件查詢書籍 (篩選、排序、分頁皆在 SQL 完成)
+    limit 為 None 時回傳全部符合條件的書籍。
+    """
+    where, params = _build_where(filters)
+    sql = f"SELECT * FROM books {where} ORDER BY {_ORDER_BY[SortOrder(sort)]}"
+    if limit is not None:
+        sql += " LIMIT ? OFFSET ?"
+        params = params + [limit, offset]
+    with get_connection() as conn:
+        return _fetch_books(conn, sql, params)
+
+# // 【關鍵修正點】 摘要投影：只讀取列表/畫廊/日曆需要的欄位，預覽文字在 SQL 端截斷
+_SUMMARY_COLUMNS = f'''
+    id, title, author, status, user_rating,
+    substr(
+        CASE WHEN ai_summary IS NOT NULL AND ai_summary != '' AND ai_summary != 'AI 尚未分析'
+             THEN ai_summary ELSE COALESCE(official_desc, '') END,
+        1, {SUMMARY_PREVIEW_CHARS + 1}
+    ) AS ai_summary,
+    completed_date, added_date
+'''
+
+_STATUS_BY_VALUE = {s.value: s for s in BookStatus}
+
+@lru_cache(maxsize=8192)
+def _parse_date(raw: str) -> date:
+    return date.fromisoformat(raw)
+
+def query_book_summaries(filters: Optional[BookFilters] = None, sort: SortOrder = SortOrder.NEWEST,
+                         limit: Optional[int] = None, offset: int = 0) -> List[BookSummary]:
+    """條件查詢書籍摘要 (欄位投影版 query_books)"""
+    where, params = _build_where(filters)
+    sql = f"SELECT {_SUMMARY_COLUMNS} FROM books {where} ORDER BY {_ORDER_BY[SortOrder(sort)]}"
+    if limit is not None:
+        sql += " LIMIT ? OFFSET ?"
+        params = params + [limit, offset]
+    with get_connection() as conn:
+        cur = conn.cursor()
+        cur.row_factory = None
+        rows = cur.execute(sql, params).fetchall()
+    return [
+        BookSummary(
+            book_id, title, author or "",
+            _STATUS_BY_VALUE.get(status, BookStatus.UNREAD),
+            rating or 0, preview or "",
+            _parse_date(completed) if completed else None,
+            _parse_date(added) if added else None
+        )
+        for book_id, title, author, status, rating, preview, completed, added in rows
+    ]
+
+def get_all_book_tags() -> List[Tuple[str, str]]:
+    """取得所有 (book_id, tag) 配對 (建立記憶體索引用)"""
+    with get_connection() as conn:
+        cur = conn.cursor()
+        cur.row_factory = None
+        return cur.execute("SELECT book_id, tag FROM book_tags").fetchall()
+
+def match_book_ids(keyword: str) -> Optional[set]:
+    """回傳符合全文檢索關鍵字的書籍 id 集合 (關鍵字沒有可搜尋的詞時回傳 None，代表不篩選)"""
+    keyword_sql, params = _keyword_clause(keyword)
+    if not keyword_sql:
+        return None
+    with get_connection() as conn:
+        cur = conn.cursor()
+        cur.row_factory = None
+        return {row[0] for row in cur.execute(f"SELECT id FROM books WHERE {keyword_sql}", params)}
+
+def get_book(book_id: str) -> Optional[Book]:
+    """以 id 讀取單本完整書籍 (詳情頁用)"""
+    with get_connection() as conn:
+        books = _fetch_books(conn, "SELECT * FROM books WHERE id = ?", (book_id,))
+    return books[0] if books else None
+
+def count_books(filters: Optional[BookFilters] = None) -> int:
+    """計算符合條件的書籍數量 (分頁用)"""
+    where, params = _build_where(filters)
+    with get_connection() as conn:
+        return conn.execute(f"SELECT COUNT(*) FROM books {where}", params).fetchone()[0]
+
+def search_books(query: str, limit: int = 50) -> List[Book]:
+    """
+    全文檢索 (書名/作者/文案/AI 分析/心得)
+    結果依 bm25 相關度排序；支援多個關鍵字 (AND) 與 `詞*` 前綴查詢。
+    """
+    fts_terms, short_terms = _split_terms(query)
+    short_clauses, params = _short_terms_clause(short_terms)
+    if fts_terms:
+        where = " AND ".join(["books_fts MATCH ?"] + short_clauses)
+        sql = f'''
+            SELECT books.* FROM books_fts JOIN books ON books.rowid = books_fts.rowid
+            WHERE {where}
+            ORDER BY bm25(books_fts, {_FTS_WEIGHTS}) LIMIT ?
+        '''
+        params = [" AND ".join(fts_terms)] + params + [limit]
+    elif short_clauses:
+        # 只有短詞時無法使用 FTS 排序，書名命中者優先
+        sql = f'''
+            SELECT * FROM books WHERE {" AND ".join(short_clauses)}
+            ORDER BY instr(lower(title), lower(?)) = 0, added_date DESC LIMIT ?
+        '''
+        params = params + [short_terms[0], limit]
+    else:
+        return []
+    with get_connection() as conn:
+        return _fetch_books(conn, sql, params)
+
+def get_all_tags() -> List[str]:
+    """取得所有出現過的標籤 (已排序、不重複)"""
+    with get_connection() as conn:
+        rows = conn.execute("SELECT DISTINCT tag FROM book_tags ORDER BY tag").fetchall()
+    return [row[0] for row in rows]
+
+def get_tag_counts(top_n: Optional[int] = None, filters: Optional[BookFilters] = None) -> List[Tuple[str, int]]:
+    """
+    標籤使用次數統計 (由多到少)
+    可搭配 filters 只統計符合條件的書籍。
+    """
+    where, params = _build_where(filters)
+    sql = "SELECT tag, COUNT(*) AS cnt FROM book_tags"
+    if where:
+        sql += f" WHERE book_id IN (SELECT id FROM books {where})"
+    sql += " GROUP BY tag ORDER BY cnt DESC, tag ASC"
+    if top_n is not None:
+        sql += " LIMIT ?"
+        params = params + [top_n]
+    with get_connection() as conn:
+        rows = conn.execute(sql, params).fetchall()
+    return [(row[0], row[1]) for row in rows]
 
 def update_book(book: Book):
     """更新書籍"""
@@ -106,10 +759,8 @@ def update_book(book: Book):
 
 def delete_book(book_id: str):
     """刪除書籍"""
-    conn = get_connection()
-    c = conn.cursor()
-    c.execute('DELETE FROM books WHERE id = ?', (book_id,))
-    conn.commit()
-    conn.close()
+    with _write_transaction() as conn:
+        conn.execute('DELETE FROM books WHERE id = ?', (book_id,))
+        conn.execute('DELETE FROM book_tags WHERE book_id = ?', (book_id,))
 
-# // 功能: 資料庫層 (同步移除字數欄位)
\ No newline at end of file
+# // 功能: 資料庫層 (連線池 + WAL)
\ No newline at end of file
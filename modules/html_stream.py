@@ -0,0 +1,113 @@
+# 新增 [modules/html_stream.py] 區塊 A: 串流下載與編碼偵測 (Streaming Download)
+# 修正原因：大型頁面 (FC2 文章彙整、69書吧列表) 不再整頁下載後以 chardet 掃描全文；
+#           改為串流讀取、設定位元組上限，取得 </head> 與簡介區塊後即提前停止，
+#           編碼優先採用 HTTP 標頭 / meta charset，只有都沒有時才以有限長度 sniff。
+# 替換/新增指示：這是新檔案，請放置於 modules 資料夾。由 scraper.py 的 perform_request 使用。
+
+import codecs
+import re
+from typing import AsyncIterable, Iterable, Optional, Sequence, Tuple
+from requests.compat import chardet
+
+MAX_PAGE_BYTES = 2 * 1024 * 1024   # 單頁下載上限
+CHUNK_SIZE = 16 * 1024
+INTRO_TAIL_BYTES = 16 * 1024       # 簡介區塊開頭之後再多讀的長度 (足以涵蓋完整文案)
+SNIFF_BYTES = 64 * 1024            # 無任何 charset 宣告時，chardet 只看前段
+META_SCAN_BYTES = 8 * 1024         # meta charset 只會出現在頁首
+
+_HEADER_CHARSET_RE = re.compile(r'charset\s*=\s*["\']?([\w.:-]+)', re.IGNORECASE)
+_META_CHARSET_RE = re.compile(rb'<meta[^>]+charset\s*=\s*["\']?([\w.:-]+)', re.IGNORECASE)
+_HEAD_END = b"</head>"
+
+# 宣告為 GB2312/GBK 的頁面實際上常含超出範圍的字，統一以超集合解碼
+_ENCODING_ALIASES = {"gb2312": "gb18030", "gbk": "gb18030", "big5": "big5hkscs", "x-sjis": "shift_jis"}
+
+def _normalize_encoding(name: Optional[str]) -> Optional[str]:
+    if not name: return None
+    name = name.strip().lower()
+    name = _ENCODING_ALIASES.get(name, name)
+    try:
+        return codecs.lookup(name).name
+    except LookupError:
+        return None
+
+def detect_encoding(content_type: Optional[str], content: bytes) -> Optional[str]:
+    """編碼偵測順序：HTTP Content-Type → <meta charset> → chardet (只取前 SNIFF_BYTES)"""
+    if content_type:
+        match = _HEADER_CHARSET_RE.search(content_type)
+        encoding = _normalize_encoding(match.group(1)) if match else None
+        if encoding: return encoding
+    match = _META_CHARSET_RE.search(content[:META_SCAN_BYTES])
+    encoding = _normalize_encoding(match.group(1).decode("ascii", "ignore")) if match else None
+    if encoding: return encoding
+    return chardet.detect(content[:SNIFF_BYTES])["encoding"] if content else None
+
+class _Accumulator:
+    """累積串流片段並判斷何時可以停止"""
+    def __init__(self, stop_markers: Sequence[bytes], max_bytes: int):
+        self.stop_markers = tuple(stop_markers)
+        self.max_bytes = max_bytes
+        self.buffer = bytearray()
+        self.truncated = False
+        self._pending = set(self.stop_markers)
+        self._body_start = None   # </head> 之後的位置；標記只在 body 中尋找 (頁首的 CSS / script 也可能提到同名 class)
+        self._last_found = 0
+        self._stop_at = None
+
+    @property
+    def complete(self) -> bool:
+        """False 表示在找到所有標記之前就因位元組上限被截斷 (內容可能缺少簡介，不應寫入快取)"""
+        return not (self.truncated and self._pending)
+
+    def feed(self, chunk: bytes) -> bool:
+        """加入一個片段；回傳 True 表示已取得足夠內容"""
+        # 只掃描新片段 (往前多看一小段，標記可能跨越片段邊界)
+        scan_from = max(0, len(self.buffer) - 64)
+        self.buffer += chunk
+        if self._body_start is None and self.stop_markers:
+            pos = self.buffer.find(_HEAD_END, scan_from)
+            if pos != -1:
+                self._body_start = pos + len(_HEAD_END)
+        if self._body_start is not None and self._pending:
+            start = max(scan_from, self._body_start)
+            for marker in list(self._pending):
+                pos = self.buffer.find(marker, start)
+                if pos != -1:
+                    self._pending.discard(marker)
+                    self._last_found = max(self._last_found, pos)
+            if not self._pending:
+                self._stop_at = self._last_found + INTRO_TAIL_BYTES
+        if len(self.buffer) >= self.max_bytes:
+            del self.buffer[self.max_bytes:]
+            self.truncated = True
+            return True
+        if self._stop_at is not None and len(self.buffer) >= self._stop_at:
+            self.truncated = True
+            return True
+        return False
+
+def read_capped(chunks: Iterable[bytes], stop_markers: Sequence[bytes] = (),
+                max_bytes: int = MAX_PAGE_BYTES) -> Tuple[bytes, bool, bool]:
+    """
+    讀取串流內容直到 (1) 結束 (2) 超過 max_bytes
+    或 (3) </head> 之後已出現所有 stop_markers 並再多讀 INTRO_TAIL_BYTES。
+    回傳 (內容, 是否提前停止, 是否完整)；找到所有標記前就達到上限時「不完整」。
+    """
+    acc = _Accumulator(stop_markers, max_bytes)
+    for chunk in chunks:
+        if chunk and acc.feed(chunk):
+            break
+    return bytes(acc.buffer), acc.truncated, acc.complete
+
+async def read_capped_async(chunks: AsyncIterable[bytes], stop_markers: Sequence[bytes] = (),
+                            max_bytes: int = MAX_PAGE_BYTES) -> Tuple[bytes, bool, bool]:
+    """read_capped 的 asyncio 版本"""
+    acc = _Accumulator(stop_markers, max_bytes)
+    async for chunk in chunks:
+        if chunk and acc.feed(chunk):
+            break
+    return bytes(acc.buffer), acc.truncated, acc.complete
+
+# // 功能: 串流下載 (位元組上限 + 提前停止) 與編碼偵測
+# // input: 串流片段 / Content-Type / 頁面位元組
+# // output: (內容, 是否截斷, 是否完整) / 編碼名稱
@@ -0,0 +1,139 @@
+# 新增 [modules/http_cache.py] 區塊 A: 爬蟲回應快取 (On-Disk HTTP Cache)
+# 修正原因：重跑 batch_importer 或 AI 資料補全時不再重新下載剛抓過的頁面；
+#           過期頁面以 ETag / Last-Modified 條件請求驗證，並提供離線重播模式供開發解析器使用。
+# 替換/新增指示：這是新檔案，請放置於 modules 資料夾。由 scraper.scrape_book 使用。
+
+import gzip
+import hashlib
+import json
+import os
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+import requests
+from requests.structures import CaseInsensitiveDict
+from .sqlite_cache import SqliteCacheStore
+
+CACHE_PATH = os.path.join("data", "http_cache.db")
+CACHE_TTL_SECONDS = 24 * 60 * 60          # 新鮮期內直接使用快取，不連線
+CACHE_MAX_BYTES = 200 * 1024 * 1024       # 壓縮後總大小上限，超過時依最近使用時間 (LRU) 淘汰
+# 離線模式：只讀快取、不連線 (未命中時視為抓取失敗)；也可用環境變數 SCRAPER_OFFLINE=1 開啟
+OFFLINE = os.getenv("SCRAPER_OFFLINE", "") not in ("", "0")
+
+# 已知的追蹤用參數 (另含 utm_*) 不影響頁面內容，正規化時移除；
+# ref 等常見名稱在部分網站是內容參數，不列入
+_TRACKING_PARAMS = {"srsltid", "fbclid", "gclid"}
+
+def normalize_url(url: str) -> str:
+    """正規化網址：scheme/host 小寫、移除 fragment 與追蹤參數、參數排序"""
+    parts = urlsplit(url.strip())
+    query = sorted(
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if k not in _TRACKING_PARAMS and not k.startswith("utm_")
+    )
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path or "/", urlencode(query), ""))
+
+def cache_key(url: str) -> str:
+    return hashlib.sha256(normalize_url(url).encode("utf-8")).hexdigest()
+
+@dataclass
+class CacheEntry:
+    url: str
+    status_code: int
+    headers: Dict[str, str]
+    body: bytes
+    encoding: Optional[str]
+    fetched_at: float
+    fresh: bool = False     # 讀取時是否可直接使用 (新鮮期內或離線模式)
+
+    @property
+    def age(self) -> float:
+        return time.time() - self.fetched_at
+
+    def validators(self) -> Dict[str, str]:
+        """條件請求標頭 (If-None-Match / If-Modified-Since)"""
+        headers = {}
+        if self.headers.get("ETag"):
+            headers["If-None-Match"] = self.headers["ETag"]
+        if self.headers.get("Last-Modified"):
+            headers["If-Modified-Since"] = self.headers["Last-Modified"]
+        return headers
+
+    def to_response(self) -> requests.Response:
+        """還原為 requests.Response (解析器與 perform_request 共用同一介面)"""
+        response = requests.Response()
+        response._content = self.body
+        response.status_code = self.status_code
+        response.headers = CaseInsensitiveDict(self.headers)
+        response.url = self.url
+        response.encoding = self.encoding
+        return response
+
+_KEPT_HEADERS = ("ETag", "Last-Modified", "Content-Type")
+
+class HttpCache(SqliteCacheStore):
+    """SQLite + gzip 的回應快取 (thread-safe)"""
+    TABLE = "responses"
+    COLUMNS = """
+        url TEXT NOT NULL,
+        status INTEGER NOT NULL,
+        headers TEXT NOT NULL,
+        body BLOB NOT NULL,
+        encoding TEXT,
+        fetched_at REAL NOT NULL"""
+    COUNTERS = ("hits", "revalidated", "misses")
+
+    def __init__(self, path: str = CACHE_PATH, ttl: float = CACHE_TTL_SECONDS, max_bytes: int = CACHE_MAX_BYTES):
+        super().__init__(path, max_bytes)
+        self.ttl = ttl
+
+    def get(self, url: str, refresh: bool = False) -> Optional[CacheEntry]:
+        """
+        讀取快取 (不論是否過期)，並更新最近使用時間
+        entry.fresh 表示可直接使用 (新鮮期內且非 refresh，或離線模式)，此時計入 hits。
+        """
+        key = cache_key(url)
+        with self._lock:
+            conn = self._connect()
+            row = conn.execute(
+                "SELECT url, status, headers, body, encoding, fetched_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute("UPDATE responses SET last_access = ? WHERE key = ?", (time.time(), key))
+            conn.commit()
+            fresh = OFFLINE or (not refresh and time.time() - row[5] < self.ttl)
+            if fresh:
+                self.hits += 1
+        return CacheEntry(row[0], row[1], json.loads(row[2]), gzip.decompress(row[3]), row[4], row[5], fresh)
+
+    def put(self, url: str, response: requests.Response):
+        """寫入從網路下載的回應 (計入 misses，內容以 gzip 壓縮)，超過容量時淘汰最久未使用的項目"""
+        headers = {h: response.headers[h] for h in _KEPT_HEADERS if response.headers.get(h)}
+        body = gzip.compress(response.content, compresslevel=6)
+        now = time.time()
+        with self._lock:
+            self.misses += 1
+            conn = self._connect()
+            conn.execute(
+                "INSERT OR REPLACE INTO responses (key, url, status, headers, body, encoding, fetched_at, last_access, size) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (cache_key(url), url, response.status_code, json.dumps(headers), body,
+                 response.encoding, now, now, len(body))
+            )
+            self._evict(conn)
+            conn.commit()
+
+    def touch(self, url: str):
+        """304 Not Modified：內容未變，重設新鮮期 (計入 revalidated)"""
+        now = time.time()
+        with self._lock:
+            self.revalidated += 1
+            conn = self._connect()
+            conn.execute("UPDATE responses SET fetched_at = ?, last_access = ? WHERE key = ?", (now, now, cache_key(url)))
+            conn.commit()
+
+# // 功能: 爬蟲回應快取 (TTL + 條件請求 + LRU + 離線模式)
+# // input: URL / requests.Response
+# // output: CacheEntry (可還原為 requests.Response)
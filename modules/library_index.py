@@ -0,0 +1,212 @@
+# 新增 [modules/library_index.py] 區塊 A: 記憶體次級索引 (In-Memory Secondary Indexes)
+# 修正原因：篩選改為集合交集、排序順序預先維護，寫入時增量更新而非整批重建。
+# 替換/新增指示：這是新檔案，請放置於 modules 資料夾。由 services.py 持有與維護。
+
+from bisect import bisect_left, insort
+from collections import Counter, defaultdict
+from datetime import date
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from .models import BookFilters, BookStatus, BookSummary, SortOrder
+
+class LibraryIndex:
+    """
+    書庫記憶體索引
+    - status / tag / author -> id 集合
+    - 入庫日期的兩種排序 (最新/最早，次序鍵為作者、書名、id，與 SQL 排序一致)
+    - 完食日期排序 (日曆與本月統計用)
+    """
+    def __init__(self):
+        self.summaries: Dict[str, BookSummary] = {}
+        self.by_status: Dict[BookStatus, Set[str]] = defaultdict(set)
+        self.by_tag: Dict[str, Set[str]] = defaultdict(set)
+        self.by_author: Dict[str, Set[str]] = defaultdict(set)
+        self._tags: Dict[str, Tuple[str, ...]] = {}
+        self._oldest: List[tuple] = []     # (added_iso, author, title, id)
+        self._newest: List[tuple] = []     # (-added_ordinal, author, title, id)
+        self._completed: List[tuple] = []  # (completed_iso, id)
+        self._rating_sum = 0
+        self._rated_count = 0
+
+    # --- 排序鍵 ---
+    @staticmethod
+    def _oldest_key(s: BookSummary) -> tuple:
+        return (s.added_date.isoformat() if s.added_date else "", s.author or "", s.title, s.id)
+
+    @staticmethod
+    def _newest_key(s: BookSummary) -> tuple:
+        # 日期由新到舊；無日期者排最後 (同 SQL 的 DESC 行為)
+        return (-s.added_date.toordinal() if s.added_date else 1, s.author or "", s.title, s.id)
+
+    # --- 建立與增量維護 ---
+    @classmethod
+    def build(cls, summaries: Iterable[BookSummary], tag_pairs: Iterable[Tuple[str, str]]) -> "LibraryIndex":
+        """由資料庫快照一次建立 (排序只做一次)"""
+        index = cls()
+        tags = defaultdict(list)
+        for book_id, tag in tag_pairs:
+            tags[book_id].append(tag)
+        for s in summaries:
+            index._add(s, tags.get(s.id, ()), sort=False)
+        index._oldest.sort()
+        index._newest.sort()
+        index._completed.sort()
+        return index
+
+    def _add(self, s: BookSummary, tags: Iterable[str], sort: bool = True):
+        self.summaries[s.id] = s
+        self.by_status[s.status].add(s.id)
+        self.by_author[s.author or ""].add(s.id)
+        tags = tuple(dict.fromkeys(t for t in tags if t))
+        self._tags[s.id] = tags
+        for tag in tags:
+            self.by_tag[tag].add(s.id)
+        if s.user_rating and s.user_rating > 0:
+            self._rating_sum += s.user_rating
+            self._rated_count += 1
+        entries = [(self._oldest, self._oldest_key(s)), (self._newest, self._newest_key(s))]
+        if s.completed_date:
+            entries.append((self._completed, (s.completed_date.isoformat(), s.id)))
+        for order, key in entries:
+            if sort:
+                insort(order, key)
+            else:
+                order.append(key)
+
+    @staticmethod
+    def _discard_sorted(order: List[tuple], key: tuple):
+        pos = bisect_left(order, key)
+        if pos < len(order) and order[pos] == key:
+            del order[pos]
+
+    def remove(self, book_id: str):
+        """移除一本書 (不存在時忽略)"""
+        s = self.summaries.pop(book_id, None)
+        if s is None:
+            return
+        self.by_status[s.status].discard(book_id)
+        ids = self.by_author[s.author or ""]
+        ids.discard(book_id)
+        if not ids:
+            del self.by_author[s.author or ""]
+        for tag in self._tags.pop(book_id, ()):
+            ids = self.by_tag[tag]
+            ids.discard(book_id)
+            if not ids:
+                del self.by_tag[tag]
+        if s.user_rating and s.user_rating > 0:
+            self._rating_sum -= s.user_rating
+            self._rated_count -= 1
+        self._discard_sorted(self._oldest, self._oldest_key(s))
+        self._discard_sorted(self._newest, self._newest_key(s))
+        if s.completed_date:
+            self._discard_sorted(self._completed, (s.completed_date.isoformat(), book_id))
+
+    def upsert(self, summary: BookSummary, tags: Iterable[str]):
+        """新增或更新一本書"""
+        self.remove(summary.id)
+        self._add(summary, tags)
+
+    def __len__(self) -> int:
+        return len(self.summaries)
+
+    # --- 查詢 ---
+    def _added_range(self, start: Optional[date], end: Optional[date]) -> Set[str]:
+        lo = bisect_left(self._oldest, (start.isoformat(),)) if start else 0
+        # 空字串 (無入庫日期) 不應落在任何區間內
+        lo = max(lo, bisect_left(self._oldest, ("\x00",)))
+        hi = bisect_left(self._oldest, (end.isoformat() + "\x00",)) if end else len(self._oldest)
+        return {key[3] for key in self._oldest[lo:hi]}
+
+    def candidates(self, filters: Optional[BookFilters], keyword_ids: Optional[Set[str]] = None) -> Optional[Set[str]]:
+        """
+        依條件取得候選 id 集合 (各條件以集合交集組合)
+        回傳 None 代表沒有任何篩選 (全部書籍)。
+        """
+        sets = []
+        if keyword_ids is not None:
+            sets.append(keyword_ids)
+        if filters is not None:
+            if filters.tags:
+                sets.append(set().union(*(self.by_tag.get(t, ()) for t in filters.tags)))
+            if filters.statuses:
+                sets.append(set().union(*(self.by_status.get(s, ()) for s in filters.statuses)))
+            if filters.authors:
+                sets.append(set().union(*(self.by_author.get(a, ()) for a in filters.authors)))
+            if filters.added_from or filters.added_to:
+                sets.append(self._added_range(filters.added_from, filters.added_to))
+        if not sets:
+            return None
+        sets.sort(key=len)
+        result = set(sets[0])
+        for other in sets[1:]:
+            result &= other
+            if not result:
+                break
+        return result
+
+    def count(self, candidates: Optional[Set[str]]) -> int:
+        return len(self.summaries) if candidates is None else len(candidates)
+
+    def page(self, candidates: Optional[Set[str]], sort: SortOrder = SortOrder.NEWEST,
+             limit: Optional[int] = None, offset: int = 0) -> List[BookSummary]:
+        """依排序取出一頁 (排序順序已預先維護，不需重新排序整個書庫)"""
+        newest = SortOrder(sort) == SortOrder.NEWEST
+        order = self._newest if newest else self._oldest
+        end = None if limit is None else offset + limit
+        if candidates is None:
+            keys = order[offset:end]
+        elif len(candidates) * 4 < len(order):
+            # 候選集合很小時直接排序候選者
+            key_func = self._newest_key if newest else self._oldest_key
+            keys = sorted(key_func(self.summaries[i]) for i in candidates)[offset:end]
+        else:
+            keys = [key for key in order if key[3] in candidates][offset:end]
+        return [self.summaries[key[3]] for key in keys]
+
+    def all_tags(self) -> List[str]:
+        return sorted(self.by_tag)
+
+    def all_authors(self) -> List[str]:
+        return sorted(author for author in self.by_author if author)
+
+    def tag_counts(self, top_n: Optional[int] = None, candidates: Optional[Set[str]] = None) -> List[Tuple[str, int]]:
+        if candidates is None:
+            counts = [(tag, len(ids)) for tag, ids in self.by_tag.items()]
+        else:
+            counter = Counter(tag for book_id in candidates for tag in self._tags.get(book_id, ()))
+            counts = list(counter.items())
+        counts.sort(key=lambda item: (-item[1], item[0]))
+        return counts if top_n is None else counts[:top_n]
+
+    def kpi_stats(self, candidates: Optional[Set[str]] = None, today: Optional[date] = None) -> dict:
+        """儀表板 KPI；未篩選時全由索引計算，篩選時只掃描候選者一次"""
+        today = today or date.today()
+        completed_ids = self.by_status.get(BookStatus.COMPLETED, set())
+        if candidates is None:
+            lo = bisect_left(self._completed, (today.replace(day=1).isoformat(),))
+            hi = bisect_left(self._completed, (today.strftime("%Y-%m") + "-32",))
+            this_month = sum(1 for _, book_id in self._completed[lo:hi] if book_id in completed_ids)
+            total, completed = len(self.summaries), len(completed_ids)
+            rating_sum, rated_count = self._rating_sum, self._rated_count
+        else:
+            total, completed = len(candidates), len(candidates & completed_ids)
+            this_month = rating_sum = rated_count = 0
+            for book_id in candidates:
+                s = self.summaries[book_id]
+                if book_id in completed_ids and s.completed_date \
+                        and (s.completed_date.year, s.completed_date.month) == (today.year, today.month):
+                    this_month += 1
+                if s.user_rating and s.user_rating > 0:
+                    rating_sum += s.user_rating
+                    rated_count += 1
+        avg_rating = rating_sum / rated_count if rated_count else 0.0
+        return {
+            "total": total,
+            "completed": completed,
+            "this_month": this_month,
+            "avg_rating": round(avg_rating, 1)
+        }
+
+# // 功能: 書庫記憶體次級索引 (增量維護)
+# // input: BookSummary + 標籤
+# // output: 候選 id 集合、排序分頁、統計
@@ -14,6 +14,22 @@ class BookStatus(str, Enum):
     COMPLETED = "已完食"
     DROPPED = "棄坑"
 
+# 列表排序方式 (value 即為介面顯示文字)
+class SortOrder(str, Enum):
+    NEWEST = "最新入庫"
+    OLDEST = "最早入庫"
+
+class BookFilters(BaseModel):
+    """
+    書籍查詢條件 (下推至 SQL 執行)
+    """
+    tags: List[str] = Field(default_factory=list, description="符合任一標籤即可")
+    statuses: List[BookStatus] = Field(default_factory=list)
+    authors: List[str] = Field(default_factory=list, description="符合任一作者即可 (完全相符)")
+    keyword: str = Field(default="", description="全文檢索關鍵字 (書名/作者/文案/AI 分析/心得)")
+    added_from: Optional[date] = None
+    added_to: Optional[date] = None
+
 class Book(BaseModel):
     """
     書籍資料模型 (移除字數版)
@@ -40,4 +56,42 @@ class Book(BaseModel):
 
     # // 功能: 定義書籍資料結構
     # // input: 無
-    # // output: Pydantic Model Class
\ No newline at end of file
+    # // output: Pydantic Model Class
+
+# 列表/畫廊預覽文字的長度 (超過時由畫面加上省略號)
+SUMMARY_PREVIEW_CHARS = 40
+
+class BookSummary:
+    """
+    書籍摘要唯讀模型 (列表 / 畫廊 / 日曆專用)
+    只包含畫面會顯示的欄位，不載入官方文案、劇情分析與心得等長文字；
+    完整資料於開啟詳情時再以 book id 讀取。
+    """
+    __slots__ = ("id", "title", "author", "status", "user_rating", "ai_summary", "completed_date", "added_date")
+
+    def __init__(self, id: str, title: str, author: str, status: BookStatus,
+                 user_rating: int = 0, ai_summary: str = "", completed_date: Optional[date] = None,
+                 added_date: Optional[date] = None):
+        self.id = id
+        self.title = title
+        self.author = author
+        self.status = status
+        self.user_rating = user_rating
+        self.ai_summary = ai_summary  # 已截斷；AI 尚未分析時為官方文案開頭
+        self.completed_date = completed_date
+        self.added_date = added_date
+
+    @classmethod
+    def from_book(cls, book: "Book") -> "BookSummary":
+        """由完整 Book 產生摘要 (規則與資料庫端的投影一致)"""
+        preview = book.ai_summary if book.ai_summary and book.ai_summary != "AI 尚未分析" else book.official_desc
+        return cls(
+            book.id, book.title, book.author, book.status, book.user_rating,
+            (preview or "")[:SUMMARY_PREVIEW_CHARS + 1], book.completed_date, book.added_date
+        )
+
+    def __repr__(self) -> str:
+        return f"BookSummary(id={self.id!r}, title={self.title!r}, status={self.status.value!r})"
+
+    # // 功能: 輕量書籍摘要 (__slots__，無 Pydantic 驗證)
+
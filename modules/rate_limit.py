@@ -0,0 +1,141 @@
+# 新增 [modules/rate_limit.py] 區塊 A: 網域限流 (Per-Domain Rate Limit)
+# 修正原因：並行爬取時，每個網站各自限制同時連線數與每秒請求數 (Token Bucket)，取代呼叫端固定的 time.sleep。
+# 替換/新增指示：這是新檔案，請放置於 modules 資料夾。由 scraper.py 在送出請求前取得 slot。
+
+import asyncio
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Dict, Tuple
+from . import site_registry
+
+@dataclass(frozen=True)
+class DomainLimit:
+    concurrency: int = 2   # 同時連線數上限
+    rate: float = 1.0      # 每秒補充的請求數
+    burst: int = 2         # 允許瞬間連發的請求數
+
+# 各網站的額度在 scraper.py 的站點註冊 (site_registry.register_site 的 limit) 中設定
+DEFAULT_LIMIT = DomainLimit()
+
+class TokenBucket:
+    """Token Bucket：以固定速率補充 token，取用不足時阻塞等待 (thread-safe)"""
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        # 呼叫端需持有 self._lock
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def set_rate(self, rate: float):
+        """調整補充速率 (thread-safe)；先以舊速率結算到目前為止補充的 token"""
+        with self._lock:
+            self._refill()
+            self.rate = rate
+
+    def _reserve(self, tokens: float) -> float:
+        """嘗試取用 token；成功回傳 0，否則回傳需等待的秒數"""
+        with self._lock:
+            self._refill()
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return 0.0
+            return (tokens - self._tokens) / self.rate
+
+    def acquire(self, tokens: float = 1.0):
+        while (wait := self._reserve(tokens)) > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self, tokens: float = 1.0):
+        while (wait := self._reserve(tokens)) > 0:
+            await asyncio.sleep(wait)
+
+class DomainLimiter:
+    """單一網域的限流器：同時連線數 (Semaphore) + 請求速率 (TokenBucket)"""
+    def __init__(self, limit: DomainLimit):
+        self.limit = limit
+        self._slots = threading.BoundedSemaphore(limit.concurrency)
+        self._bucket = TokenBucket(limit.rate, limit.burst)
+
+    @contextmanager
+    def slot(self):
+        with self._slots:
+            self._bucket.acquire()
+            yield
+
+_limiters: Dict[str, DomainLimiter] = {}
+_limiters_lock = threading.Lock()
+
+def resolve_limit(url: str) -> Tuple[str, DomainLimit]:
+    """回傳 (限流鍵, 設定)；未設定的網站以 hostname 為鍵套用預設值"""
+    site = site_registry.lookup(url)
+    if site is not None and site.limit is not None:
+        return site.key, site.limit
+    return site_registry.hostname(url), DEFAULT_LIMIT
+
+def get_limiter(url: str) -> DomainLimiter:
+    key, limit = resolve_limit(url)
+    with _limiters_lock:
+        limiter = _limiters.get(key)
+        if limiter is None:
+            limiter = _limiters[key] = DomainLimiter(limit)
+        return limiter
+
+# asyncio 後端以 AsyncDomainSlots.hold 持有中的限流鍵；asyncio.to_thread 會複製 context，
+# 因此在 hold 區塊內改走同步路徑的執行緒沿用同一份連線額度，不再另取 domain_slot 的 Semaphore
+_held_keys: ContextVar[frozenset] = ContextVar("rate_limit_held_keys", default=frozenset())
+
+@contextmanager
+def domain_slot(url: str):
+    """在該網域的限額內執行一次請求 (已由 AsyncDomainSlots.hold 持有同網域額度時只取用 token)"""
+    limiter = get_limiter(url)
+    if resolve_limit(url)[0] in _held_keys.get():
+        limiter._bucket.acquire()
+        yield
+        return
+    with limiter.slot():
+        yield
+
+class AsyncDomainSlots:
+    """
+    asyncio 版的網域限流
+    asyncio.Semaphore 綁定 event loop，因此每次批次 (每個 loop) 各自建立；
+    請求速率的 token bucket 與同步路徑共用，兩種後端同時執行也不會超過網站額度。
+    """
+    def __init__(self):
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+
+    @asynccontextmanager
+    async def hold(self, url: str):
+        """
+        只取得該網域的同時連線額度 (不取用 token)
+        區塊內以 asyncio.to_thread 執行的同步請求 (domain_slot) 沿用此額度，兩種路徑合計不會超過 concurrency。
+        """
+        key, limit = resolve_limit(url)
+        semaphore = self._semaphores.get(key)
+        if semaphore is None:
+            semaphore = self._semaphores[key] = asyncio.Semaphore(limit.concurrency)
+        async with semaphore:
+            token = _held_keys.set(_held_keys.get() | {key})
+            try:
+                yield
+            finally:
+                _held_keys.reset(token)
+
+    @asynccontextmanager
+    async def slot(self, url: str):
+        async with self.hold(url):
+            await get_limiter(url)._bucket.acquire_async()
+            yield
+
+# // 功能: 網域限流 (Semaphore + Token Bucket，同步/asyncio 兩種介面)
+# // input: URL
+# // output: 可用於 with 的 slot
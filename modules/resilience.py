@@ -0,0 +1,196 @@
+# 新增 [modules/resilience.py] 區塊 A: 爬蟲重試、退避與斷路器 (Retry / Backoff / Circuit Breaker)
+# 修正原因：原本 scrape_book 遇到任何例外都只印出訊息並回傳 None；
+#           不穩定的網站每個網址都要等滿逾時，暫時性錯誤也直接寫進 import_failures.csv。
+#           改為 429/5xx/逾時以隨機抖動的指數退避重試，同一網站連續失敗時斷路 (之後的網址立即失敗)，
+#           並以結構化的失敗原因回報給呼叫端。
+# 替換/新增指示：這是新檔案，請放置於 modules 資料夾。由 scraper.py 的 _fetch / _fetch_async 使用。
+
+import random
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from enum import Enum
+from typing import Dict, Optional
+
+CONNECT_TIMEOUT = 5      # 建立連線的逾時 (網站掛掉時不必等滿讀取逾時)
+READ_TIMEOUT = 15
+RETRYABLE_STATUS = frozenset({429, 500, 502, 503, 504})
+
+class FailureKind(str, Enum):
+    HTTP_STATUS = "http_status"      # 4xx 等不會因重試而改善的狀態碼
+    RATE_LIMITED = "rate_limited"    # 429 重試後仍失敗
+    SERVER_ERROR = "server_error"    # 5xx 重試後仍失敗
+    TIMEOUT = "timeout"
+    CONNECTION = "connection"
+    CIRCUIT_OPEN = "circuit_open"    # 該網站已斷路，未送出請求
+    BLACKLISTED = "blacklisted"
+    OFFLINE_MISS = "offline_miss"    # 離線模式且快取未命中
+    PARSE_ERROR = "parse_error"
+    INVALID_URL = "invalid_url"      # 空白或格式錯誤的網址，未送出請求
+
+_KIND_LABELS = {
+    FailureKind.HTTP_STATUS: "HTTP 錯誤", FailureKind.RATE_LIMITED: "請求過於頻繁 (429)",
+    FailureKind.SERVER_ERROR: "伺服器錯誤", FailureKind.TIMEOUT: "連線逾時",
+    FailureKind.CONNECTION: "無法連線", FailureKind.CIRCUIT_OPEN: "網站暫時停用 (斷路)",
+    FailureKind.BLACKLISTED: "不支援的網站", FailureKind.OFFLINE_MISS: "離線模式無快取",
+    FailureKind.PARSE_ERROR: "解析失敗", FailureKind.INVALID_URL: "網址無效",
+}
+
+@dataclass(frozen=True)
+class ScrapeFailure:
+    url: str
+    kind: FailureKind
+    detail: str = ""
+    status: Optional[int] = None
+    attempts: int = 0
+
+    @property
+    def retryable(self) -> bool:
+        """稍後重跑可能成功的失敗 (與網址本身無關)"""
+        return self.kind in (FailureKind.RATE_LIMITED, FailureKind.SERVER_ERROR, FailureKind.TIMEOUT,
+                             FailureKind.CONNECTION, FailureKind.CIRCUIT_OPEN)
+
+    def describe(self) -> str:
+        """寫入 import_failures.csv 的說明文字"""
+        text = _KIND_LABELS[self.kind]
+        if self.status is not None:
+            text += f" [{self.status}]"
+        if self.attempts > 1:
+            text += f" (嘗試 {self.attempts} 次)"
+        return f"{text}: {self.detail}" if self.detail else text
+
+class ScrapeError(Exception):
+    """攜帶 ScrapeFailure 的例外，由 _fetch 拋出、scrape_book 轉為失敗紀錄"""
+    def __init__(self, failure: ScrapeFailure):
+        super().__init__(failure.describe())
+        self.failure = failure
+
+def _retry_after_seconds(value: Optional[str]) -> Optional[float]:
+    if not value: return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    max_attempts: int = 3
+    base_delay: float = 1.0
+    max_delay: float = 30.0
+
+    def delay(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        """
+        第 attempt 次 (由 1 起算) 失敗後的等待秒數
+        full jitter：在 [0, base * 2^(attempt-1)] 間隨機，避免多個執行緒同時重試；
+        伺服器回傳 Retry-After 時以其為下限 (仍不超過 max_delay)。
+        """
+        delay = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+        seconds = _retry_after_seconds(retry_after)
+        if seconds is not None:
+            delay = max(delay, min(seconds, self.max_delay))
+        return delay
+
+DEFAULT_POLICY = RetryPolicy()
+
+class CircuitBreaker:
+    """
+    單一網站的斷路器 (thread-safe)
+    - closed：正常放行；連續失敗達 failure_threshold 次後轉為 open
+    - open：reset_timeout 秒內所有請求立即失敗
+    - half-open：逾時後只放行一個試探請求，成功則恢復，失敗則重新計時
+    """
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 60.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._probing = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._opened_at is None:
+                return "closed"
+            return "half-open" if time.monotonic() - self._opened_at >= self.reset_timeout else "open"
+
+    def allow(self) -> bool:
+        return self.admit() is not None
+
+    def admit(self) -> Optional[bool]:
+        """
+        放行時回傳是否為 half-open 的試探請求，不放行回傳 None
+        試探請求結束時不論結果 (含 429、例外、被取消) 都必須呼叫 release，否則網站會一直停在 half-open。
+        """
+        with self._lock:
+            if self._opened_at is None:
+                return False
+            if time.monotonic() - self._opened_at < self.reset_timeout or self._probing:
+                return None
+            self._probing = True
+            return True
+
+    def release(self):
+        """結束試探但不改變狀態 (已呼叫 record_success / record_failure 時無作用)，下一個請求可再次試探"""
+        with self._lock:
+            self._probing = False
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._probing = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._probing or self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+            self._probing = False
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+def get_breaker(key: str) -> CircuitBreaker:
+    """依限流鍵取得斷路器 (同一網站的各個鏡像共用)"""
+    with _breakers_lock:
+        breaker = _breakers.get(key)
+        if breaker is None:
+            breaker = _breakers[key] = CircuitBreaker()
+        return breaker
+
+def open_circuits() -> Dict[str, str]:
+    with _breakers_lock:
+        breakers = dict(_breakers)
+    return {key: b.state for key, b in breakers.items() if b.state != "closed"}
+
+# 最近的失敗紀錄 (網址 -> ScrapeFailure)，供只拿到 None 的呼叫端查詢原因
+MAX_FAILURE_RECORDS = 10000
+_failures: "OrderedDict[str, ScrapeFailure]" = OrderedDict()
+_failures_lock = threading.Lock()
+
+def record_failure(failure: ScrapeFailure):
+    with _failures_lock:
+        _failures[failure.url] = failure
+        _failures.move_to_end(failure.url)
+        if len(_failures) > MAX_FAILURE_RECORDS:
+            _failures.popitem(last=False)
+
+def clear_failure(url: str):
+    with _failures_lock:
+        _failures.pop(url, None)
+
+def last_failure(url: str) -> Optional[ScrapeFailure]:
+    """該網址最近一次的失敗原因 (之後爬取成功時會清除)"""
+    with _failures_lock:
+        return _failures.get(url)
+
+# // 功能: 重試退避 (full jitter + Retry-After)、網站斷路器、結構化失敗原因
+# // input: 失敗次數 / 限流鍵 / 網址
+# // output: 等待秒數 / CircuitBreaker / ScrapeFailure
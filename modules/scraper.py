@@ -7,15 +7,50 @@
 import requests
 import cloudscraper
 from bs4 import BeautifulSoup
+import lxml.html
+from lxml import etree
 from dataclasses import dataclass
 from fake_useragent import UserAgent
 import re
 from urllib.parse import urlparse
 import json
-from opencc import OpenCC
-
-# 初始化轉換器
-cc = OpenCC('s2t')
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, List, Optional, Set
+from . import html_stream
+from . import rate_limit
+from . import site_registry
+from . import session_pool
+from . import http_cache
+from . import text_normalize
+from . import resilience
+from .resilience import FailureKind, ScrapeError, ScrapeFailure
+
+# [選用] 非同步爬蟲後端；未安裝 httpx 時 scrape_many 改用執行緒池
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+# 預先編譯的文字解析規則 (清洗規則見 text_normalize)
+_INFO_AUTHOR_RE = re.compile(r"作者[：:︰]\s*([^\s]+)")
+_INFO_DESC_RE = re.compile(r"(作品簡介|內容簡介|簡介)[：:︰]\s*(.*)", re.DOTALL)
+_TITLE_BY_AUTHOR_RE = re.compile(r'(.*)\s+by\s+(.*)', re.IGNORECASE)
+
+DESKTOP_UA = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+
+# 依網域重用的 cloudscraper session (保留 keep-alive 連線與 Cloudflare clearance cookie)
+_sessions = session_pool.create_pool(
+    lambda: cloudscraper.create_scraper(browser={'browser': 'chrome', 'platform': 'windows', 'desktop': True})
+)
+
+# 已下載頁面的磁碟快取 (data/http_cache.db)
+_http_cache = http_cache.HttpCache()
+
+# 429/5xx/逾時/連線錯誤的重試策略 (_fetch / _fetch_async 未指定 policy 時於呼叫當下讀取)
+SCRAPE_RETRY = resilience.DEFAULT_POLICY
 
 # 定義統一的資料結構
 @dataclass
@@ -26,64 +61,87 @@ class RawBookData:
     source_name: str
     url: str
 
+def _stripped_headers(headers) -> list:
+    """串流讀取後的內容已解壓縮，重建回應時去掉 Content-Encoding / Content-Length"""
+    return [(k, v) for k, v in headers.multi_items() if k.lower() not in ("content-encoding", "content-length")]
+
 # --- 基礎爬蟲類別 ---
 class BaseScraper:
+    # 頁面中簡介區塊的標記 (bytes)；</head> 與這些標記都出現後即可提前停止下載，空值表示讀到上限為止
+    stream_markers: tuple = ()
+
+    def _encoding(self, url: str, content_type: Optional[str], content: bytes) -> Optional[str]:
+        site = site_registry.lookup(url)
+        if site is not None and site.encoding:
+            return site.encoding
+        return html_stream.detect_encoding(content_type, content)
+
+    def _stream_get(self, scraper, url: str, headers: Optional[dict] = None):
+        """串流 GET：最多讀取 MAX_PAGE_BYTES，取得簡介區塊後提前結束連線"""
+        response = scraper.get(url, headers=headers, stream=True,
+                               timeout=(resilience.CONNECT_TIMEOUT, resilience.READ_TIMEOUT))
+        try:
+            content, _, complete = html_stream.read_capped(response.iter_content(html_stream.CHUNK_SIZE),
+                                                           self.stream_markers)
+        finally:
+            response.close()
+        response._content = content
+        response._content_consumed = True
+        response.stream_complete = complete
+        response.encoding = self._encoding(url, response.headers.get("Content-Type"), content)
+        return response
+
+    async def _stream_get_async(self, client, url: str, headers: Optional[dict] = None):
+        """_stream_get 的 asyncio 版本；httpx 串流回應關閉後無法再讀取，因此以已讀內容重建回應"""
+        async with client.stream("GET", url, headers=headers) as streamed:
+            content, _, complete = await html_stream.read_capped_async(
+                streamed.aiter_bytes(html_stream.CHUNK_SIZE), self.stream_markers)
+        response = httpx.Response(streamed.status_code, headers=_stripped_headers(streamed.headers),
+                                  content=content, request=streamed.request)
+        response.stream_complete = complete
+        response.encoding = self._encoding(url, streamed.headers.get("Content-Type"), content)
+        return response
+
+    def _request_headers(self, url: str) -> dict:
+        site = site_registry.lookup(url)
+        return dict(site.headers) if site is not None else {}
+
     def perform_request(self, scraper, url: str):
         """執行網路請求的策略方法"""
-        headers = {}
-        if "books.com.tw" in url:
-             headers["User-Agent"] = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
-        
-        response = scraper.get(url, headers=headers, timeout=15)
+        response = self._stream_get(scraper, url, self._request_headers(url))
         response.raise_for_status()
-        
-        if "jjwxc" in url:
-            response.encoding = 'gb18030'
-        else:
-            response.encoding = response.apparent_encoding
+        return response
+
+    async def perform_request_async(self, client, url: str, headers: Optional[dict] = None):
+        """perform_request 的 asyncio 版本 (httpx.AsyncClient)；headers 為額外的條件請求標頭"""
+        response = await self._stream_get_async(client, url, {**(headers or {}), **self._request_headers(url)})
+        if response.status_code >= 400:
+            response.raise_for_status()
         return response
 
     def parse(self, html_content: str, url: str) -> RawBookData:
+        """
+        先走 lxml 快速路徑 (_parse_fast)，資訊不足時才建立 BeautifulSoup 樹 (_parse_soup)
+        兩條路徑在快速路徑有結果時必須一致；快速路徑只處理常見的完整頁面，補救邏輯留在 _parse_soup。
+        """
+        doc = _fast_doc(html_content)
+        data = self._parse_fast(doc, url) if doc is not None else None
+        return data or self._parse_soup(BeautifulSoup(html_content, 'lxml'), url)
+
+    def _parse_fast(self, doc, url: str) -> Optional[RawBookData]:
+        return None
+
+    def _parse_soup(self, soup, url: str) -> RawBookData:
         raise NotImplementedError
 
     def _clean_text(self, text: str) -> str:
-        if not text: return ""
-        text = re.sub(r'<[^>]+>', '', text)
-        text = re.sub(r'&[a-zA-Z]+;', '', text)
-        text = re.sub(r'\s+', ' ', text)
-        return cc.convert(text.strip())
+        return text_normalize.clean_text(text)
 
     def _clean_title(self, raw_title: str) -> str:
-        if not raw_title: return "未知標題"
-        
-        # 1. 簡轉繁
-        raw_title = cc.convert(raw_title)
-        
-        # 2. 去除符號 (包含全形直線 ｜)
-        title = re.sub(r'[《》【】\[\]〈〉]', '', raw_title).strip()
-        
-        # 3. 分割網站後綴
-        # POPO 標題通常是 "書名｜POPO小說原創"，這裡用 split 切割
-        title = re.split(r'[|_｜]', title)[0].strip()
-        
-        seo_keywords = r"(小說|全文|閱讀|最新|章節|下載|txt|筆趣閣|半夏|晉江|起點|無彈窗|手機版|online|read|fc2|blog|博客來|誠品|eslite|books|bookwalker|套書|POPO|原創)"
-        pattern = fr"([-,\s]+.*{seo_keywords}.*$)"
-        title = re.sub(pattern, "", title, flags=re.IGNORECASE).strip()
-        
-        if "," in title:
-            parts = title.split(",")
-            if len(parts) > 1 and len(parts[0]) > 1 and parts[0].strip() in parts[1]:
-                title = parts[0].strip()
-        return title
+        return text_normalize.clean_title(raw_title)
 
     def _clean_author(self, raw_author: str) -> str:
-        if not raw_author or raw_author == "未知作者": return "未知作者"
-        raw_author = cc.convert(raw_author)
-        
-        author = re.sub(r'^(作者|Author|著|编|繪|譯|插畫)\s*[：:︰]?\s*', '', raw_author, flags=re.IGNORECASE).strip()
-        if "BOOKWALKER" in author or "電子書" in author or "出版社" in author or "POPO" in author:
-            return "未知作者"
-        return author if author else "未知作者"
+        return text_normalize.clean_author(raw_author)
 
     def _is_spam_description(self, text: str) -> bool:
         spam_keywords = ["情節跌宕起伏", "扣人心弦", "免費提供", "最新章節", "全文閱讀", "密碼認證", "出版社：", "ISBN：", "出版日期：", "點數兌換"]
@@ -94,71 +152,72 @@ class BaseScraper:
 
     def _parse_info_from_text(self, text: str) -> dict:
         result = {"author": None, "description": None}
-        author_match = re.search(r"作者[：:︰]\s*([^\s]+)", text)
+        author_match = _INFO_AUTHOR_RE.search(text)
         if author_match: result["author"] = author_match.group(1).strip()
-        desc_match = re.search(r"(作品簡介|內容簡介|簡介)[：:︰]\s*(.*)", text, re.DOTALL)
+        desc_match = _INFO_DESC_RE.search(text)
         if desc_match:
             desc_text = desc_match.group(2).strip()
             if "最新章節" in desc_text: desc_text = desc_text.split("最新章節")[0].strip()
             result["description"] = desc_text
         return result
 
+    def _json_ld_item(self, texts):
+        for text in texts:
+            try:
+                data = json.loads(text)
+                if not isinstance(data, list): data = [data]
+                for item in data:
+                    if item.get('@type') in ['Book', 'Product', 'ItemPage', 'Novel']:
+                        return item
+            except: continue
+        return None
+
     def _extract_json_ld(self, soup):
         try:
-            scripts = soup.find_all('script', type='application/ld+json')
-            for script in scripts:
-                try:
-                    data = json.loads(script.string)
-                    if not isinstance(data, list): data = [data]
-                    for item in data:
-                        if item.get('@type') in ['Book', 'Product', 'ItemPage', 'Novel']:
-                            return item
-                except: continue
+            return self._json_ld_item(script.string for script in soup.find_all('script', type='application/ld+json'))
         except: pass
         return None
 
-    def _extract_meta_data(self, soup, url):
-        source_name = "未知來源"
+    def _extract_json_ld_fast(self, doc):
+        """JSON-LD 快速路徑 (lxml XPath)"""
+        try:
+            return self._json_ld_item(doc.xpath('//script[@type="application/ld+json"]/text()'))
+        except: pass
+        return None
+
+    def _source_name(self, url: str) -> str:
+        site = site_registry.lookup(url)
+        if site is not None and site.source_name:
+            return site.source_name
         domain = ""
         try:
             domain = urlparse(url).netloc.replace("www.", "")
         except: pass
+        return domain or "未知來源"
 
-        DOMAIN_NAME_MAP = {
-            "ixdzs8.com": "愛下電子書", "tw.ixdzs8.com": "愛下電子書",
-            "69shu.com": "69書吧", "69shuba.com": "69書吧",
-            "sto.cx": "思兔閱讀", "sto520.com": "思兔閱讀",
-            "popo.tw": "POPO原創",
-            "fc2.com": "FC2部落格", "blog.fc2.com": "FC2部落格",
-            "books.com.tw": "博客來", "bookwalker.com.tw": "BOOKWALKER"
-        }
-        
-        if domain in DOMAIN_NAME_MAP:
-            source_name = DOMAIN_NAME_MAP[domain]
-        else:
-            for key, name in DOMAIN_NAME_MAP.items():
-                if key in domain:
-                    source_name = name
-                    break
-            if source_name == "未知來源" and domain:
-                source_name = domain
+    def _meta_fields(self, find_meta, page_title, url) -> RawBookData:
+        """
+        由 meta/og 標籤解析書名、作者、文案 (BeautifulSoup 與 lxml 兩條路徑共用)
+        find_meta(屬性, 值) 回傳該 meta 的 content；標籤不存在時回傳 None。
+        """
+        source_name = self._source_name(url)
 
         raw_title = ""
-        meta_title = soup.find("meta", property="og:title")
-        if meta_title: raw_title = meta_title.get("content", "")
-        elif soup.title: raw_title = soup.title.string
+        meta_title = find_meta("property", "og:title")
+        if meta_title is not None: raw_title = meta_title
+        elif page_title is not None: raw_title = page_title
         title = self._clean_title(raw_title)
 
         raw_author = "未知作者"
-        for tag in [soup.find("meta", property="og:novel:author"), soup.find("meta", property="book:author"), soup.find("meta", attrs={"name": "author"})]:
-            if tag and tag.get("content"):
-                raw_author = tag["content"]
+        for content in [find_meta("property", "og:novel:author"), find_meta("property", "book:author"), find_meta("name", "author")]:
+            if content:
+                raw_author = content
                 break
         
         author = self._clean_author(raw_author)
         
         if author == "未知作者":
-            match = re.search(r'(.*)\s+by\s+(.*)', title, re.IGNORECASE)
+            match = _TITLE_BY_AUTHOR_RE.search(title)
             if match:
                 potential_title = match.group(1).strip()
                 potential_author = match.group(2).strip()
@@ -167,9 +226,27 @@ class BaseScraper:
                     author = self._clean_author(potential_author)
 
         description = "無法抓取文案"
-        meta_desc = soup.find("meta", property="og:description") or soup.find("meta", attrs={"name": "description"})
-        if meta_desc and meta_desc.get("content") and not self._is_spam_description(meta_desc.get("content")):
-            description = self._clean_text(meta_desc["content"])
+        meta_desc = find_meta("property", "og:description")
+        if meta_desc is None: meta_desc = find_meta("name", "description")
+        if meta_desc and not self._is_spam_description(meta_desc):
+            description = self._clean_text(meta_desc)
+
+        return RawBookData(title, author, description, source_name, url)
+
+    def _extract_meta_fast(self, doc, url: str):
+        """
+        快速路徑：lxml.html (C 實作) 單次走訪 meta 標籤，不建立 BeautifulSoup 樹
+        作者或文案缺漏 (需要掃描 DOM 補救) 時回傳 None，由呼叫端改走 _extract_meta_data。
+        """
+        title_tag = doc.find(".//title")
+        data = self._meta_fields(_lxml_meta_finder(doc), title_tag.text if title_tag is not None else None, url)
+        if data.author == "未知作者" or data.description == "無法抓取文案":
+            return None
+        return data
+
+    def _extract_meta_data(self, soup, url):
+        data = self._meta_fields(_soup_meta_finder(soup), soup.title.string if soup.title else None, url)
+        author, description = data.author, data.description
 
         if author == "未知作者" or description == "無法抓取文案":
             for selector in ["div.book-detail", "div.book-info", "div.detail", "div.intro", "div.main", "div.entry_body", "div.entry-content", "div.sub_main"]:
@@ -185,12 +262,81 @@ class BaseScraper:
                         description = blind_desc
                         if description != "無法抓取文案": break
 
-        return RawBookData(title, author, description, source_name, url)
+        data.author, data.description = author, description
+        return data
+
+# --- HTML 解析輔助 ---
+_FAST_PARSER = lxml.html.HTMLParser(encoding="utf-8")
+
+def _fast_doc(html_content: str):
+    """以 lxml.html 解析頁面；無法解析時回傳 None"""
+    if not html_content: return None
+    try:
+        return lxml.html.fromstring(html_content.encode("utf-8", "surrogatepass"), parser=_FAST_PARSER)
+    except (ValueError, etree.ParserError):
+        return None
+
+def _has_class(name: str) -> str:
+    """XPath 條件：class 含有 name (與 BeautifulSoup 的 class_= 比對相同)"""
+    return f'contains(concat(" ", normalize-space(@class), " "), " {name} ")'
+
+def _first(node, *paths):
+    """依序嘗試 XPath，回傳第一個命中的元素；皆未命中時回傳 None"""
+    for path in paths:
+        found = node.xpath(path)
+        if found: return found[0]
+    return None
+
+def _fast_text(element, strip: bool = False) -> str:
+    """元素內的文字，與 BeautifulSoup 的 get_text() / get_text(strip=True) 相同 (略過註解與 script/style)"""
+    parts = []
+    for node in element.iter():
+        if isinstance(node.tag, str) and node.tag not in ("script", "style"):
+            parts.append(node.text)
+        if node is not element:
+            parts.append(node.tail)
+    if strip:
+        return "".join(part.strip() for part in parts if part and part.strip())
+    return "".join(part for part in parts if part)
+
+def _lxml_meta_finder(doc):
+    """單次走訪所有 meta 標籤建立查表 (同屬性值以第一個出現者為準，與 soup.find 一致)"""
+    metas = {}
+    for tag in doc.iter("meta"):
+        content = tag.get("content", "")
+        for attr in ("property", "name"):
+            value = tag.get(attr)
+            if value is not None:
+                metas.setdefault((attr, value), content)
+    return lambda attr, value: metas.get((attr, value))
+
+def _soup_meta_finder(soup):
+    def find(attr, value):
+        tag = soup.find("meta", attrs={attr: value})
+        return None if tag is None else tag.get("content", "")
+    return find
 
 # --- 具體策略實作 ---
 class JjwxcScraper(BaseScraper):
-    def parse(self, html_content: str, url: str) -> RawBookData:
-        soup = BeautifulSoup(html_content, 'lxml')
+    stream_markers = (b'novelintro',)
+
+    def _parse_fast(self, doc, url: str) -> Optional[RawBookData]:
+        try:
+            title_tag = _first(doc, '//h1[@itemprop="name"]', f'//span[{_has_class("bigtext")}]')
+            title = self._clean_title(_fast_text(title_tag, strip=True)) if title_tag is not None else None
+            author_tag = _first(doc, '//span[@itemprop="author"]')
+            author = self._clean_author(_fast_text(author_tag, strip=True)) if author_tag is not None else None
+            intro_tag = _first(doc, '//div[@id="novelintro"]')
+            description = self._clean_text(_fast_text(intro_tag)) if intro_tag is not None else None
+            if title and description:
+                description = description.replace("文案：", "").strip()
+                return RawBookData(title, author or "未知", description, "晉江文學城", url)
+        except Exception: return None
+        data = self._extract_meta_fast(doc, url)
+        if data: data.source_name = "晉江文學城 (Meta)"
+        return data
+
+    def _parse_soup(self, soup, url: str) -> RawBookData:
         try:
             title_tag = soup.find('h1', itemprop='name') or soup.find('span', class_='bigtext')
             title = self._clean_title(title_tag.get_text(strip=True)) if title_tag else None
@@ -207,8 +353,34 @@ class JjwxcScraper(BaseScraper):
         return data
 
 class BanxiaScraper(BaseScraper):
-    def parse(self, html_content: str, url: str) -> RawBookData:
-        soup = BeautifulSoup(html_content, 'lxml')
+    stream_markers = (b'book-describe',)
+
+    def _parse_fast(self, doc, url: str) -> Optional[RawBookData]:
+        try:
+            info_block = _first(doc, f'//div[{_has_class("book-describe")}]', f'//div[{_has_class("book-info")}]')
+            if info_block is not None:
+                title_tag = _first(info_block, './/h1')
+                title = self._clean_title(_fast_text(title_tag, strip=True)) if title_tag is not None else None
+                if title and "半夏小說" in title and len(title) < 6: title = None
+                full_text = self._clean_text(_fast_text(info_block))
+                parsed = self._parse_info_from_text(full_text)
+                if title:
+                    return RawBookData(title, self._clean_author(parsed["author"] or "未知作者"), parsed["description"] or "無法抓取文案", "半夏小說", url)
+            info_div = _first(doc, f'//div[{_has_class("book-info")}]', f'//div[{_has_class("detail")}]')
+            if info_div is not None and _first(doc, f'//div[{_has_class("book-describe")}]') is None:
+                title_node = _first(info_div, './/h1')
+                title = self._clean_title(_fast_text(title_node, strip=True)) if title_node is not None else "未知標題"
+                author_tag = _first(info_div, './/a[contains(@href, "/author/")]')
+                author = self._clean_author(_fast_text(author_tag, strip=True)) if author_tag is not None else "未知作者"
+                desc_tag = _first(doc, f'//div[{_has_class("intro")}]', f'//p[{_has_class("intro")}]')
+                description = self._clean_text(_fast_text(desc_tag)) if desc_tag is not None else "無法抓取文案"
+                return RawBookData(title, author, description, "半夏小說", url)
+        except Exception: return None
+        data = self._extract_meta_fast(doc, url)
+        if data: data.source_name = "半夏小說 (Meta)"
+        return data
+
+    def _parse_soup(self, soup, url: str) -> RawBookData:
         try:
             info_block = soup.find('div', class_='book-describe') or soup.find('div', class_='book-info')
             if info_block:
@@ -234,8 +406,21 @@ class BanxiaScraper(BaseScraper):
         return data
 
 class CzbooksScraper(BaseScraper):
-    def parse(self, html_content: str, url: str) -> RawBookData:
-        soup = BeautifulSoup(html_content, 'lxml')
+    stream_markers = (b'class="description"',)
+
+    def _parse_fast(self, doc, url: str) -> Optional[RawBookData]:
+        title_tag = _first(doc, f'//span[{_has_class("title")}]')
+        author_tag = _first(doc, f'//span[{_has_class("author")}]')
+        desc_tag = _first(doc, f'//div[{_has_class("description")}]')
+        if title_tag is not None and author_tag is not None and desc_tag is not None:
+            return RawBookData(self._clean_title(_fast_text(title_tag, strip=True)),
+                               self._clean_author(_fast_text(author_tag, strip=True)),
+                               self._clean_text(_fast_text(desc_tag)), "小說狂人", url)
+        data = self._extract_meta_fast(doc, url)
+        if data: data.source_name = "小說狂人 (Meta)"
+        return data
+
+    def _parse_soup(self, soup, url: str) -> RawBookData:
         try:
             title = self._clean_title(soup.find('span', class_='title').get_text(strip=True))
             author = self._clean_author(soup.find('span', class_='author').get_text(strip=True))
@@ -247,29 +432,50 @@ class CzbooksScraper(BaseScraper):
             return data
 
 class Fc2Scraper(BaseScraper):
-    def perform_request(self, scraper, url: str):
-        print(f"    -> [FC2] 正在嘗試連線...")
-        response = scraper.get(url, timeout=15)
-        response.encoding = response.apparent_encoding 
+    def _unlock_payload(self, response) -> Optional[dict]:
+        """頁面有密碼鎖時回傳解鎖表單的 payload (含隱藏欄位)，否則回傳 None"""
         soup = BeautifulSoup(response.text, 'lxml')
-        pass_input = soup.find('input', {'name': 'pass'})
-        if pass_input:
-            print(f"    -> [FC2] 偵測到密碼鎖，正在嘗試自動解鎖 (密碼: egg)...")
-            payload = {'pass': 'egg', 'mode': 'secret'}
-            for hidden in soup.find_all('input', type='hidden'):
-                if hidden.get('name'):
-                    payload[hidden.get('name')] = hidden.get('value')
-            post_response = scraper.post(url, data=payload)
-            post_response.encoding = post_response.apparent_encoding
-            if 'name="pass"' not in post_response.text:
-                print(f"    -> [FC2] ✅ 解鎖成功！")
-                return post_response
-            else:
-                print(f"    -> [FC2] ❌ 解鎖失敗")
-                return response
+        if not soup.find('input', {'name': 'pass'}):
+            return None
+        print("    -> [FC2] 偵測到密碼鎖，正在嘗試自動解鎖 (密碼: egg)...")
+        payload = {'pass': 'egg', 'mode': 'secret'}
+        for hidden in soup.find_all('input', type='hidden'):
+            if hidden.get('name'):
+                payload[hidden.get('name')] = hidden.get('value')
+        return payload
+
+    def _unlock_result(self, url: str, response, post_response):
+        """解鎖成功回傳解鎖後的頁面，失敗時沿用原本的回應"""
+        post_response.encoding = self._encoding(url, post_response.headers.get("Content-Type"), post_response.content)
+        if 'name="pass"' not in post_response.text:
+            print("    -> [FC2] ✅ 解鎖成功！")
+            return post_response
+        print("    -> [FC2] ❌ 解鎖失敗")
         return response
-    def parse(self, html_content: str, url: str) -> RawBookData:
-        soup = BeautifulSoup(html_content, 'lxml')
+
+    def perform_request(self, scraper, url: str):
+        print("    -> [FC2] 正在嘗試連線...")
+        response = self._stream_get(scraper, url)
+        payload = self._unlock_payload(response)
+        if payload is None:
+            return response
+        return self._unlock_result(url, response, scraper.post(url, data=payload))
+
+    async def perform_request_async(self, client, url: str, headers: Optional[dict] = None):
+        print("    -> [FC2] 正在嘗試連線... (async)")
+        response = await self._stream_get_async(client, url, headers)
+        payload = self._unlock_payload(response)
+        if payload is None:
+            return response
+        return self._unlock_result(url, response, await client.post(url, data=payload))
+
+    def _parse_fast(self, doc, url: str) -> Optional[RawBookData]:
+        data = self._extract_meta_fast(doc, url)
+        if data and not self._is_spam_description(data.description):
+            return data
+        return None
+
+    def _parse_soup(self, soup, url: str) -> RawBookData:
         data = self._extract_meta_data(soup, url)
         if data.description == "無法抓取文案" or self._is_spam_description(data.description):
             for selector in ['div.entry_body', 'div.entry-body', 'div.entry_content', 'div.main-content']:
@@ -280,9 +486,7 @@ class Fc2Scraper(BaseScraper):
         return data
 
 class BooksScraper(BaseScraper):
-    def parse(self, html_content: str, url: str) -> RawBookData:
-        soup = BeautifulSoup(html_content, 'lxml')
-        json_data = self._extract_json_ld(soup)
+    def _from_json_ld(self, json_data, url: str):
         if json_data:
             title = json_data.get('name')
             author_data = json_data.get('author', [])
@@ -294,6 +498,15 @@ class BooksScraper(BaseScraper):
             description = self._clean_text(json_data.get('description', ''))
             if description: 
                  return RawBookData(self._clean_title(title), self._clean_author(author), description, "博客來", url)
+        return None
+
+    def _parse_fast(self, doc, url: str) -> Optional[RawBookData]:
+        # JSON-LD 以 lxml XPath 取出，成功時不建立 BeautifulSoup 樹
+        return self._from_json_ld(self._extract_json_ld_fast(doc), url)
+
+    def _parse_soup(self, soup, url: str) -> RawBookData:
+        data = self._from_json_ld(self._extract_json_ld(soup), url)
+        if data: return data
 
         title_tag = soup.select_one('div.mod_type02_t01 h1') or soup.select_one('h1')
         title = self._clean_title(title_tag.get_text(strip=True)) if title_tag else "未知標題"
@@ -314,9 +527,41 @@ class BooksScraper(BaseScraper):
 
 # --- 【最終定版】POPO 原創 (通用穩定版) ---
 class PopoScraper(BaseScraper):
-    def parse(self, html_content: str, url: str) -> RawBookData:
-        soup = BeautifulSoup(html_content, 'lxml')
-        
+    stream_markers = (b'book-intro',)
+
+    # 作者與簡介的 DOM 補救位置 (依序嘗試)
+    _AUTHOR_XPATHS = (f'//*[{_has_class("book-data")}]//a[contains(@href, "/users/")]',
+                      f'//*[{_has_class("book-info")}]//a[contains(@href, "/users/")]',
+                      f'//*[{_has_class("author-name")}]//a')
+    _INTRO_XPATHS = (f'//div[{_has_class("book-intro")}]', f'//div[{_has_class("book_intro")}]')
+
+    def _parse_fast(self, doc, url: str) -> Optional[RawBookData]:
+        title_tag = doc.find(".//title")
+        author_tag = _first(doc, *self._AUTHOR_XPATHS)
+        intro_tag = _first(doc, *self._INTRO_XPATHS)
+        return self._from_page(
+            url, _lxml_meta_finder(doc), title_tag.text if title_tag is not None else "",
+            _fast_text(author_tag, strip=True) if author_tag is not None else None,
+            _fast_text(intro_tag) if intro_tag is not None else None,
+        )
+
+    def _parse_soup(self, soup, url: str) -> RawBookData:
+        author_tag = soup.select_one('.book-data a[href*="/users/"]') or \
+                     soup.select_one('.book-info a[href*="/users/"]') or \
+                     soup.select_one('.author-name a')
+        dom_desc = soup.select_one('div.book-intro') or soup.select_one('div.book_intro')
+        return self._from_page(
+            url, _soup_meta_finder(soup), soup.title.string if soup.title else "",
+            author_tag.get_text(strip=True) if author_tag else None,
+            dom_desc.get_text() if dom_desc else None,
+        )
+
+    def _from_page(self, url: str, find_meta, raw_page_title: Optional[str],
+                   dom_author: Optional[str], dom_desc: Optional[str]) -> RawBookData:
+        """
+        由頁面資訊決定書名、作者、文案 (lxml 與 BeautifulSoup 兩條路徑共用)
+        find_meta(屬性, 值) 回傳 meta 的 content；dom_author / dom_desc 為 DOM 中的作者與簡介文字 (不存在時為 None)。
+        """
         # 預設值
         title = "未知標題"
         author = "未知作者"
@@ -324,9 +569,8 @@ class PopoScraper(BaseScraper):
 
         # --- 策略 1: Meta Keywords (最優先，最乾淨) ---
         # 適用於絕大多數正常頁面
-        meta_kw = soup.find("meta", attrs={"name": "keywords"})
-        if meta_kw:
-            content = meta_kw.get("content", "")
+        content = find_meta("name", "keywords")
+        if content is not None:
             parts = [p.strip() for p in content.split(",") if p.strip()]
             
             if len(parts) >= 1:
@@ -341,9 +585,9 @@ class PopoScraper(BaseScraper):
         # --- 策略 2: 智慧補救 (當 Keywords 失效時) ---
         
         # 2.1 準備原始資料
-        raw_page_title = soup.title.string if soup.title else ""
-        meta_desc = soup.find("meta", attrs={"name": "description"}) or soup.find("meta", property="og:description")
-        raw_desc = meta_desc.get("content", "") if meta_desc else ""
+        raw_desc = find_meta("name", "description")
+        if raw_desc is None: raw_desc = find_meta("property", "og:description")
+        raw_desc = raw_desc or ""
 
         # 2.2 從簡介中逆向提取 (針對 Keywords 消失的特殊頁面)
         # 模式: "書名(作者)：..." 或 "書名（作者）：..."
@@ -386,61 +630,390 @@ class PopoScraper(BaseScraper):
                  title = self._clean_title(clean_page_title)
 
         # 2.4 DOM 作者補救 (最後防線)
-        if author == "未知作者":
-            author_tag = soup.select_one('.book-data a[href*="/users/"]') or \
-                         soup.select_one('.book-info a[href*="/users/"]') or \
-                         soup.select_one('.author-name a')
-            if author_tag:
-                author = self._clean_author(author_tag.get_text(strip=True))
+        if author == "未知作者" and dom_author is not None:
+            author = self._clean_author(dom_author)
 
         # 3. Description 最終確認
         # 優先抓 DOM (完整)，其次 Meta (截斷)
-        dom_desc = soup.select_one('div.book-intro') or soup.select_one('div.book_intro')
-        if dom_desc:
-            description = self._clean_text(dom_desc.get_text())
+        if dom_desc is not None:
+            description = self._clean_text(dom_desc)
         elif raw_desc:
             description = self._clean_text(raw_desc)
 
         return RawBookData(title, author, description, "POPO原創", url)
 
 class GenericScraper(BaseScraper):
-    def parse(self, html_content: str, url: str) -> RawBookData:
-        soup = BeautifulSoup(html_content, 'lxml')
+    def _parse_fast(self, doc, url: str) -> Optional[RawBookData]:
+        return self._extract_meta_fast(doc, url)
+
+    def _parse_soup(self, soup, url: str) -> RawBookData:
         return self._extract_meta_data(soup, url)
 
-# --- 工廠與主程式 ---
+# --- 站點註冊 ---
+# 新增網站只需一次 register_site：主機名稱後綴、爬蟲策略 (單例)、來源名稱、編碼、標頭、限流、Cloudflare、黑名單
+_GENERIC = GenericScraper()
+_BANXIA = BanxiaScraper()
+DOMAIN_NAME_MAP = site_registry.DOMAIN_NAME_MAP
+register_site = site_registry.register_site
+
+register_site("jjwxc", ["jjwxc.net", "jjwxc.com"], keywords=["jjwxc"], strategy=JjwxcScraper(), encoding="gb18030",
+              limit=rate_limit.DomainLimit(concurrency=2, rate=1.0, burst=2))
+register_site("banxia", ["xbanxia.cc", "xbanxia.com", "banxia.co", "banxia.cc"], keywords=["banxia"],
+              strategy=_BANXIA, limit=rate_limit.DomainLimit(concurrency=3, rate=2.0, burst=3))
+register_site("69shu", ["69shu.com", "69shuba.com"], keywords=["69shu"], strategy=_BANXIA, source_name="69書吧",
+              cloudflare=True)
+register_site("czbooks", ["czbooks.net"], strategy=CzbooksScraper(), cloudflare=True)
+register_site("fc2", ["fc2.com"], strategy=Fc2Scraper(), source_name="FC2部落格")
+register_site("books", ["books.com.tw"], strategy=BooksScraper(), source_name="博客來",
+              headers={"User-Agent": DESKTOP_UA}, limit=rate_limit.DomainLimit(concurrency=2, rate=0.5, burst=1))
+register_site("bookwalker", ["bookwalker.com.tw"], source_name="BOOKWALKER")
+register_site("popo", ["popo.tw"], strategy=PopoScraper(), source_name="POPO原創",
+              limit=rate_limit.DomainLimit(concurrency=2, rate=1.0, burst=2))
+register_site("ixdzs", ["ixdzs8.com"], source_name="愛下電子書")
+register_site("sto", ["sto.cx", "sto520.com"], source_name="思兔閱讀")
+register_site("eslite", ["eslite.com"], blacklisted=True)
+register_site("qidian", ["qidian.com"], blacklisted=True)
+
 def _get_scraper(url: str) -> BaseScraper:
-    if "jjwxc" in url: return JjwxcScraper()
-    elif "banxia" in url or "69shu" in url: return BanxiaScraper()
-    elif "czbooks" in url: return CzbooksScraper()
-    elif "fc2.com" in url: return Fc2Scraper()
-    elif "books.com.tw" in url: return BooksScraper()
-    elif "bookwalker.com.tw" in url: return BookwalkerScraper()
-    elif "popo.tw" in url: return PopoScraper()
-    else: return GenericScraper()
-
-def scrape_book(url: str) -> RawBookData:
-    # 黑名單攔截
-    if "eslite.com" in url or "qidian.com" in url:
-        print(f"⚠️ 跳過不支援的網站: {url}")
+    site = site_registry.lookup(url)
+    return site.strategy if site is not None and site.strategy is not None else _GENERIC
+
+def _lookup_cache(url: str, refresh: bool = False):
+    """
+    回傳 (快取項目, 可直接使用的回應)
+    新鮮期內 (或離線模式) 直接使用快取；離線且未命中時兩者皆為 None。
+    """
+    entry = _http_cache.get(url, refresh)
+    if entry and entry.fresh:
+        return entry, entry.to_response()
+    if http_cache.OFFLINE:
+        print(f"📴 離線模式：快取中沒有 {url}")
+    return entry, None
+
+def _store_response(url: str, entry, response):
+    """處理網路回應：304 沿用快取內容，成功且完整的回應寫入快取"""
+    if response.status_code == 304 and entry:
+        _http_cache.touch(url)
+        return entry.to_response()
+    if response.status_code < 400:
+        # 找到簡介標記前就達到位元組上限的內容不快取，下次重新下載
+        if getattr(response, "stream_complete", True):
+            _http_cache.put(url, response)
+        else:
+            print(f"⚠️ 頁面超過 {html_stream.MAX_PAGE_BYTES // 1024} KB 仍未找到簡介區塊，不寫入快取: {url}")
+    return response
+
+def _status_failure(url: str, status: int, attempts: int) -> ScrapeFailure:
+    kind = (FailureKind.RATE_LIMITED if status == 429 else
+            FailureKind.SERVER_ERROR if status >= 500 else FailureKind.HTTP_STATUS)
+    return ScrapeFailure(url, kind, status=status, attempts=attempts)
+
+def _invalid_url(url: str) -> Optional[ScrapeFailure]:
+    """空白、缺少 http(s) 或主機名稱的網址：不連線、不重試，也不計入斷路器"""
+    parts = urlparse((url or "").strip())
+    if parts.scheme in ("http", "https") and parts.hostname:
         return None
+    return ScrapeFailure(url, FailureKind.INVALID_URL, "缺少網址" if not (url or "").strip() else "")
+
+# 建立請求時才發現的網址錯誤 (與網站狀態無關，不重試、不計入斷路器)
+_REQUESTS_URL_ERRORS = (requests.exceptions.MissingSchema, requests.exceptions.InvalidSchema,
+                        requests.exceptions.InvalidURL)
+_HTTPX_URL_ERRORS = (httpx.UnsupportedProtocol, httpx.InvalidURL) if httpx is not None else ()
+
+def _circuit_failure(url: str, key: str, attempts: int) -> ScrapeError:
+    return ScrapeError(ScrapeFailure(url, FailureKind.CIRCUIT_OPEN, f"{key} 連續失敗，暫停連線", attempts=attempts))
+
+def _settle(url: str, response, breaker: resilience.CircuitBreaker, attempt: int):
+    """
+    判斷一次請求的結果：回傳 (失敗, Retry-After)；失敗為 None 表示可直接使用回應
+    網站有回應 (含 404 等) 即視為正常；5xx、逾時與連線錯誤才累計斷路器，429 只退避不斷路
+    (429 不改變斷路器狀態，half-open 的試探名額由呼叫端的 finally 釋放)。
+    """
+    if response.status_code not in resilience.RETRYABLE_STATUS:
+        breaker.record_success()
+        return None, None
+    failure = _status_failure(url, response.status_code, attempt)
+    if failure.kind != FailureKind.RATE_LIMITED:
+        breaker.record_failure()
+    return failure, response.headers.get("Retry-After")
+
+def _request_once(scraper_strategy: BaseScraper, url: str, validators: dict):
+    print(f"正在連線至: {url}...")
+    with rate_limit.domain_slot(url), _sessions.checkout(url) as scraper:
+        # session 為獨佔借用，暫時加上條件請求標頭不會影響其他執行緒
+        scraper.headers.update(validators)
+        try:
+            return scraper_strategy.perform_request(scraper, url)
+        finally:
+            for header in validators:
+                scraper.headers.pop(header, None)
+
+def _fetch(scraper_strategy: BaseScraper, url: str, refresh: bool = False,
+           policy: Optional[resilience.RetryPolicy] = None):
+    """
+    取得頁面回應 (經過磁碟快取)
+    - 新鮮期內直接使用快取；過期時帶 ETag / Last-Modified 條件請求，304 則沿用快取內容
+    - 離線模式只讀快取，未命中回傳 None
+    - 429/5xx/逾時/連線錯誤以抖動指數退避重試；重試用盡或網站已斷路時拋出 ScrapeError
+    """
+    entry, cached = _lookup_cache(url, refresh)
+    if cached is not None or http_cache.OFFLINE:
+        return cached
+
+    policy = policy or SCRAPE_RETRY
+    validators = entry.validators() if entry else {}
+    key = rate_limit.resolve_limit(url)[0]
+    breaker = resilience.get_breaker(key)
+    for attempt in range(1, policy.max_attempts + 1):
+        probe = breaker.admit()
+        if probe is None:
+            raise _circuit_failure(url, key, attempt - 1)
+        failure = retry_after = None
+        try:
+            try:
+                response = _request_once(scraper_strategy, url, validators)
+            except requests.HTTPError as e:
+                if e.response is None: raise
+                response = e.response
+            except _REQUESTS_URL_ERRORS as e:
+                raise ScrapeError(ScrapeFailure(url, FailureKind.INVALID_URL, str(e))) from e
+            except requests.Timeout as e:
+                failure, response = ScrapeFailure(url, FailureKind.TIMEOUT, str(e), attempts=attempt), None
+                breaker.record_failure()
+            except requests.ConnectionError as e:
+                failure, response = ScrapeFailure(url, FailureKind.CONNECTION, str(e), attempts=attempt), None
+                breaker.record_failure()
+            except Exception:
+                breaker.record_failure()  # Cloudflare 挑戰失敗等，不重試
+                raise
+            if response is not None:
+                failure, retry_after = _settle(url, response, breaker, attempt)
+                if failure is None:
+                    return _store_response(url, entry, response)
+        finally:
+            if probe: breaker.release()  # 試探請求不論結果 (429、未預期的例外、被取消) 都要釋放
+        if attempt < policy.max_attempts:
+            delay = policy.delay(attempt, retry_after)
+            print(f"🔁 {failure.describe()}，{delay:.1f} 秒後重試: {url}")
+            time.sleep(delay)
+    raise ScrapeError(failure)
+
+async def _fetch_async(scraper_strategy: BaseScraper, url: str, client, slots: rate_limit.AsyncDomainSlots,
+                       refresh: bool = False, policy: Optional[resilience.RetryPolicy] = None):
+    """
+    _fetch 的 asyncio 版本 (快取與重試規則相同)
+    403/503 不在此重試，直接拋出 httpx.HTTPStatusError 由呼叫端改走 cloudscraper。
+    """
+    entry, cached = _lookup_cache(url, refresh)
+    if cached is not None or http_cache.OFFLINE:
+        return cached
+
+    policy = policy or SCRAPE_RETRY
+    key = rate_limit.resolve_limit(url)[0]
+    breaker = resilience.get_breaker(key)
+    for attempt in range(1, policy.max_attempts + 1):
+        probe = breaker.admit()
+        if probe is None:
+            raise _circuit_failure(url, key, attempt - 1)
+        failure = retry_after = None
+        print(f"正在連線至: {url}... (async)")
+        try:
+            try:
+                async with slots.slot(url):
+                    response = await scraper_strategy.perform_request_async(client, url, entry.validators() if entry else None)
+            except httpx.HTTPStatusError as e:
+                if e.response.status_code in (403, 503):
+                    breaker.record_success()  # 網站有回應，交給 cloudscraper 處理挑戰
+                    raise
+                response = e.response
+            except _HTTPX_URL_ERRORS as e:
+                raise ScrapeError(ScrapeFailure(url, FailureKind.INVALID_URL, str(e))) from e
+            except httpx.TimeoutException as e:
+                failure, response = ScrapeFailure(url, FailureKind.TIMEOUT, str(e) or type(e).__name__, attempts=attempt), None
+                breaker.record_failure()
+            except httpx.TransportError as e:
+                failure, response = ScrapeFailure(url, FailureKind.CONNECTION, str(e) or type(e).__name__, attempts=attempt), None
+                breaker.record_failure()
+            except Exception:
+                breaker.record_failure()
+                raise
+            if response is not None:
+                failure, retry_after = _settle(url, response, breaker, attempt)
+                if failure is None:
+                    return _store_response(url, entry, response)
+        finally:
+            if probe: breaker.release()
+        if attempt < policy.max_attempts:
+            delay = policy.delay(attempt, retry_after)
+            print(f"🔁 {failure.describe()}，{delay:.1f} 秒後重試: {url}")
+            await asyncio.sleep(delay)
+    raise ScrapeError(failure)
+
+def _is_blacklisted(url: str) -> bool:
+    site = site_registry.lookup(url)
+    if site is not None and site.blacklisted:
+        print(f"⚠️ 跳過不支援的網站: {url}")
+        return True
+    return False
+
+def _fail(failure: ScrapeFailure) -> None:
+    print(f"❌ 抓取失敗: {failure.describe()}")
+    resilience.record_failure(failure)
+    return None
+
+def _parse_response(scraper_strategy: BaseScraper, url: str, response) -> Optional[RawBookData]:
+    """_fetch / _fetch_async 之後的共同處理：None 為離線未命中，>= 400 為不重試的錯誤"""
+    if response is None:
+        return _fail(ScrapeFailure(url, FailureKind.OFFLINE_MISS))
+    if response.status_code >= 400:
+        print(f"連線錯誤: {response.status_code}")
+        return _fail(_status_failure(url, response.status_code, 1))
+    try:
+        data = scraper_strategy.parse(response.text, url)
+    except Exception as e:
+        return _fail(ScrapeFailure(url, FailureKind.PARSE_ERROR, str(e)))
+    resilience.clear_failure(url)
+    return data
+
+def scrape_book(url: str, refresh: bool = False) -> RawBookData:
+    """
+    爬取單本書籍資訊 (同步，cloudscraper)；refresh=True 時略過快取新鮮期，一律向網站驗證
+    失敗時回傳 None，原因可由 resilience.last_failure(url) 取得。
+    """
+    invalid = _invalid_url(url)
+    if invalid is not None:
+        return _fail(invalid)
+    # 黑名單攔截
+    if _is_blacklisted(url):
+        return _fail(ScrapeFailure(url, FailureKind.BLACKLISTED))
 
     scraper_strategy = _get_scraper(url)
-    scraper = cloudscraper.create_scraper(
-        browser={'browser': 'chrome', 'platform': 'windows', 'desktop': True}
-    )
     try:
-        print(f"正在連線至: {url}...")
-        response = scraper_strategy.perform_request(scraper, url)
-        if response.status_code >= 400:
-            print(f"連線錯誤: {response.status_code}")
-            return None
-        return scraper_strategy.parse(response.text, url)
+        response = _fetch(scraper_strategy, url, refresh)
+    except ScrapeError as e:
+        return _fail(e.failure)
     except Exception as e:
-        print(f"❌ 抓取失敗: {e}")
-        return None
-
-# // 功能: 爬蟲核心模組 (Final: POPO+OpenCC+Blacklist)
+        return _fail(ScrapeFailure(url, FailureKind.CONNECTION, str(e)))
+    return _parse_response(scraper_strategy, url, response)
+
+# 以 httpx 請求時回應過 403/503 的限流鍵 (站點)；之後同站點的網址直接改走 cloudscraper，不再先送一次 httpx 請求
+_challenged_sites: Set[str] = set()
+
+def _needs_cloudscraper(url: str) -> bool:
+    site = site_registry.lookup(url)
+    return (site is not None and site.cloudflare) or rate_limit.resolve_limit(url)[0] in _challenged_sites
+
+async def _scrape_book_in_thread(url: str, slots: rate_limit.AsyncDomainSlots, refresh: bool) -> Optional[RawBookData]:
+    """在執行緒中走 cloudscraper 的同步路徑；期間持有 asyncio 後端的網域額度，同步路徑不再另取一份"""
+    async with slots.hold(url):
+        return await asyncio.to_thread(scrape_book, url, refresh)
+
+async def scrape_book_async(url: str, client, slots: Optional[rate_limit.AsyncDomainSlots] = None,
+                            refresh: bool = False) -> Optional[RawBookData]:
+    """
+    爬取單本書籍資訊 (asyncio，httpx.AsyncClient)
+    httpx 無法通過 Cloudflare 挑戰：註冊為 cloudflare 的站點直接在執行緒中走 cloudscraper 的同步路徑；
+    其他站點遇到 403/503 時改走同步路徑，並記住該站點，後續網址不再先以 httpx 嘗試。
+    """
+    invalid = _invalid_url(url)
+    if invalid is not None:
+        return _fail(invalid)
+    if _is_blacklisted(url):
+        return _fail(ScrapeFailure(url, FailureKind.BLACKLISTED))
+
+    slots = slots or rate_limit.AsyncDomainSlots()
+    if _needs_cloudscraper(url):
+        return await _scrape_book_in_thread(url, slots, refresh)
+    scraper_strategy = _get_scraper(url)
+    try:
+        response = await _fetch_async(scraper_strategy, url, client, slots, refresh)
+    except httpx.HTTPStatusError as e:
+        if e.response.status_code in (403, 503):
+            print(f"🛡️ {e.response.status_code}，改用 cloudscraper: {url}")
+            _challenged_sites.add(rate_limit.resolve_limit(url)[0])
+            return await _scrape_book_in_thread(url, slots, refresh)
+        return _fail(_status_failure(url, e.response.status_code, 1))
+    except ScrapeError as e:
+        return _fail(e.failure)
+    except Exception as e:
+        return _fail(ScrapeFailure(url, FailureKind.CONNECTION, str(e)))
+    return _parse_response(scraper_strategy, url, response)
+
+SCRAPE_WORKERS = 8          # 執行緒池後端的並行上限
+ASYNC_MAX_IN_FLIGHT = 64    # asyncio 後端同時進行中的請求上限 (各網站另受站點註冊的 limit 限制)
+
+@asynccontextmanager
+async def async_scraper(max_in_flight: int = ASYNC_MAX_IN_FLIGHT):
+    """
+    產生 scrape(url) 協程函式：共用一個 httpx.AsyncClient 與站點限流，同時最多 max_in_flight 個請求
+    (scrape_many_async 與 batch_importer 的匯入管線使用)。沒有 httpx 時改在執行緒中呼叫 scrape_book。
+    """
+    in_flight = asyncio.Semaphore(max_in_flight)
+    if httpx is None:
+        async def scrape(url: str) -> Optional[RawBookData]:
+            async with in_flight:
+                return await asyncio.to_thread(scrape_book, url)
+        yield scrape
+        return
+    slots = rate_limit.AsyncDomainSlots()
+    limits = httpx.Limits(max_connections=max_in_flight, max_keepalive_connections=max_in_flight)
+    timeout = httpx.Timeout(resilience.READ_TIMEOUT, connect=resilience.CONNECT_TIMEOUT)
+    async with httpx.AsyncClient(headers={"User-Agent": DESKTOP_UA}, timeout=timeout,
+                                 follow_redirects=True, limits=limits) as client:
+        async def scrape(url: str) -> Optional[RawBookData]:
+            async with in_flight:
+                return await scrape_book_async(url, client, slots)
+        yield scrape
+
+async def scrape_many_async(urls: List[str], max_in_flight: int = ASYNC_MAX_IN_FLIGHT,
+                            progress: Optional[Callable[[int, str, Optional[RawBookData]], None]] = None) -> List[Optional[RawBookData]]:
+    """單一執行緒、單一 httpx.AsyncClient 並行爬取多個網址，回傳順序與 urls 相同"""
+    results: List[Optional[RawBookData]] = [None] * len(urls)
+    if not urls:
+        return results
+    async with async_scraper(max_in_flight) as scrape:
+        async def run(i: int, url: str):
+            return i, await scrape(url)
+
+        tasks = [asyncio.ensure_future(run(i, url)) for i, url in enumerate(urls)]
+        for done, task in enumerate(asyncio.as_completed(tasks), start=1):
+            i, results[i] = await task
+            if progress:
+                progress(done, urls[i], results[i])
+    return results
+
+def _event_loop_running() -> bool:
+    try:
+        asyncio.get_running_loop()
+        return True
+    except RuntimeError:
+        return False
+
+def scrape_many(urls: List[str], max_workers: int = SCRAPE_WORKERS,
+                progress: Optional[Callable[[int, str, Optional[RawBookData]], None]] = None) -> List[Optional[RawBookData]]:
+    """
+    並行爬取多個網址，回傳結果順序與 urls 相同 (失敗為 None)
+    progress(完成數, url, 結果) 於呼叫端的執行緒中觸發，可直接更新 Streamlit 進度條。
+    已安裝 httpx 時使用 asyncio 後端，否則 (或目前執行緒已有 event loop 時) 使用執行緒池。
+    """
+    results: List[Optional[RawBookData]] = [None] * len(urls)
+    if not urls:
+        return results
+    if httpx is not None and not _event_loop_running():
+        return asyncio.run(scrape_many_async(urls, progress=progress))
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(urls))) as pool:
+        futures = {pool.submit(scrape_book, url): i for i, url in enumerate(urls)}
+        for done, future in enumerate(as_completed(futures), start=1):
+            i = futures[future]
+            try:
+                results[i] = future.result()
+            except Exception as e:
+                print(f"❌ 抓取失敗: {e}")
+            if progress:
+                progress(done, urls[i], results[i])
+    return results
+
+# // 功能: 爬蟲核心模組 (Final: POPO+OpenCC+Blacklist，同步 cloudscraper / 非同步 httpx 雙後端)
 # // input: URL
 # // output: RawBookData
 # // 其他補充: 完整支援 POPO 並優化標題清洗
\ No newline at end of file
@@ -1,26 +1,197 @@
 # 建議檔名: modules/services.py
 
+import asyncio
 import uuid
+import threading
+from collections import OrderedDict, defaultdict, deque
 from datetime import date
-from typing import List, Optional
-from .models import Book, BookStatus
+from typing import Callable, List, Optional, Tuple
+from .models import Book, BookStatus, BookFilters, BookSummary, SortOrder
 from . import database
+from .library_index import LibraryIndex
 from . import scraper
+from . import resilience
 from . import ai_agent
 
+# === 讀取快取 (跨 rerun 共用) ===
+class LibraryCache:
+    """
+    以資料庫 generation 為鍵的查詢結果快取
+    資料未變動前，重複的查詢 (換頁、篩選、設定頁匯出) 直接回傳記憶體中的結果；
+    任何寫入都會改變 generation，下次讀取時整批失效。
+    """
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._generation = None
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple, loader: Callable):
+        generation = database.get_generation()
+        with self._lock:
+            if generation != self._generation:
+                self._entries.clear()
+                self._generation = generation
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+
+        value = loader()
+        with self._lock:
+            # 載入期間若有寫入，結果可能已過期，不放入快取
+            if self._generation == generation == database.get_generation():
+                self._entries[key] = value
+                if len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._generation = None
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 3) if total else 0.0,
+            "entries": len(self._entries),
+        }
+
+_cache = LibraryCache()
+
+def _filters_key(filters: Optional[BookFilters]) -> Optional[str]:
+    return filters.model_dump_json() if filters is not None else None
+
+def get_cache_stats() -> dict:
+    """快取命中統計"""
+    return _cache.stats()
+
+# === 記憶體索引 (篩選/排序/統計) ===
+# 本程序的寫入會增量更新索引；其他程序 (如 batch_importer) 寫入時 generation 改變，下次讀取整批重建。
+_index: Optional[LibraryIndex] = None
+_index_generation = None
+_index_lock = threading.RLock()
+
+def _get_index() -> LibraryIndex:
+    """取得最新的索引 (呼叫端需持有 _index_lock)"""
+    global _index, _index_generation
+    generation = database.get_generation()
+    if _index is None or generation != _index_generation:
+        _index = LibraryIndex.build(database.query_book_summaries(), database.get_all_book_tags())
+        _index_generation = generation
+    return _index
+
+def _write_through(write: Callable, change: Callable[[LibraryIndex], None]):
+    """
+    執行資料庫寫入並同步增量更新索引
+    只有寫入前的資料版本與索引一致、且期間沒有混入其他寫入時才增量更新；
+    否則捨棄索引，下次讀取時整批重建。
+    """
+    global _index, _index_generation
+    with _index_lock:
+        result = write()
+        span = database.last_write_span()
+        if _index is not None and span is not None and span[0] == _index_generation:
+            change(_index)
+            _index_generation = span[1]
+        else:
+            _index = None
+        return result
+
+def _index_book(book: Book):
+    _write_through(lambda: database.update_book(book),
+                   lambda index: index.upsert(BookSummary.from_book(book), book.tags))
+
+def _candidates(index: LibraryIndex, filters: Optional[BookFilters]):
+    keyword_ids = None
+    if filters is not None and filters.keyword:
+        keyword_ids = _cache.get(("match_book_ids", filters.keyword),
+                                 lambda: database.match_book_ids(filters.keyword))
+    return index.candidates(filters, keyword_ids)
+
 def add_book(url: str) -> Optional[Book]:
     """
     核心功能：從網址新增書籍
     """
     print(f"🚀 開始處理書籍：{url}")
-    raw_data = scraper.scrape_book(url)
-    
+    return _add_scraped_book(url, scraper.scrape_book(url))
+
+def add_books(urls: List[str], progress: Optional[Callable[[str, int, str], None]] = None) -> List[Optional[Book]]:
+    """
+    批次從網址新增書籍：並行爬取後以 ai_agent 批次分析並入庫
+    progress(階段, 完成數, url) 的階段為 "爬取" 或 "分析"；有 httpx 時兩個階段重疊進行，回呼會交錯觸發。
+    """
+    print(f"🚀 開始批次處理 {len(urls)} 個網址")
+    if scraper.httpx is not None:
+        scraped, analyzed = asyncio.run(_scrape_and_analyze(urls, progress))
+        return [_save_new_book(url, raw_data, analyzed.get(i)) if raw_data else _add_scraped_book(url, None)
+                for i, (url, raw_data) in enumerate(zip(urls, scraped))]
+    on_scraped = (lambda done, url, _: progress("爬取", done, url)) if progress else None
+    scraped = scraper.scrape_many(urls, progress=on_scraped)
+    ok = [i for i, raw_data in enumerate(scraped) if raw_data]
+    # 爬取失敗的網址不送 AI，進度直接視為已完成
+    on_analyzed = (lambda done, total: progress("分析", len(urls) - total + done, urls[ok[done - 1]])) if progress else None
+    analyzed = dict(zip(ok, ai_agent.analyze_books([scraped[i] for i in ok], progress=on_analyzed)))
+    return [_save_new_book(url, raw_data, analyzed.get(i)) if raw_data else _add_scraped_book(url, None)
+            for i, (url, raw_data) in enumerate(zip(urls, scraped))]
+
+async def _scrape_and_analyze(urls: List[str], progress) -> Tuple[list, dict]:
+    """
+    爬取與 AI 分析重疊：每爬完 ai_agent.BATCH_SIZE 本就送出一批 analyze_books_async，
+    AI 的等待時間與其餘網址的爬取同時進行。回傳 (爬取結果, {索引: 分析結果})。
+    """
+    positions = defaultdict(deque)
+    for i, url in enumerate(urls):
+        positions[url].append(i)
+    ready, tasks, analyzed = [], [], {}
+    settled = 0
+
+    def settle(i: int):
+        nonlocal settled
+        settled += 1
+        if progress: progress("分析", settled, urls[i])
+
+    async def analyze(batch):
+        results = await ai_agent.analyze_books_async([raw_data for _, raw_data in batch])
+        for (i, _), result in zip(batch, results):
+            analyzed[i] = result
+            settle(i)
+
+    def dispatch():
+        if ready:
+            tasks.append(asyncio.ensure_future(analyze(list(ready))))
+            ready.clear()
+
+    def on_scraped(done: int, url: str, raw_data):
+        i = positions[url].popleft()
+        if progress: progress("爬取", done, url)
+        if not raw_data:
+            # 爬取失敗的網址不送 AI，進度直接視為已完成
+            settle(i)
+            return
+        ready.append((i, raw_data))
+        if len(ready) >= ai_agent.BATCH_SIZE:
+            dispatch()
+
+    scraped = await scraper.scrape_many_async(urls, progress=on_scraped)
+    dispatch()
+    await asyncio.gather(*tasks)
+    return scraped, analyzed
+
+def _add_scraped_book(url: str, raw_data) -> Optional[Book]:
     if not raw_data:
-        print(f"❌ 爬蟲失敗，無法新增書籍")
+        failure = resilience.last_failure(url)
+        print("❌ 爬蟲失敗，無法新增書籍" + (f" ({failure.describe()})" if failure else ""))
         return None
+    return _save_new_book(url, raw_data, ai_agent.analyze_book(raw_data))
 
-    ai_result = ai_agent.analyze_book(raw_data)
-    
+def _save_new_book(url: str, raw_data, ai_result) -> Optional[Book]:
     tags = []
     ai_summary = "AI 尚未分析"
     ai_plot = "AI 尚未分析"
@@ -49,31 +220,83 @@ def add_book(url: str) -> Optional[Book]:
     )
     
     try:
-        database.insert_book(new_book)
+        _write_through(lambda: database.insert_book(new_book),
+                       lambda index: index.upsert(BookSummary.from_book(new_book), new_book.tags))
         print(f"✅ 書籍已存入資料庫：{new_book.title}")
         return new_book
     except Exception as e:
         print(f"❌ 資料庫寫入失敗: {e}")
         return None
 
+# 以下三個查詢回傳快取清單的淺複本：其中的 Book 由所有 session 共用，只供讀取；
+# 需要修改的書請以 get_book() 讀取獨立的一份 (見設定頁的 AI 資料補全)
 def get_books() -> List[Book]:
     """取得所有書籍"""
-    return database.get_all_books()
+    return list(_cache.get(("get_books",), database.get_all_books))
+
+def query_books(filters: Optional[BookFilters] = None, sort: SortOrder = SortOrder.NEWEST,
+                limit: Optional[int] = None, offset: int = 0) -> List[Book]:
+    """條件查詢書籍 (篩選/排序/分頁)"""
+    key = ("query_books", _filters_key(filters), SortOrder(sort), limit, offset)
+    return list(_cache.get(key, lambda: database.query_books(filters, sort, limit, offset)))
+
+def query_book_summaries(filters: Optional[BookFilters] = None, sort: SortOrder = SortOrder.NEWEST,
+                         limit: Optional[int] = None, offset: int = 0) -> List[BookSummary]:
+    """條件查詢書籍摘要 (列表/畫廊/日曆用，不含長文字欄位；由記憶體索引提供)"""
+    with _index_lock:
+        index = _get_index()
+        return index.page(_candidates(index, filters), sort, limit, offset)
+
+def get_book(book_id: str) -> Optional[Book]:
+    """讀取單本完整書籍"""
+    return database.get_book(book_id)
+
+def count_books(filters: Optional[BookFilters] = None) -> int:
+    """計算符合條件的書籍數量"""
+    with _index_lock:
+        index = _get_index()
+        return index.count(_candidates(index, filters))
+
+def search_books(query: str, limit: int = 50) -> List[Book]:
+    """全文檢索 (依相關度排序)"""
+    return list(_cache.get(("search_books", query, limit), lambda: database.search_books(query, limit)))
+
+def get_all_tags() -> List[str]:
+    """取得所有標籤 (篩選器選項用)"""
+    with _index_lock:
+        return _get_index().all_tags()
+
+def get_all_authors() -> List[str]:
+    """取得所有作者 (篩選器選項用)"""
+    with _index_lock:
+        return _get_index().all_authors()
+
+def get_tag_counts(top_n: Optional[int] = None, filters: Optional[BookFilters] = None) -> List[Tuple[str, int]]:
+    """取得標籤使用次數 (由多到少)"""
+    with _index_lock:
+        index = _get_index()
+        return index.tag_counts(top_n, _candidates(index, filters) if filters is not None else None)
+
+def get_kpi_stats(filters: Optional[BookFilters] = None) -> dict:
+    """儀表板 KPI (總數、完食、本月完食、平均評分)"""
+    with _index_lock:
+        index = _get_index()
+        return index.kpi_stats(_candidates(index, filters) if filters is not None else None)
 
 def update_book_status(book: Book, new_status: BookStatus) -> Book:
     """更新狀態"""
     book.status = new_status
     if new_status == BookStatus.COMPLETED and not book.completed_date:
         book.completed_date = date.today()
-    database.update_book(book)
+    _index_book(book)
     return book
 
 def save_book_changes(book: Book):
     """儲存書籍變更"""
-    database.update_book(book)
+    _index_book(book)
 
 def remove_book(book_id: str):
     """移除書籍"""
-    database.delete_book(book_id)
+    _write_through(lambda: database.delete_book(book_id), lambda index: index.remove(book_id))
 
 # // 功能: 業務邏輯層 (同步移除字數欄位)
\ No newline at end of file
@@ -0,0 +1,111 @@
+# 新增 [modules/session_pool.py] 區塊 A: 爬蟲 Session 連線池 (Per-Domain Session Pool)
+# 修正原因：每個網址都 create_scraper 會丟掉 keep-alive 連線、Cookie 與 Cloudflare 驗證通過的 clearance，
+#           改為依網域借用/歸還 session，重複爬同一網站時跳過握手與挑戰。
+# 替換/新增指示：這是新檔案，請放置於 modules 資料夾。由 scraper.py 建立並使用。
+
+import atexit
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Tuple
+from urllib.parse import urlparse
+import requests
+
+SESSION_IDLE_SECONDS = 300   # 閒置超過此秒數的 session 關閉 (clearance cookie 通常也已過期)
+MAX_IDLE_PER_HOST = 4        # 每個網域最多保留的閒置 session 數
+
+class SessionPool:
+    """
+    依 hostname 分組的 session 池 (thread-safe)
+    - checkout 時優先取最近歸還的 session (連線與 cookie 最新)
+    - 同一 session 同時間只會借給一個執行緒
+    - 發生非 HTTP 狀態碼的錯誤 (連線中斷、挑戰失敗) 時丟棄該 session
+    """
+    def __init__(self, factory: Callable[[], requests.Session],
+                 idle_seconds: float = SESSION_IDLE_SECONDS, max_idle_per_host: int = MAX_IDLE_PER_HOST):
+        self.factory = factory
+        self.idle_seconds = idle_seconds
+        self.max_idle_per_host = max_idle_per_host
+        self.created = 0
+        self.reused = 0
+        self._idle: Dict[str, List[Tuple[requests.Session, float]]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _host(url: str) -> str:
+        try:
+            return urlparse(url).netloc.lower()
+        except ValueError:
+            return ""
+
+    def _acquire(self, host: str) -> requests.Session:
+        expired = []
+        session = None
+        now = time.monotonic()
+        with self._lock:
+            idle = self._idle.get(host, [])
+            while idle:
+                candidate, last_used = idle.pop()
+                if now - last_used <= self.idle_seconds:
+                    session = candidate
+                    self.reused += 1
+                    break
+                expired.append(candidate)
+            if session is None:
+                self.created += 1
+        for s in expired:
+            s.close()
+        return session if session is not None else self.factory()
+
+    def _release(self, host: str, session: requests.Session):
+        with self._lock:
+            idle = self._idle.setdefault(host, [])
+            if len(idle) < self.max_idle_per_host:
+                idle.append((session, time.monotonic()))
+                return
+        session.close()
+
+    @contextmanager
+    def checkout(self, url: str):
+        """借用該網址所屬網域的 session，離開 with 區塊時自動歸還"""
+        host = self._host(url)
+        session = self._acquire(host)
+        try:
+            yield session
+        except requests.HTTPError:
+            self._release(host, session)
+            raise
+        except BaseException:
+            session.close()
+            raise
+        else:
+            self._release(host, session)
+
+    def close_all(self):
+        with self._lock:
+            sessions = [s for idle in self._idle.values() for s, _ in idle]
+            self._idle.clear()
+        for s in sessions:
+            s.close()
+
+    def stats(self) -> dict:
+        with self._lock:
+            idle = sum(len(v) for v in self._idle.values())
+        return {"created": self.created, "reused": self.reused, "idle": idle}
+
+_pools: List[SessionPool] = []
+
+def create_pool(factory: Callable[[], requests.Session], **kwargs) -> SessionPool:
+    """建立 session 池並於程式結束時關閉所有連線"""
+    pool = SessionPool(factory, **kwargs)
+    _pools.append(pool)
+    return pool
+
+@atexit.register
+def close_all_pools():
+    for pool in _pools:
+        pool.close_all()
+
+# // 功能: 爬蟲 Session 連線池 (keep-alive + cookie 重用)
+# // input: URL
+# // output: 可用於 with 的 session
@@ -0,0 +1,74 @@
+# 新增 [modules/site_registry.py] 區塊 A: 站點註冊表 (Site Registry)
+# 修正原因：取代 scraper._get_scraper 的 if/elif 子字串比對、每次建立新策略物件，
+#           以及 _source_name 對 DOMAIN_NAME_MAP 的線性掃描。
+#           以「主機名稱後綴」為鍵查表 (結果依主機名稱記憶)，站點的爬蟲策略、來源名稱、
+#           編碼、請求標頭、限流額度、Cloudflare 與黑名單集中在一次 register_site 呼叫中設定。
+# 替換/新增指示：這是新檔案，請放置於 modules 資料夾。站點註冊寫在 scraper.py 的「站點註冊」區塊。
+
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Mapping, Optional
+from urllib.parse import urlparse
+
+if TYPE_CHECKING:
+    from .rate_limit import DomainLimit
+
+@dataclass(frozen=True)
+class SiteConfig:
+    key: str                              # 站點代號；同一站點的各個鏡像共用限流額度
+    strategy: Any = None                  # 爬蟲策略 (單例)；None 表示使用通用策略
+    source_name: Optional[str] = None     # Meta 解析時顯示的來源名稱；None 表示顯示網域
+    encoding: Optional[str] = None        # 固定頁面編碼 (略過自動偵測)
+    headers: Mapping[str, str] = field(default_factory=dict)  # 額外的請求標頭
+    limit: Optional["DomainLimit"] = None  # 限流設定；None 表示以主機名稱為鍵套用預設值
+    blacklisted: bool = False             # 不支援的網站，直接略過
+    cloudflare: bool = False              # 有 Cloudflare 挑戰；asyncio 後端直接改走 cloudscraper，不先以 httpx 嘗試
+
+_by_suffix: Dict[str, SiteConfig] = {}
+# 只在後綴查不到時使用：網址經常更換的鏡像站 (如 xbanxia.cc / banxia.co) 以主機名稱關鍵字比對
+_by_keyword: Dict[str, SiteConfig] = {}
+
+# 主機名稱後綴 -> 來源名稱 (由 register_site 維護，scraper.DOMAIN_NAME_MAP 即為此表)
+DOMAIN_NAME_MAP: Dict[str, str] = {}
+
+def register_site(key: str, suffixes: Iterable[str], keywords: Iterable[str] = (), **options) -> SiteConfig:
+    """
+    註冊一個站點：suffixes 為主機名稱後綴 (例如 "fc2.com" 涵蓋 xxx.blog.fc2.com)，
+    options 為 SiteConfig 的其餘欄位。重複註冊同一後綴時以後者為準。
+    """
+    site = SiteConfig(key, **options)
+    for suffix in suffixes:
+        suffix = suffix.lower().lstrip(".")
+        _by_suffix[suffix] = site
+        if site.source_name:
+            DOMAIN_NAME_MAP[suffix] = site.source_name
+    for keyword in keywords:
+        _by_keyword[keyword.lower()] = site
+    _lookup_host.cache_clear()
+    return site
+
+def hostname(url: str) -> str:
+    try:
+        return urlparse(url).hostname or ""
+    except ValueError:
+        return ""
+
+@lru_cache(maxsize=4096)
+def _lookup_host(host: str) -> Optional[SiteConfig]:
+    labels = host.split(".")
+    for i in range(len(labels) - 1):  # 由長到短比對後綴，不比對單獨的頂級網域
+        site = _by_suffix.get(".".join(labels[i:]))
+        if site is not None:
+            return site
+    for keyword, site in _by_keyword.items():
+        if keyword in host:
+            return site
+    return None
+
+def lookup(url: str) -> Optional[SiteConfig]:
+    """回傳網址所屬站點的設定；未註冊的網站回傳 None"""
+    return _lookup_host(hostname(url))
+
+# // 功能: 站點註冊表 (主機名稱後綴 -> 策略/來源名稱/編碼/標頭/限流/Cloudflare/黑名單)
+# // input: URL
+# // output: SiteConfig
@@ -0,0 +1,83 @@
+# 新增 [modules/sqlite_cache.py] 區塊 A: SQLite 容量上限快取的共用基底 (Size-Bounded SQLite Store)
+# 修正原因：http_cache 與 ai_cache 原本各自複製一份連線、LRU 淘汰、清除、關閉與統計邏輯，
+#           只有表名與欄位不同；共用部分集中於此，各快取只保留 schema 與鍵的處理。
+# 替換/新增指示：這是新檔案，請放置於 modules 資料夾。由 http_cache.HttpCache 與 ai_cache.AiCache 繼承。
+
+import os
+import sqlite3
+import threading
+
+class SqliteCacheStore:
+    """
+    單一資料表、總大小有上限的 SQLite 快取 (thread-safe)
+    子類別設定 TABLE (表名)、COLUMNS (key / last_access / size 以外的欄位定義) 與 COUNTERS (統計計數器名稱)；
+    資料表固定含 key 主鍵、last_access 與 size，總大小超過 max_bytes 時依 last_access 淘汰最久未使用的項目。
+    讀寫資料表時需持有 self._lock。
+    """
+    TABLE = ""
+    COLUMNS = ""
+    COUNTERS = ("hits", "misses")
+
+    def __init__(self, path: str, max_bytes: int):
+        self.path = path
+        self.max_bytes = max_bytes
+        for name in self.COUNTERS:
+            setattr(self, name, 0)
+        self._conn = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(f'''
+                CREATE TABLE IF NOT EXISTS {self.TABLE} (
+                    key TEXT PRIMARY KEY,
+                    {self.COLUMNS},
+                    last_access REAL NOT NULL,
+                    size INTEGER NOT NULL
+                )
+            ''')
+            conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{self.TABLE}_access ON {self.TABLE}(last_access)")
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def _evict(self, conn: sqlite3.Connection):
+        """總大小超過上限時，依最近使用時間 (LRU) 淘汰"""
+        total = conn.execute(f"SELECT COALESCE(SUM(size), 0) FROM {self.TABLE}").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        doomed = []
+        for key, size in conn.execute(f"SELECT key, size FROM {self.TABLE} ORDER BY last_access"):
+            if total <= self.max_bytes:
+                break
+            doomed.append((key,))
+            total -= size
+        conn.executemany(f"DELETE FROM {self.TABLE} WHERE key = ?", doomed)
+
+    def clear(self):
+        with self._lock:
+            conn = self._connect()
+            conn.execute(f"DELETE FROM {self.TABLE}")
+            conn.commit()
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def stats(self) -> dict:
+        with self._lock:
+            count, size = self._connect().execute(
+                f"SELECT COUNT(*), COALESCE(SUM(size), 0) FROM {self.TABLE}"
+            ).fetchone()
+            counters = {name: getattr(self, name) for name in self.COUNTERS}
+        return {**counters, "entries": count, "bytes": size}
+
+# // 功能: SQLite 容量上限快取基底 (WAL 連線 + LRU 淘汰 + 統計)
+# // input: 子類別的表名 / 欄位 / 計數器
+# // output: 供 HttpCache / AiCache 繼承
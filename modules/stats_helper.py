@@ -5,35 +5,32 @@
 import pandas as pd
 from collections import Counter
 from datetime import date
-from .models import Book, BookStatus
+from .models import Book, BookStatus, BookSummary
 
-def get_kpi_stats(books: list[Book]):
-    """計算關鍵績效指標 (Dashboard KPI)"""
-    total = len(books)
-    completed = len([b for b in books if b.status == BookStatus.COMPLETED])
-    
-    # 計算本月完食
+def get_kpi_stats(books: list[Book | BookSummary]):
+    """計算關鍵績效指標 (Dashboard KPI，單次掃描)"""
     today = date.today()
-    this_month_completed = len([
-        b for b in books 
-        if b.status == BookStatus.COMPLETED 
-        and b.completed_date 
-        and b.completed_date.year == today.year 
-        and b.completed_date.month == today.month
-    ])
-    
-    # 計算平均評分 (排除 0 分/未評分的書籍)
-    rated_books = [b for b in books if b.user_rating > 0]
-    avg_rating = sum(b.user_rating for b in rated_books) / len(rated_books) if rated_books else 0.0
+    completed = this_month_completed = rating_sum = rated_count = 0
+    for b in books:
+        if b.status == BookStatus.COMPLETED:
+            completed += 1
+            # 本月完食
+            if b.completed_date and b.completed_date.year == today.year and b.completed_date.month == today.month:
+                this_month_completed += 1
+        # 平均評分 (排除 0 分/未評分的書籍)
+        if b.user_rating > 0:
+            rating_sum += b.user_rating
+            rated_count += 1
+    avg_rating = rating_sum / rated_count if rated_count else 0.0
     
     return {
-        "total": total,
+        "total": len(books),
         "completed": completed,
         "this_month": this_month_completed,
         "avg_rating": round(avg_rating, 1)
     }
 
-def get_monthly_completed_df(books: list[Book], year: int) -> pd.DataFrame:
+def get_monthly_completed_df(books: list[Book | BookSummary], year: int) -> pd.DataFrame:
     """生成月度完食趨勢圖資料 (回傳 Pandas DataFrame)"""
     # 初始化 1-12 月數據 (確保圖表X軸完整)
     monthly_counts = {month: 0 for month in range(1, 13)}
@@ -50,19 +47,25 @@ def get_monthly_completed_df(books: list[Book], year: int) -> pd.DataFrame:
     ])
     return df.set_index("月份")
 
-def get_tag_distribution_df(books: list[Book], top_n=10) -> pd.DataFrame:
-    """生成標籤分佈資料 (Top N)"""
-    all_tags = []
-    for book in books:
-        # 排除空標籤
-        if book.tags:
-            all_tags.extend(book.tags)
+def get_tag_distribution_df(books: list[Book], top_n=10, tag_counts: list[tuple[str, int]] = None) -> pd.DataFrame:
+    """
+    生成標籤分佈資料 (Top N)
+    若已提供 tag_counts (由 book_tags 索引表以 SQL 統計)，直接使用而不掃描書籍標籤。
+    """
+    if tag_counts is not None:
+        counts = list(tag_counts)[:top_n]
+    else:
+        all_tags = []
+        for book in books:
+            # 排除空標籤
+            if book.tags:
+                all_tags.extend(book.tags)
+        # 計算頻次
+        counts = Counter(all_tags).most_common(top_n)
         
-    if not all_tags:
+    if not counts:
         return pd.DataFrame(columns=["標籤", "數量"])
         
-    # 計算頻次
-    counts = Counter(all_tags).most_common(top_n)
     df = pd.DataFrame(counts, columns=["標籤", "數量"])
     return df.set_index("標籤")
 
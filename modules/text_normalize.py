@@ -0,0 +1,136 @@
+# 新增 [modules/text_normalize.py] 區塊 A: 文字清洗與簡繁轉換 (Text Normalization)
+# 修正原因：正則表達式改為模組載入時預先編譯 (含很長的 SEO 關鍵字 alternation)；
+#           OpenCC 轉換加上有上限的 LRU 記憶，並提供一次轉換多個字串的批次介面。
+# 替換/新增指示：這是新檔案，請放置於 modules 資料夾。scraper.py 與 batch_importer.py 共用。
+
+import re
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, List
+from opencc import OpenCC
+
+CONVERT_CACHE_SIZE = 4096
+
+# === OpenCC 轉換 (每種設定只建立一次) ===
+_converters: Dict[str, OpenCC] = {}
+
+def _converter(config: str) -> OpenCC:
+    converter = _converters.get(config)
+    if converter is None:
+        converter = _converters[config] = OpenCC(config)
+    return converter
+
+# (字串, 設定) -> 轉換結果；有上限的 LRU，單本與批次轉換共用
+_memo: "OrderedDict[tuple, str]" = OrderedDict()
+_memo_lock = threading.Lock()
+_memo_stats = {"hits": 0, "misses": 0}
+
+def _memo_get(key: tuple):
+    with _memo_lock:
+        result = _memo.get(key)
+        if result is not None:
+            _memo.move_to_end(key)
+            _memo_stats["hits"] += 1
+        return result
+
+def _memo_put(key: tuple, result: str):
+    with _memo_lock:
+        _memo_stats["misses"] += 1
+        _memo[key] = result
+        if len(_memo) > CONVERT_CACHE_SIZE:
+            _memo.popitem(last=False)
+
+def convert(text: str, config: str = "s2t") -> str:
+    """簡轉繁 (結果以 LRU 記憶；同一書名、作者、標籤重複出現時不再重新轉換)"""
+    if not text: return text
+    key = (text, config)
+    result = _memo_get(key)
+    if result is None:
+        result = _converter(config).convert(text)
+        _memo_put(key, result)
+    return result
+
+# OpenCC 會在換行處切段各自轉換，因此以換行串接多個字串一起轉換，結果與逐一轉換相同
+_BATCH_SEPARATOR = "\n"
+
+def convert_many(texts: Iterable[str], config: str = "s2t") -> List[str]:
+    """
+    批次簡轉繁：去除重複、略過已記憶的字串，其餘合併成一次 OpenCC 呼叫
+    回傳順序與輸入相同。
+    """
+    texts = list(texts)
+    results = {}
+    misses = []
+    for text in dict.fromkeys(t for t in texts if t):
+        known = _memo_get((text, config))
+        if known is not None:
+            results[text] = known
+        elif _BATCH_SEPARATOR in text:
+            results[text] = convert(text, config)
+        else:
+            misses.append(text)
+    if misses:
+        converted = _converter(config).convert(_BATCH_SEPARATOR.join(misses)).split(_BATCH_SEPARATOR)
+        for text, result in zip(misses, converted):
+            _memo_put((text, config), result)
+            results[text] = result
+    return [results.get(t, t) for t in texts]
+
+def convert_cache_stats() -> dict:
+    with _memo_lock:
+        return {**_memo_stats, "entries": len(_memo)}
+
+# === 預先編譯的清洗規則 ===
+_HTML_TAG_RE = re.compile(r'<[^>]+>')
+_HTML_ENTITY_RE = re.compile(r'&[a-zA-Z]+;')
+_WHITESPACE_RE = re.compile(r'\s+')
+_TITLE_BRACKETS_RE = re.compile(r'[《》【】\[\]〈〉]')
+_TITLE_SUFFIX_SPLIT_RE = re.compile(r'[|_｜]')
+_SEO_KEYWORDS = r"(小說|全文|閱讀|最新|章節|下載|txt|筆趣閣|半夏|晉江|起點|無彈窗|手機版|online|read|fc2|blog|博客來|誠品|eslite|books|bookwalker|套書|POPO|原創)"
+_SEO_SUFFIX_RE = re.compile(fr"([-,\s]+.*{_SEO_KEYWORDS}.*$)", re.IGNORECASE)
+_AUTHOR_PREFIX_RE = re.compile(r'^(作者|Author|著|编|繪|譯|插畫)\s*[：:︰]?\s*', re.IGNORECASE)
+_AUTHOR_NOISE = ("BOOKWALKER", "電子書", "出版社", "POPO")
+
+def clean_text(text: str) -> str:
+    """移除 HTML 標籤/實體、壓縮空白並簡轉繁"""
+    if not text: return ""
+    text = _HTML_TAG_RE.sub('', text)
+    text = _HTML_ENTITY_RE.sub('', text)
+    text = _WHITESPACE_RE.sub(' ', text)
+    return convert(text.strip())
+
+def clean_title(raw_title: str) -> str:
+    """書名清洗：簡轉繁、去除書名號、切掉網站後綴與 SEO 關鍵字"""
+    if not raw_title: return "未知標題"
+
+    # 1. 簡轉繁
+    raw_title = convert(raw_title)
+
+    # 2. 去除符號 (包含全形直線 ｜)
+    title = _TITLE_BRACKETS_RE.sub('', raw_title).strip()
+
+    # 3. 分割網站後綴
+    # POPO 標題通常是 "書名｜POPO小說原創"，這裡用 split 切割
+    title = _TITLE_SUFFIX_SPLIT_RE.split(title)[0].strip()
+
+    title = _SEO_SUFFIX_RE.sub("", title).strip()
+
+    if "," in title:
+        parts = title.split(",")
+        if len(parts) > 1 and len(parts[0]) > 1 and parts[0].strip() in parts[1]:
+            title = parts[0].strip()
+    return title
+
+def clean_author(raw_author: str) -> str:
+    """作者清洗：簡轉繁、去除「作者：」等前綴，出版社/平台名稱視為未知"""
+    if not raw_author or raw_author == "未知作者": return "未知作者"
+    raw_author = convert(raw_author)
+
+    author = _AUTHOR_PREFIX_RE.sub('', raw_author).strip()
+    if any(noise in author for noise in _AUTHOR_NOISE):
+        return "未知作者"
+    return author if author else "未知作者"
+
+# // 功能: 文字清洗與簡繁轉換 (預編譯正則 + LRU 記憶 + 批次轉換)
+# // input: 原始字串
+# // output: 清洗後的繁體字串
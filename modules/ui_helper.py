@@ -2,7 +2,7 @@
 # 修正原因：落實 Phase 2 視覺優化，採用莫蘭迪狀態色、置中排版、動態文字色與星級顯示。
 # 替換/新增指示：請完全替換 modules/ui_helper.py。
 
-from .models import Book, BookStatus
+from .models import Book, BookStatus, BookSummary
 
 # === 視覺資產庫 (Morandi Status Palette) ===
 # 格式: Status: (Background_Color, Text_Color)
@@ -28,7 +28,7 @@ def _get_star_html(rating: int) -> str:
     stars = "★" * rating
     return f'<div class="book-stars">{stars}</div>'
 
-def render_book_card_html(book: Book) -> str:
+def render_book_card_html(book: Book | BookSummary) -> str:
     """
     生成單本書的 HTML 卡片 (Phase 2: 莫蘭迪/置中/星級)
     修正：移除縮排以避免 Markdown 渲染錯誤
@@ -0,0 +1,255 @@
+# 新增 [test_ai_batch.py] 區塊 A: AI 批次分析測試 (analyze_books)
+# 修正原因：以假的 Gemini client 驗證批次打包、依 id 對應結果、缺漏時拆批重試與 token 預算，不需 API Key 與網路。
+# 替換/新增指示：這是新檔案，請放置於專案根目錄。執行方式：python test_ai_batch.py (或 pytest test_ai_batch.py)
+
+import asyncio
+import os
+import re
+import tempfile
+from contextlib import contextmanager
+from types import SimpleNamespace
+from unittest import mock
+
+from google.genai import errors as genai_errors
+
+from modules import ai_agent, ai_cache, ai_pool, scraper, services
+from modules.ai_agent import AIAnalysisResult, BatchAnalysisResult, BookAnalysis
+from modules.scraper import RawBookData
+
+def _book(i: int, desc_len: int = 50) -> RawBookData:
+    return RawBookData(f"書名{i}", f"作者{i}", "文案" * (desc_len // 2), "測試", f"https://example.test/{i}")
+
+class FakeModels:
+    """依提示中的 id 回傳結果；drop 內的 id 第一次被請求時故意漏掉，fail_sizes 內大小的批次直接拋錯"""
+    def __init__(self, drop=(), fail_sizes=()):
+        self.calls = []
+        self.drop = set(drop)
+        self.fail_sizes = set(fail_sizes)
+        self.rate_limited = 0   # 前幾次呼叫回傳 429
+        self.configs = []
+
+    def generate_content(self, model, contents, config):
+        ids = re.findall(r'"id": "(b\d+)"', contents)
+        self.calls.append(ids)
+        self.configs.append(config)
+        if self.rate_limited:
+            self.rate_limited -= 1
+            raise genai_errors.ClientError(429, {"error": {"code": 429, "status": "RESOURCE_EXHAUSTED",
+                                                           "details": [{"retryDelay": "0s"}]}})
+        if len(ids) in self.fail_sizes:
+            raise RuntimeError("模擬輸出截斷")
+        kept = [i for i in ids if i not in self.drop]
+        self.drop -= set(ids)
+        parsed = BatchAnalysisResult(results=[BookAnalysis(id=i, tags=["言情", i], summary=f"評論{i}", plot=f"大綱{i}")
+                                              for i in kept])
+        return SimpleNamespace(parsed=parsed, text=parsed.model_dump_json())
+
+class FakeAsyncModels:
+    """client.aio.models：與同步版共用同一組行為與呼叫紀錄"""
+    def __init__(self, models: FakeModels):
+        self.sync = models
+
+    async def generate_content(self, model, contents, config):
+        await asyncio.sleep(0)
+        return self.sync.generate_content(model, contents, config)
+
+def _fake_client(models: FakeModels):
+    return SimpleNamespace(models=models, aio=SimpleNamespace(models=FakeAsyncModels(models)))
+
+@contextmanager
+def _fake_gemini(models: FakeModels):
+    """假的 Gemini client + 暫存的 AI 快取 + 不限速的配額 (單本 analyze_book 也換成假的)"""
+    def analyze_book(raw, refresh=False):
+        return AIAnalysisResult(tags=["單本"], summary="單本", plot=raw.title)
+    async def analyze_book_async(raw, refresh=False):
+        return ai_agent.analyze_book(raw, refresh)
+    with tempfile.TemporaryDirectory() as workdir:
+        cache = ai_cache.AiCache(os.path.join(workdir, "ai_cache.db"))
+        pool = ai_pool.AiWorkerPool(workers=4)
+        try:
+            with mock.patch.object(ai_agent.genai, "Client", lambda api_key: _fake_client(models)), \
+                    mock.patch.multiple(ai_agent, _get_api_key=lambda: "test-key", _ai_cache=cache, _client=None,
+                                        _quota=ai_pool.AdaptiveQuota(rpm=60000, tpm=10 ** 9), _pool=pool,
+                                        AI_RETRY=ai_agent.resilience.RetryPolicy(max_attempts=3, base_delay=0, max_delay=0),
+                                        analyze_book=analyze_book, analyze_book_async=analyze_book_async):
+                yield
+        finally:
+            cache.close()
+            pool.shutdown()
+
+def test_results_follow_input_order_with_fewer_requests():
+    models = FakeModels()
+    books = [_book(i) for i in range(25)]
+    with _fake_gemini(models):
+        results = ai_agent.analyze_books(books, batch_size=10)
+    assert sorted(len(ids) for ids in models.calls) == [5, 10, 10]  # 批次在工作池中並行，完成順序不定
+    assert [r.plot for r in results] == [f"大綱b{i}" for i in range(25)]
+
+def test_partial_response_is_split_and_retried():
+    models = FakeModels(drop={"b1", "b2", "b7"})
+    with _fake_gemini(models):
+        results = ai_agent.analyze_books([_book(i) for i in range(8)], batch_size=8)
+    assert models.calls[0] == [f"b{i}" for i in range(8)]
+    assert sorted(sum(models.calls[1:], [])) == ["b1", "b2", "b7"]  # 只重送缺少的書
+    assert all(r is not None for r in results)
+
+def test_failed_batch_falls_back_to_single_book():
+    models = FakeModels(fail_sizes={4, 2, 1})
+    with _fake_gemini(models):
+        results = ai_agent.analyze_books([_book(i) for i in range(4)], batch_size=4)
+    assert [r.summary for r in results] == ["單本"] * 4
+    assert [len(ids) for ids in models.calls] == [4, 2, 1, 1, 2, 1, 1]
+
+def test_batches_fit_token_budget():
+    items = [(f"b{i}", _book(i, desc_len=3000 if i == 2 else 100)) for i in range(6)]
+    budget = 5000
+    batches = ai_agent._plan_batches(items, batch_size=10, token_budget=budget)
+    assert [book_id for batch in batches for book_id, _ in batch] == [book_id for book_id, _ in items]
+    for batch in batches:
+        if len(batch) > 1:
+            cost = ai_agent._BATCH_PROMPT_TOKENS + sum(
+                ai_agent._estimate_tokens(str(ai_agent._book_payload(i, raw))) + ai_agent.OUTPUT_TOKENS_PER_BOOK
+                for i, raw in batch)
+            assert cost <= budget * 1.1
+    assert len(batches) > 1
+
+def test_cache_skips_identical_inputs():
+    models = FakeModels()
+    books = [_book(i) for i in range(4)]
+    with _fake_gemini(models):
+        first = ai_agent.analyze_books(books)
+        again = ai_agent.analyze_books(books[:2] + [_book(9)])
+        assert [len(ids) for ids in models.calls] == [4, 1]  # 第二次只送出新的一本
+        assert again[:2] == first[:2]
+        ai_agent.analyze_books(books[:2], refresh=True)
+        assert [len(ids) for ids in models.calls] == [4, 1, 2]  # refresh 略過快取
+        assert ai_agent._ai_cache.stats()["entries"] == 5
+
+def test_cache_key_changes_with_model_and_prompt_version():
+    book = _book(1)
+    key = ai_cache.content_key(book.title, book.author, book.source_name, book.description, "m", 1)
+    assert key == ai_cache.content_key(book.title, book.author, book.source_name, book.description, "m", 1)
+    assert key != ai_cache.content_key(book.title, book.author, book.source_name, book.description, "m", 2)
+    assert key != ai_cache.content_key(book.title, book.author, book.source_name, book.description, "n", 1)
+    assert key != ai_cache.content_key(book.title, book.author, book.source_name, book.description + "。", "m", 1)
+
+def test_cache_evicts_by_age_and_size():
+    with tempfile.TemporaryDirectory() as workdir:
+        cache = ai_cache.AiCache(os.path.join(workdir, "ai.db"), max_bytes=300)
+        for i in range(10):
+            cache.put(f"k{i}", "m", {"tags": [], "summary": "評論" * 10, "plot": str(i)})
+        assert cache.stats()["bytes"] <= 300 and cache.get("k9") is not None and cache.get("k0") is None
+        cache.max_age = 0
+        assert cache.get("k9") is None
+        cache.close()
+
+def test_rate_limit_backs_off_and_retries():
+    models = FakeModels()
+    models.rate_limited = 2
+    with _fake_gemini(models):
+        results = ai_agent.analyze_books([_book(i) for i in range(3)])
+        stats = ai_agent.pool_stats()
+    assert all(r is not None for r in results) and len(models.calls) == 3
+    assert stats["throttles"] == 2 and stats["completed"] == 1 and stats["queued"] == 0
+
+def test_only_api_429_counts_as_rate_limit():
+    assert ai_agent._is_rate_limited(genai_errors.ClientError(429, {"error": {"status": "RESOURCE_EXHAUSTED"}}))
+    assert not ai_agent._is_rate_limited(RuntimeError("書籍 b429 解析失敗 (4290 tokens)"))
+    assert not ai_agent._is_rate_limited(genai_errors.ClientError(400, {"error": {"message": "429 in text"}}))
+
+def test_quota_throttle_halves_rate_and_recovers():
+    quota = ai_pool.AdaptiveQuota(rpm=600, tpm=60000)
+    quota.throttled(0)
+    quota.throttled(0)
+    assert quota.stats()["rpm"] == 150 and quota.throttles == 2
+    for _ in range(100):
+        quota.succeeded()
+    assert quota.stats()["rpm"] == 600
+    quota.acquire(tokens=10 ** 9)  # 超過瞬間額度的請求不會卡死
+
+def test_shared_client_is_created_once():
+    created = []
+    models = FakeModels()
+    with _fake_gemini(models):
+        ai_agent.genai.Client = lambda api_key: created.append(api_key) or _fake_client(models)
+        ai_agent.analyze_books([_book(i) for i in range(30)], batch_size=5)
+    assert created == ["test-key"]
+
+_analyze_book = ai_agent.analyze_book   # _fake_gemini 會替換成假的單本分析
+
+class FakeTextModels:
+    """只回傳原始 JSON 文字 (response.parsed 為 None)"""
+    def __init__(self, text: str):
+        self.text = text
+
+    def generate_content(self, model, contents, config):
+        return SimpleNamespace(parsed=None, text=self.text)
+
+def test_single_book_uses_schema_and_static_prompt():
+    models = FakeModels()
+    with _fake_gemini(models):
+        ai_agent._client = _fake_client(FakeTextModels('{"tags": ["言情"], "summary": "好看", "plot": "大綱"}'))
+        assert _analyze_book(_book(1)) == AIAnalysisResult(tags=["言情"], summary="好看", plot="大綱")
+        # 宣告 response_schema 後不再清洗 Markdown，不合 schema 的回應視為失敗
+        ai_agent._client = _fake_client(FakeTextModels('```json\n{"tags": []}\n```'))
+        assert _analyze_book(_book(2)) is None
+        ai_agent._client = None
+        ai_agent.analyze_books([_book(i) for i in range(3)])
+    config = models.configs[0]
+    assert config.response_schema is BatchAnalysisResult and config is ai_agent._BATCH_CONFIG
+    assert ai_agent._BOOK_CONFIG.response_schema is AIAnalysisResult
+    assert "資深小說愛好者" in config.system_instruction   # 固定提示只放在 system_instruction
+
+def test_async_batches_match_sync():
+    models = FakeModels(drop={"b3"})
+    books = [_book(i) for i in range(12)]
+    with _fake_gemini(models):
+        results = asyncio.run(ai_agent.analyze_books_async(books, batch_size=5))
+    assert [r.plot for r in results] == [f"大綱b{i}" if i != 3 else "書名3" for i in range(12)]
+    assert sorted(len(ids) for ids in models.calls) == [2, 5, 5]   # 只缺 b3 時改用單本分析
+
+def test_add_books_overlaps_scraping_and_analysis():
+    events = []
+    urls = [f"https://example.test/{i}" for i in range(25)]
+
+    async def fake_scrape_many_async(urls, progress=None):
+        results = []
+        for done, url in enumerate(urls, start=1):
+            await asyncio.sleep(0)
+            events.append("scraped")
+            results.append(_book(done))
+            progress(done, url, results[-1])
+        return results
+
+    class RecordingModels(FakeModels):
+        def generate_content(self, model, contents, config):
+            events.append("ai")
+            return super().generate_content(model, contents, config)
+
+    with mock.patch.object(scraper, "scrape_many_async", fake_scrape_many_async), \
+            mock.patch.object(services, "_save_new_book", lambda url, raw_data, ai_result: ai_result), \
+            _fake_gemini(RecordingModels()):
+        results = services.add_books(urls)
+    assert all(r is not None for r in results) and events.count("ai") == 3
+    assert events.index("ai") < len(events) - 1 - events[::-1].index("scraped")   # 第一批在爬完前就送出
+
+def main():
+    print("=== 開始進行 AI 批次分析測試 ===\n")
+    for test in (test_results_follow_input_order_with_fewer_requests, test_partial_response_is_split_and_retried,
+                 test_failed_batch_falls_back_to_single_book, test_batches_fit_token_budget,
+                 test_cache_skips_identical_inputs, test_cache_key_changes_with_model_and_prompt_version,
+                 test_cache_evicts_by_age_and_size, test_rate_limit_backs_off_and_retries,
+                 test_only_api_429_counts_as_rate_limit, test_quota_throttle_halves_rate_and_recovers,
+                 test_shared_client_is_created_once,
+                 test_single_book_uses_schema_and_static_prompt, test_async_batches_match_sync,
+                 test_add_books_overlaps_scraping_and_analysis):
+        test()
+        print(f"✅ {test.__name__}")
+    print("\n=== 測試結束 ===")
+
+if __name__ == "__main__":
+    main()
+
+# // 功能: AI 批次分析測試
+# // input: 假的 Gemini client
+# // output: 終端機列印測試結果 (失敗時 AssertionError)
@@ -0,0 +1,118 @@
+# 新增 [test_database.py] 區塊 A: 資料庫寫入與查詢測試 (Temporary Database)
+# 修正原因：驗證 bulk_upsert_books 整批失敗時退回逐筆寫入，且 book_tags 與 books 保持同步；
+#           以及 query_books / query_book_summaries 的篩選、排序、分頁與 count_books；以暫存資料庫執行。
+# 替換/新增指示：這是新檔案，請放置於專案根目錄。執行方式：python test_database.py (或 pytest test_database.py)
+
+from datetime import date
+
+from modules import database
+from modules.models import BookFilters, BookStatus, SortOrder, SUMMARY_PREVIEW_CHARS
+from testing_helpers import make_book, temp_library
+
+# 書名為「壞資料」的資料列一律寫入失敗 (模擬 CHECK / 觸發器拒絕)
+_REJECT_TRIGGER = '''
+    CREATE TRIGGER reject_bad_row BEFORE INSERT ON books
+    WHEN NEW.title = '壞資料'
+    BEGIN SELECT RAISE(ABORT, 'bad row'); END
+'''
+
+def _tags_by_book() -> dict:
+    tags = {}
+    for book_id, tag in database.get_all_book_tags():
+        tags.setdefault(book_id, set()).add(tag)
+    return tags
+
+def test_bulk_upsert_falls_back_to_row_by_row():
+    existing = [make_book("b0", tags=["舊標籤"]), make_book("b3", tags=["保留"])]
+    with temp_library(existing):
+        with database.get_connection() as conn:
+            conn.execute(_REJECT_TRIGGER)
+            conn.commit()
+        books = [make_book(f"b{i}", tags=[f"標籤{i}"]) for i in range(6)]
+        books[3] = make_book("b3", title="壞資料", tags=["不該寫入"])
+
+        result = database.bulk_upsert_books(books)
+
+        assert result.success == 5
+        assert result.failures == [(3, "bad row")] and result.failed == 1
+        assert sorted(b.id for b in database.get_all_books()) == ["b0", "b1", "b2", "b3", "b4", "b5"]
+        # 失敗的資料列連同其標籤一起回滾，其餘資料列的標籤已覆寫
+        assert database.get_book("b3").title == "書名b3"
+        assert _tags_by_book() == {
+            "b0": {"標籤0"}, "b1": {"標籤1"}, "b2": {"標籤2"}, "b3": {"保留"}, "b4": {"標籤4"}, "b5": {"標籤5"},
+        }
+
+# 查詢測試用書庫：b / c 同日同作者 (依書名排序)，d / e 同日同作者同書名 (依 id 排序)
+_LIBRARY = [
+    make_book("a", title="甲", author="貓貓", tags=["言情", "古代"], added=date(2025, 1, 5),
+              status=BookStatus.COMPLETED, completed=date(2025, 2, 1), rating=5),
+    make_book("b", title="乙", author="狗狗", tags=["言情"], added=date(2025, 2, 10), status=BookStatus.READING),
+    make_book("c", title="丙", author="狗狗", tags=["現代"], added=date(2025, 2, 10)),
+    make_book("d", title="丁", author="兔兔", tags=["古代"], added=date(2025, 3, 1),
+              ai_summary="AI 尚未分析", official_desc="文" * 100),
+    make_book("e", title="丁", author="兔兔", added=date(2025, 3, 1), status=BookStatus.COMPLETED,
+              ai_summary="一本關於修仙的書"),
+]
+
+def _query_ids(filters=None, sort=SortOrder.NEWEST, limit=None, offset=0) -> list:
+    ids = [b.id for b in database.query_books(filters, sort, limit, offset)]
+    # 摘要投影版本的篩選、排序、分頁必須與完整版一致
+    assert [s.id for s in database.query_book_summaries(filters, sort, limit, offset)] == ids
+    return ids
+
+def test_query_books_filters():
+    with temp_library(_LIBRARY):
+        assert _query_ids(BookFilters(tags=["言情"])) == ["b", "a"]
+        assert _query_ids(BookFilters(tags=["言情", "現代"])) == ["c", "b", "a"]     # 標籤之間為 OR
+        assert _query_ids(BookFilters(statuses=[BookStatus.COMPLETED])) == ["e", "a"]
+        assert _query_ids(BookFilters(authors=["狗狗"])) == ["c", "b"]
+        assert _query_ids(BookFilters(tags=["古代"], statuses=[BookStatus.UNREAD])) == ["d"]   # 不同條件之間為 AND
+        assert _query_ids(BookFilters(added_from=date(2025, 2, 10), added_to=date(2025, 2, 28))) == ["c", "b"]
+        assert _query_ids(BookFilters(keyword="修仙")) == ["e"]
+        assert _query_ids(BookFilters(tags=["不存在"])) == []
+        assert _query_ids(BookFilters()) == _query_ids(None)
+
+def test_query_books_sort_and_paging():
+    with temp_library(_LIBRARY):
+        # 日期 -> 作者 -> 書名 -> id
+        newest = ["d", "e", "c", "b", "a"]
+        assert _query_ids(sort=SortOrder.NEWEST) == newest
+        assert _query_ids(sort=SortOrder.OLDEST) == ["a", "c", "b", "d", "e"]
+        assert _query_ids(limit=2) == newest[:2]
+        assert _query_ids(limit=2, offset=2) == newest[2:4]
+        assert _query_ids(limit=2, offset=4) == newest[4:]
+        assert _query_ids(limit=2, offset=10) == []
+        assert _query_ids(BookFilters(tags=["言情", "古代"]), SortOrder.OLDEST, limit=1, offset=1) == ["b"]
+
+def test_query_book_summaries_fields():
+    with temp_library(_LIBRARY):
+        by_id = {s.id: s for s in database.query_book_summaries()}
+        a = by_id["a"]
+        assert (a.title, a.author, a.status, a.user_rating) == ("甲", "貓貓", BookStatus.COMPLETED, 5)
+        assert (a.added_date, a.completed_date) == (date(2025, 1, 5), date(2025, 2, 1))
+        # AI 尚未分析時以官方文案開頭作為預覽，並在 SQL 端截斷
+        assert by_id["d"].ai_summary == "文" * (SUMMARY_PREVIEW_CHARS + 1)
+        assert by_id["e"].ai_summary == "一本關於修仙的書"
+
+def test_count_books():
+    with temp_library(_LIBRARY):
+        assert database.count_books() == 5
+        assert database.count_books(BookFilters(added_from=date(2025, 2, 10))) == 4
+        assert database.count_books(BookFilters(added_from=date(2025, 3, 2))) == 0
+        assert database.count_books(BookFilters(added_from=date(2025, 2, 1), statuses=[BookStatus.UNREAD])) == 2
+        assert database.count_books(BookFilters(tags=["言情", "古代"])) == 3   # 同時有兩個標籤的書只算一次
+
+def main():
+    print("=== 開始進行資料庫測試 ===\n")
+    for test in (test_bulk_upsert_falls_back_to_row_by_row, test_query_books_filters, test_query_books_sort_and_paging,
+                 test_query_book_summaries_fields, test_count_books):
+        test()
+        print(f"✅ {test.__name__}")
+    print("\n=== 測試結束 ===")
+
+if __name__ == "__main__":
+    main()
+
+# // 功能: 資料庫寫入與查詢測試
+# // input: 暫存資料庫
+# // output: 終端機列印測試結果 (失敗時 AssertionError)
@@ -0,0 +1,129 @@
+# 新增 [test_http_cache.py] 區塊 A: 爬蟲回應快取測試 (HttpCache)
+# 修正原因：以假的回應驗證新鮮期 (TTL) 過期、ETag / Last-Modified 條件請求 (304 後重設新鮮期)、
+#           離線模式與 gzip 壓縮往返；使用暫存快取檔，不需網路。
+# 替換/新增指示：這是新檔案，請放置於專案根目錄。執行方式：python test_http_cache.py (或 pytest test_http_cache.py)
+
+import os
+import tempfile
+import time
+from contextlib import contextmanager
+from unittest import mock
+
+import requests
+
+from modules import http_cache, resilience, scraper
+from modules.http_cache import HttpCache
+
+TTL = 60
+URL = "https://cache.example.test/book/1?utm_source=feed"
+PAGE = "<html><head><title>快取測試</title></head><body>" + "文案內容" * 500 + "</body></html>"
+
+def _response(status: int = 200, body: bytes = PAGE.encode("utf-8"), headers: dict = None) -> requests.Response:
+    response = requests.Response()
+    response.status_code = status
+    response._content = body
+    response.headers = requests.structures.CaseInsensitiveDict(headers or {})
+    response.encoding = "utf-8"
+    response.url = URL
+    return response
+
+class _Clock:
+    """可手動前進的時鐘 (取代 http_cache 模組中的 time)"""
+    def __init__(self):
+        self.now = time.time()
+
+    def time(self) -> float:
+        return self.now
+
+@contextmanager
+def _temp_cache():
+    """暫存目錄中的 HttpCache，並以可控時鐘取代 http_cache.time"""
+    clock = _Clock()
+    with tempfile.TemporaryDirectory() as workdir, mock.patch.object(http_cache, "time", clock):
+        cache = HttpCache(os.path.join(workdir, "http_cache.db"), ttl=TTL)
+        try:
+            yield cache, clock
+        finally:
+            cache.close()
+
+@contextmanager
+def _fake_fetch(cache: HttpCache, outcomes: list):
+    """讓 scraper._fetch 使用暫存快取，並依序回傳 outcomes；記錄每次請求帶的條件請求標頭"""
+    sent = []
+    def request_once(strategy, url, validators):
+        sent.append(dict(validators))
+        return outcomes[len(sent) - 1]
+    with mock.patch.object(scraper, "_http_cache", cache), \
+            mock.patch.object(scraper, "_request_once", request_once), \
+            mock.patch.dict(resilience._breakers, clear=True):
+        yield sent
+
+def test_ttl_expiry():
+    with _temp_cache() as (cache, clock):
+        assert cache.get(URL) is None
+        cache.put(URL, _response())
+        assert cache.get(URL).fresh
+        assert cache.get(URL.replace("?utm_source=feed", "#top")).fresh   # 正規化後為同一鍵
+        assert not cache.get(URL, refresh=True).fresh
+
+        clock.now += TTL + 1
+        entry = cache.get(URL)
+        assert entry is not None and not entry.fresh and entry.body == PAGE.encode("utf-8")
+        assert cache.stats()["hits"] == 2 and cache.stats()["misses"] == 1
+
+def test_revalidation_304_then_touch():
+    validators = {"ETag": '"v1"', "Last-Modified": "Wed, 01 Jan 2025 00:00:00 GMT"}
+    strategy = scraper._GENERIC
+    with _temp_cache() as (cache, clock), \
+            _fake_fetch(cache, [_response(headers={**validators, "Content-Type": "text/html", "Set-Cookie": "x=1"}),
+                                _response(304, b"")]) as sent:
+        assert scraper._fetch(strategy, URL).text == PAGE
+        assert sent == [{}]
+        assert cache.get(URL).headers == {**validators, "Content-Type": "text/html"}   # 只保留驗證與型別標頭
+
+        assert scraper._fetch(strategy, URL).text == PAGE    # 新鮮期內不連線
+        assert len(sent) == 1
+
+        clock.now += TTL + 1
+        response = scraper._fetch(strategy, URL)
+        assert sent[1] == {"If-None-Match": '"v1"', "If-Modified-Since": validators["Last-Modified"]}
+        assert response.status_code == 200 and response.text == PAGE   # 304 沿用快取內容
+        entry = cache.get(URL)
+        assert entry.fresh and entry.fetched_at == clock.now               # touch 重設新鮮期
+        assert cache.stats()["revalidated"] == 1 and cache.stats()["misses"] == 1
+
+def test_offline_mode():
+    with _temp_cache() as (cache, clock), _fake_fetch(cache, []) as sent, \
+            mock.patch.object(http_cache, "OFFLINE", True):
+        cache.put(URL, _response())
+        clock.now += TTL * 10
+        assert cache.get(URL).fresh                               # 離線時過期的項目也可直接使用
+        assert scraper._fetch(scraper._GENERIC, URL).text == PAGE
+        assert scraper._fetch(scraper._GENERIC, "https://cache.example.test/missing") is None
+        assert sent == []                                         # 完全不連線
+
+def test_gzip_round_trip():
+    body = PAGE.encode("big5", errors="ignore") + bytes(range(256))
+    with _temp_cache() as (cache, _):
+        cache.put(URL, _response(body=body))
+        raw, size = cache._connect().execute("SELECT body, size FROM responses").fetchone()
+        assert raw[:2] == b"\x1f\x8b" and size == len(raw) < len(body)
+        entry = cache.get(URL)
+        assert entry.body == body and entry.encoding == "utf-8" and entry.status_code == 200
+        response = entry.to_response()
+        assert response.content == body and response.url == URL
+        assert cache.stats()["bytes"] == size
+
+def main():
+    print("=== 開始進行回應快取測試 ===\n")
+    for test in (test_ttl_expiry, test_revalidation_304_then_touch, test_offline_mode, test_gzip_round_trip):
+        test()
+        print(f"✅ {test.__name__}")
+    print("\n=== 測試結束 ===")
+
+if __name__ == "__main__":
+    main()
+
+# // 功能: 爬蟲回應快取測試
+# // input: 假的 requests.Response / 暫存快取檔
+# // output: 終端機列印測試結果 (失敗時 AssertionError)
@@ -0,0 +1,97 @@
+# 新增 [test_import_pipeline.py] 區塊 A: 匯入管線測試 (batch_importer.run_pipeline)
+# 修正原因：以假的爬蟲、AI 與資料庫驗證各階段重疊進行、佇列背壓與計數，不需網路、API Key 與資料庫。
+# 替換/新增指示：這是新檔案，請放置於專案根目錄。執行方式：python test_import_pipeline.py (或 pytest test_import_pipeline.py)
+
+import asyncio
+from contextlib import asynccontextmanager, contextmanager
+from unittest import mock
+
+import batch_importer
+from batch_importer import CsvBookCandidate
+from modules import ai_agent, database, scraper
+from modules.ai_agent import AIAnalysisResult
+from modules.models import BookStatus
+from modules.scraper import RawBookData
+
+def _candidate(i: int, url: str = None) -> CsvBookCandidate:
+    return CsvBookCandidate(f"書名{i}", f"作者{i}", url if url is not None else f"https://example.test/{i}",
+                            "", 0, BookStatus.UNREAD, [], "Gaming_CSV")
+
+@contextmanager
+def _fake_stages(scrape_delay: float = 0.0, ai_delay: float = 0.0, queue_size: int = None):
+    """假的爬蟲 / AI / 入庫；events 依序記錄 ("scraped" | "ai" | "written", 本數)"""
+    events = []
+
+    @asynccontextmanager
+    async def async_scraper(max_in_flight):
+        async def scrape(url):
+            await asyncio.sleep(scrape_delay)
+            events.append(("scraped", 1))
+            if url.endswith("/down"):
+                return None
+            i = url.rsplit("/", 1)[1]
+            return RawBookData(f"書名{i}", f"作者{i}", "文案" * 20, "測試", url)
+        yield scrape
+
+    async def analyze_books_async(books, **kwargs):
+        await asyncio.sleep(ai_delay)
+        events.append(("ai", len(books)))
+        return [AIAnalysisResult(tags=["言情"], summary="評論", plot=raw.title) for raw in books]
+
+    def bulk_upsert_books(books):
+        events.append(("written", len(books)))
+        return database.BulkUpsertResult(success=len(books))
+
+    with mock.patch.object(scraper, "async_scraper", async_scraper), \
+            mock.patch.object(ai_agent, "analyze_books_async", analyze_books_async), \
+            mock.patch.object(database, "bulk_upsert_books", bulk_upsert_books), \
+            mock.patch.multiple(batch_importer, QUEUE_SIZE=queue_size or batch_importer.QUEUE_SIZE,
+                                BATCH_WAIT_SECONDS=0.01, PROGRESS_INTERVAL=60):
+        yield events
+
+def test_counts_duplicates_and_failures():
+    candidates = [_candidate(i) for i in range(30)] + [_candidate(99, "https://example.test/down"), _candidate(98, "")]
+    existing = {"dup": batch_importer.build_book(batch_importer.draft_candidate(
+        candidates[0], None, [], verbose=False), None)}
+    report = []
+    with _fake_stages() as events:
+        stats = asyncio.run(batch_importer.run_pipeline(candidates, existing, report, scrape_workers=4, ai_workers=2))
+    assert stats == {"SUCCESS": 31, "SKIPPED": 1, "ERROR": 0}
+    assert sum(n for kind, n in events if kind == "written") == 31
+    assert sum(n for kind, n in events if kind == "ai") == 29   # 爬取失敗與沒有網址的書資訊不足，不送 AI
+    assert [row["原始網址"] for row in report] == ["https://example.test/down"]
+
+def test_stages_overlap():
+    candidates = [_candidate(i) for i in range(60)]
+    with _fake_stages(scrape_delay=0.01) as events:
+        asyncio.run(batch_importer.run_pipeline(candidates, {}, [], scrape_workers=2, ai_workers=2))
+    kinds = [kind for kind, _ in events]
+    last_scrape = len(kinds) - 1 - kinds[::-1].index("scraped")
+    assert kinds.index("ai") < last_scrape and kinds.index("written") < last_scrape   # 爬取尚未結束就已分析、入庫
+
+def test_slow_stage_applies_back_pressure():
+    candidates = [_candidate(i) for i in range(80)]
+    queue_size, ai_workers = 5, 1
+    with _fake_stages(ai_delay=0.02, queue_size=queue_size) as events:
+        asyncio.run(batch_importer.run_pipeline(candidates, {}, [], scrape_workers=4, ai_workers=ai_workers))
+    scraped = analyzed = ahead = 0
+    for kind, n in events:
+        scraped += n if kind == "scraped" else 0
+        analyzed += n if kind == "ai" else 0
+        ahead = max(ahead, scraped - analyzed)
+    # 爬蟲最多領先 AI：佇列上限 + 各爬取工作者手上的 1 本 + AI 工作者手上的一批
+    assert ahead <= queue_size + 4 + ai_workers * ai_agent.BATCH_SIZE
+
+def main():
+    print("=== 開始進行匯入管線測試 ===\n")
+    for test in (test_counts_duplicates_and_failures, test_stages_overlap, test_slow_stage_applies_back_pressure):
+        test()
+        print(f"✅ {test.__name__}")
+    print("\n=== 測試結束 ===")
+
+if __name__ == "__main__":
+    main()
+
+# // 功能: 匯入管線測試
+# // input: 假的爬蟲 / AI / 資料庫
+# // output: 終端機列印測試結果 (失敗時 AssertionError)
@@ -0,0 +1,111 @@
+# 新增 [test_library_index.py] 區塊 A: 記憶體索引測試 (LibraryIndex)
+# 修正原因：驗證增量維護 (upsert / remove)、分頁排序 (同分時以 id 排序)、KPI 統計，
+#           以及篩選 + 排序 + 分頁結果與 SQL 的 query_books 一致。
+# 替換/新增指示：這是新檔案，請放置於專案根目錄。執行方式：python test_library_index.py (或 pytest test_library_index.py)
+
+import random
+from datetime import date
+
+from modules import database
+from modules.library_index import LibraryIndex
+from modules.models import BookFilters, BookStatus, BookSummary, SortOrder
+from testing_helpers import make_book, temp_library
+
+TODAY = date(2025, 3, 15)
+
+def _index(*books) -> LibraryIndex:
+    return LibraryIndex.build([BookSummary.from_book(b) for b in books],
+                              [(b.id, tag) for b in books for tag in b.tags])
+
+def _ids(summaries) -> list:
+    return [s.id for s in summaries]
+
+def test_upsert_and_remove_keep_sets_and_orders():
+    a = make_book("a", author="貓貓", tags=["言情", "古代"], added=date(2025, 1, 1))
+    b = make_book("b", author="狗狗", tags=["言情"], added=date(2025, 2, 1))
+    index = _index(a, b)
+    assert index.by_tag["言情"] == {"a", "b"} and index.by_author["貓貓"] == {"a"}
+
+    moved = make_book("a", author="狗狗", status=BookStatus.COMPLETED, tags=["現代"], added=date(2025, 3, 1))
+    index.upsert(BookSummary.from_book(moved), moved.tags)
+    assert len(index) == 2
+    assert "古代" not in index.by_tag and index.by_tag["言情"] == {"b"} and index.by_tag["現代"] == {"a"}
+    assert "貓貓" not in index.by_author and index.by_author["狗狗"] == {"a", "b"}
+    assert index.by_status[BookStatus.COMPLETED] == {"a"} and index.by_status[BookStatus.UNREAD] == {"b"}
+    assert _ids(index.page(None, SortOrder.NEWEST)) == ["a", "b"]
+    assert index.all_authors() == ["狗狗"]
+
+    index.remove("a")
+    index.remove("missing")   # 不存在時忽略
+    assert len(index) == 1 and _ids(index.page(None, SortOrder.OLDEST)) == ["b"]
+    assert index.all_tags() == ["言情"] and index.by_author["狗狗"] == {"b"}
+    assert index.candidates(BookFilters(authors=["狗狗"])) == {"b"}
+
+def test_page_breaks_ties_by_id():
+    same = dict(author="同一位", title="同名", added=date(2025, 1, 1))
+    books = [make_book(book_id, **same) for book_id in ("c", "a", "b")]
+    index = _index(*books)
+    for sort in SortOrder:
+        assert _ids(index.page(None, sort)) == ["a", "b", "c"]
+        assert _ids(index.page({"a", "c"}, sort)) == ["a", "c"]      # 小候選集合走直接排序
+        assert _ids(index.page(None, sort, limit=1, offset=1)) == ["b"]
+    index.upsert(BookSummary.from_book(make_book("0", **same)), [])
+    assert _ids(index.page(None, SortOrder.NEWEST, limit=2)) == ["0", "a"]
+
+def test_kpi_stats():
+    books = [
+        make_book("a", status=BookStatus.COMPLETED, completed=date(2025, 3, 2), rating=5),
+        make_book("b", status=BookStatus.COMPLETED, completed=date(2025, 2, 28), rating=3),
+        make_book("c", status=BookStatus.READING, completed=date(2025, 3, 3)),   # 非完食不計入本月
+        make_book("d", status=BookStatus.UNREAD, rating=4),
+    ]
+    index = _index(*books)
+    assert index.kpi_stats(today=TODAY) == {"total": 4, "completed": 2, "this_month": 1, "avg_rating": 4.0}
+    assert index.kpi_stats({"b", "c"}, today=TODAY) == {"total": 2, "completed": 1, "this_month": 0, "avg_rating": 3.0}
+    index.remove("a")
+    assert index.kpi_stats(today=TODAY) == {"total": 3, "completed": 1, "this_month": 0, "avg_rating": 3.5}
+
+def _random_books(n: int, seed: int = 7) -> list:
+    rng = random.Random(seed)
+    authors, tags = ["貓貓", "狗狗", "兔兔", ""], ["言情", "古代", "現代", "系統", "甜寵"]
+    books = []
+    for i in range(n):
+        books.append(make_book(
+            f"{rng.randrange(10 ** 6):06d}-{i}", title=rng.choice(["甲", "乙", "丙"]), author=rng.choice(authors),
+            status=rng.choice(list(BookStatus)), tags=rng.sample(tags, rng.randrange(3)),
+            added=date(2025, rng.randrange(1, 4), rng.randrange(1, 4)),   # 大量同日、同作者、同書名的平手
+        ))
+    return books
+
+def test_matches_sql_query_books():
+    books = _random_books(300)
+    filter_cases = [
+        None, BookFilters(), BookFilters(tags=["言情", "系統"]), BookFilters(statuses=[BookStatus.COMPLETED]),
+        BookFilters(authors=["貓貓", ""]), BookFilters(added_from=date(2025, 2, 1), added_to=date(2025, 2, 2)),
+        BookFilters(tags=["古代"], statuses=[BookStatus.UNREAD, BookStatus.READING], authors=["狗狗"]),
+        BookFilters(tags=["不存在的標籤"]),
+    ]
+    with temp_library(books):
+        index = LibraryIndex.build(database.query_book_summaries(), database.get_all_book_tags())
+        for filters in filter_cases:
+            candidates = index.candidates(filters)
+            assert index.count(candidates) == database.count_books(filters), filters
+            for sort in SortOrder:
+                for limit, offset in [(None, 0), (20, 0), (20, 40), (7, 290)]:
+                    expected = [b.id for b in database.query_books(filters, sort, limit, offset)]
+                    assert _ids(index.page(candidates, sort, limit, offset)) == expected, (filters, sort, limit, offset)
+
+def main():
+    print("=== 開始進行記憶體索引測試 ===\n")
+    for test in (test_upsert_and_remove_keep_sets_and_orders, test_page_breaks_ties_by_id, test_kpi_stats,
+                 test_matches_sql_query_books):
+        test()
+        print(f"✅ {test.__name__}")
+    print("\n=== 測試結束 ===")
+
+if __name__ == "__main__":
+    main()
+
+# // 功能: 記憶體索引測試
+# // input: 測試用書籍 / 暫存資料庫
+# // output: 終端機列印測試結果 (失敗時 AssertionError)
@@ -0,0 +1,201 @@
+# 新增 [test_migrations.py] 區塊 A: 資料庫 Migration 測試 (Fixture Databases)
+# 修正原因：以各個歷史版本的資料庫佈局為 fixture，驗證 init_db() 能一次升級到最新 schema。
+# 替換/新增指示：這是新檔案，請放置於專案根目錄。執行方式：python test_migrations.py (或 pytest test_migrations.py)
+
+import json
+import os
+import sqlite3
+import tempfile
+from unittest import mock
+
+from modules import database, services
+from modules.models import Book
+
+# === 歷史版本佈局 (Fixtures) ===
+
+# v0 (初版)：含 word_count / chapters 欄位，無任何索引
+LEGACY_WITH_WORD_COUNT = '''
+    CREATE TABLE books (
+        id TEXT PRIMARY KEY, title TEXT NOT NULL, author TEXT, source TEXT, url TEXT,
+        status TEXT, tags TEXT, ai_summary TEXT, official_desc TEXT, ai_plot_analysis TEXT,
+        word_count INTEGER, chapters INTEGER,
+        added_date TEXT, completed_date TEXT, user_rating INTEGER, user_review TEXT
+    )
+'''
+
+# v1.0：移除字數欄位後的 books 表 (尚無 schema_version)
+LEGACY_V1 = '''
+    CREATE TABLE books (
+        id TEXT PRIMARY KEY, title TEXT NOT NULL, author TEXT, source TEXT, url TEXT,
+        status TEXT, tags TEXT, ai_summary TEXT, official_desc TEXT, ai_plot_analysis TEXT,
+        added_date TEXT, completed_date TEXT, user_rating INTEGER, user_review TEXT
+    )
+'''
+
+# 版本表導入前、已有索引與 book_tags 但標籤表內容過期的資料庫
+LEGACY_PRE_VERSIONING = LEGACY_V1 + ''';
+    CREATE INDEX idx_books_author ON books(author);
+    CREATE TABLE book_tags (book_id TEXT NOT NULL, tag TEXT NOT NULL, PRIMARY KEY (book_id, tag));
+    INSERT INTO book_tags VALUES ('stale', '過期標籤');
+'''
+
+FIXTURE_LAYOUTS = {
+    "legacy_with_word_count": LEGACY_WITH_WORD_COUNT,
+    "legacy_v1": LEGACY_V1,
+    "legacy_pre_versioning": LEGACY_PRE_VERSIONING,
+}
+
+SAMPLE_ROWS = [
+    ("b1", "重生之我是大魔王", "貓貓", ["言情", "古代", "重生"], "已完食", "2025-01-02", "2025-02-03"),
+    ("b2", "系統甜寵日常", "狗狗", ["言情", "現代", "系統", "甜寵"], "未讀", "2025-03-04", None),
+    ("b3", "無標籤的書", "兔兔", [], "閱讀中", "2025-05-06", None),
+]
+
+def _build_fixture(path: str, ddl: str):
+    conn = sqlite3.connect(path)
+    conn.executescript(ddl)
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(books)")}
+    for book_id, title, author, tags, status, added, completed in SAMPLE_ROWS:
+        row = {
+            "id": book_id, "title": title, "author": author, "source": "測試", "url": "",
+            "status": status, "tags": json.dumps(tags, ensure_ascii=False),
+            "ai_summary": "短評", "official_desc": f"{title}的官方文案", "ai_plot_analysis": "分析",
+            "added_date": added, "completed_date": completed, "user_rating": 3, "user_review": "",
+        }
+        if "word_count" in columns:
+            row.update(word_count=123456, chapters=99)
+        cols = ", ".join(row)
+        marks = ", ".join(f":{c}" for c in row)
+        conn.execute(f"INSERT INTO books ({cols}) VALUES ({marks})", row)
+    conn.commit()
+    conn.close()
+
+def _migrate_fixture(layout: str, workdir: str) -> str:
+    path = os.path.join(workdir, f"{layout}.db")
+    if layout in FIXTURE_LAYOUTS:
+        _build_fixture(path, FIXTURE_LAYOUTS[layout])
+    database.close_connections()
+    database.DB_PATH = path
+    database.init_db()
+    return path
+
+def _assert_latest_schema(path: str, expected_books: int):
+    conn = sqlite3.connect(path)
+    try:
+        version = conn.execute("SELECT MAX(version) FROM schema_version").fetchone()[0]
+        assert version == database.SCHEMA_VERSION, f"schema 版本錯誤: {version}"
+
+        columns = [row[1] for row in conn.execute("PRAGMA table_info(books)")]
+        assert columns == database.BOOK_COLUMNS, f"books 欄位不符: {columns}"
+
+        indexes = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+        for name in ["idx_books_status", "idx_books_added", "idx_books_added_desc", "idx_books_completed",
+                     "idx_books_author", "idx_book_tags_tag"]:
+            assert name in indexes, f"缺少索引 {name}"
+
+        assert conn.execute("SELECT COUNT(*) FROM books").fetchone()[0] == expected_books
+        conn.execute("INSERT INTO books_fts(books_fts) VALUES ('integrity-check')")
+    finally:
+        conn.close()
+
+# === 測試案例 ===
+
+def test_migrate_each_historical_layout():
+    with tempfile.TemporaryDirectory() as workdir, mock.patch.object(database, "DB_PATH", database.DB_PATH):
+        try:
+            for layout in FIXTURE_LAYOUTS:
+                path = _migrate_fixture(layout, workdir)
+                _assert_latest_schema(path, len(SAMPLE_ROWS))
+
+                books = {b.id: b for b in database.get_all_books()}
+                assert books["b1"].tags == ["言情", "古代", "重生"]
+                assert books["b2"].completed_date is None
+                assert database.get_tag_counts(1) == [("言情", 2)], layout
+                assert "過期標籤" not in database.get_all_tags(), layout
+                assert [b.id for b in database.search_books("大魔王")] == ["b1"], layout
+                database.close_connections()
+        finally:
+            database.close_connections()
+
+def test_fresh_database_and_rerun_is_noop():
+    with tempfile.TemporaryDirectory() as workdir, mock.patch.object(database, "DB_PATH", database.DB_PATH):
+        try:
+            path = _migrate_fixture("fresh", workdir)
+            _assert_latest_schema(path, 0)
+            with database.get_connection() as conn:
+                assert database.migrate(conn) == []
+                assert database.get_schema_version(conn) == database.SCHEMA_VERSION
+        finally:
+            database.close_connections()
+
+def test_migrate_without_fts5():
+    """SQLite 未支援 FTS5 時仍能升級與開啟資料庫，搜尋改走子字串比對"""
+    with tempfile.TemporaryDirectory() as workdir, \
+            mock.patch.multiple(database, DB_PATH=database.DB_PATH, _fts_tokenizer=lambda conn: None):
+        try:
+            path = _migrate_fixture("legacy_v1", workdir)
+            conn = sqlite3.connect(path)
+            try:
+                assert conn.execute("SELECT MAX(version) FROM schema_version").fetchone()[0] == database.SCHEMA_VERSION
+                assert conn.execute("SELECT COUNT(*) FROM sqlite_master WHERE name LIKE 'books_fts%'").fetchone()[0] == 0
+            finally:
+                conn.close()
+            database.insert_book(Book(id="b4", title="大魔王的甜寵日常", author="貓貓", url=""))
+            assert [b.id for b in database.search_books("大魔王")] == ["b4", "b1"]   # 書名皆命中時新加入的在前
+            assert [b.id for b in database.search_books("甜寵日常 貓")] == ["b4"]
+            assert database.match_book_ids("大魔王*") == {"b1", "b4"}
+        finally:
+            database.close_connections()
+
+def test_foreign_write_during_own_write_rebuilds_index():
+    """寫入前後混入其他連線 (模擬其他程序) 的寫入時，索引不可沿用，下次讀取需整批重建"""
+    update_book, bump_generation = database.update_book, database._bump_generation
+    with tempfile.TemporaryDirectory() as workdir, mock.patch.object(database, "DB_PATH", database.DB_PATH), \
+            mock.patch.object(services, "_index", None):
+        try:
+            path = _migrate_fixture("legacy_v1", workdir)
+            assert services.count_books() == len(SAMPLE_ROWS)
+
+            def foreign_insert(book_id):
+                conn = sqlite3.connect(path)
+                conn.execute("INSERT INTO books (id, title, author, url, status, tags, added_date) "
+                             "VALUES (?, '外部寫入', '某人', '', '未讀', '[]', '2025-06-07')", (book_id,))
+                conn.commit()
+                conn.close()
+
+            def update_after_foreign(book):
+                foreign_insert("x1")
+                update_book(book)
+
+            with mock.patch.object(database, "update_book", update_after_foreign):
+                services.save_book_changes(Book(id="own1", title="自己的寫入", author="我", url=""))
+            assert services.count_books() == len(SAMPLE_ROWS) + 2
+
+            def bump_after_foreign():
+                foreign_insert("x2")
+                bump_generation()
+
+            with mock.patch.object(database, "_bump_generation", bump_after_foreign):
+                services.save_book_changes(Book(id="own2", title="自己的寫入", author="我", url=""))
+            assert services.count_books() == len(SAMPLE_ROWS) + 4
+
+            services.remove_book("own2")   # 沒有其他寫入時照常增量更新
+            assert services._index is not None
+            assert services.count_books() == len(SAMPLE_ROWS) + 3
+        finally:
+            database.close_connections()
+
+def main():
+    print("=== 開始進行資料庫 Migration 測試 ===\n")
+    for case in [test_migrate_each_historical_layout, test_fresh_database_and_rerun_is_noop, test_migrate_without_fts5,
+                 test_foreign_write_during_own_write_rebuilds_index]:
+        case()
+        print(f"✅ {case.__name__}")
+    print("\n=== 測試結束 ===")
+
+if __name__ == "__main__":
+    main()
+
+# // 功能: 資料庫 Migration 驗證腳本
+# // input: 內建歷史版本 fixture 佈局
+# // output: 終端機列印測試結果 (失敗時 AssertionError)
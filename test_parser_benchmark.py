@@ -0,0 +1,41 @@
+# 新增 [test_parser_benchmark.py] 區塊 A: 爬蟲策略效能測試 (pytest-benchmark)
+# 修正原因：在無網路環境量測每個策略的解析速度 (頁/秒) 與峰值記憶體。
+#           內建 fixture 為小型合成頁面，數字只供前後比較；要抓到真實頁面的效能退化需先以 fixture_harness.py record 錄製真實頁面。
+# 替換/新增指示：這是新檔案，請放置於專案根目錄。執行方式：pytest test_parser_benchmark.py
+#   (需安裝 pytest-benchmark；未安裝時整個檔案略過)
+
+import tracemalloc
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from fixture_harness import load_fixtures, replay
+
+FIXTURES = load_fixtures()
+STRATEGIES = sorted({f.strategy for f in FIXTURES})
+
+def _parse_all(pages):
+    return [replay(f) for f in pages]
+
+@pytest.mark.parametrize("strategy", STRATEGIES)
+def test_parse_throughput(benchmark, strategy):
+    pages = [f for f in FIXTURES if f.strategy == strategy]
+
+    # 峰值記憶體 (單獨量測一次，避免 tracemalloc 影響計時)
+    tracemalloc.start()
+    _parse_all(pages)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    results = benchmark(_parse_all, pages)
+    assert len(results) == len(pages)
+
+    benchmark.extra_info["pages"] = len(pages)
+    benchmark.extra_info["peak_memory_kb"] = round(peak / 1024, 1)
+    if benchmark.stats:
+        benchmark.extra_info["pages_per_sec"] = round(len(pages) / benchmark.stats.stats.mean, 1)
+
+# // 功能: 爬蟲策略效能測試 (頁/秒、峰值記憶體)
+# // input: fixtures/html 錄製頁面
+# // output: pytest-benchmark 報表 (extra_info 含 pages_per_sec / peak_memory_kb)
@@ -0,0 +1,156 @@
+# 新增 [test_parsers.py] 區塊 A: 爬蟲策略離線回歸測試 (Fixture Replay)
+# 修正原因：以 fixtures/html 中的頁面 (手寫的合成頁面，見 README) 離線驗證每個爬蟲策略的 parse 結果，不需網路。
+# 替換/新增指示：這是新檔案，請放置於專案根目錄。執行方式：pytest test_parsers.py (或 python test_parsers.py)
+
+from dataclasses import asdict
+from unittest import mock
+
+import pytest
+from bs4 import BeautifulSoup
+
+from fixture_harness import load_fixtures, replay
+from modules import html_stream, rate_limit, scraper, site_registry
+
+FIXTURES = load_fixtures()
+
+# 每個策略至少要有一個 fixture 覆蓋
+STRATEGIES = {
+    "jjwxc": scraper.JjwxcScraper, "banxia": scraper.BanxiaScraper, "czbooks": scraper.CzbooksScraper,
+    "fc2": scraper.Fc2Scraper, "books": scraper.BooksScraper, "popo": scraper.PopoScraper,
+    "generic": scraper.GenericScraper,
+}
+
+@pytest.mark.parametrize("fixture", FIXTURES, ids=lambda f: f"{f.strategy}/{f.name}")
+def test_parse_matches_recorded_result(fixture):
+    assert isinstance(scraper._get_scraper(fixture.url), STRATEGIES[fixture.strategy])
+    assert asdict(replay(fixture)) == fixture.expected
+
+@pytest.mark.parametrize("fixture", FIXTURES, ids=lambda f: f"{f.strategy}/{f.name}")
+def test_fast_path_agrees_with_soup_path(fixture):
+    strategy = scraper._get_scraper(fixture.url)
+    fast = strategy._parse_fast(scraper._fast_doc(fixture.html), fixture.url)
+    if fast is not None:   # 快速路徑有結果時，必須與 BeautifulSoup 路徑相同
+        assert fast == strategy._parse_soup(BeautifulSoup(fixture.html, "lxml"), fixture.url)
+
+def test_fast_path_skips_beautifulsoup():
+    """每個策略至少有一個 fixture 不需建立 BeautifulSoup 樹即可解析"""
+    fast = set()
+    with mock.patch.object(scraper, "BeautifulSoup", side_effect=AssertionError("建立了 BeautifulSoup 樹")):
+        for fixture in FIXTURES:
+            try:
+                assert asdict(replay(fixture)) == fixture.expected
+                fast.add(fixture.strategy)
+            except AssertionError:
+                pass
+    assert fast == set(STRATEGIES), f"未走快速路徑: {set(STRATEGIES) - fast}"
+
+def test_fast_text_matches_get_text():
+    html = "<div id='x'> 作者：<b>貓貓</b><!-- 註解 --><script>var a = 1;</script><style>.a{}</style>\n<br>簡介 <i> 一 </i>二</div>"
+    element = scraper._fast_doc(html).xpath('//div[@id="x"]')[0]
+    tag = BeautifulSoup(html, "lxml").find("div", id="x")
+    assert scraper._fast_text(element) == tag.get_text()
+    assert scraper._fast_text(element, strip=True) == tag.get_text(strip=True)
+
+def test_every_strategy_has_fixtures():
+    covered = {f.strategy for f in FIXTURES}
+    assert covered == set(STRATEGIES), f"缺少 fixture: {set(STRATEGIES) - covered}"
+
+@pytest.mark.parametrize("url, strategy, source", [
+    ("https://my.jjwxc.net/onebook.php?novelid=1", scraper.JjwxcScraper, "my.jjwxc.net"),
+    ("https://www.banxia.co/books/1.html", scraper.BanxiaScraper, "banxia.co"),
+    ("https://m.xbanxia-new.com/books/1.html", scraper.BanxiaScraper, "m.xbanxia-new.com"),
+    ("https://www.69shuba.com:443/book/1.htm", scraper.BanxiaScraper, "69書吧"),
+    ("http://egg.blog.fc2.com/blog-entry-1.html", scraper.Fc2Scraper, "FC2部落格"),
+    ("https://www.bookwalker.com.tw/product/79083", scraper.GenericScraper, "BOOKWALKER"),
+    ("https://tw.ixdzs8.com/read/1/", scraper.GenericScraper, "愛下電子書"),
+    ("https://example.com/?ref=jjwxc", scraper.GenericScraper, "example.com"),
+])
+def test_routing_by_hostname(url, strategy, source):
+    assert type(scraper._get_scraper(url)) is strategy
+    assert scraper._get_scraper(url) is scraper._get_scraper(url)  # 策略為單例
+    assert scraper._GENERIC._source_name(url) == source
+
+def test_host_level_config():
+    assert scraper._is_blacklisted("https://www.eslite.com/product/1")
+    assert not scraper._is_blacklisted("https://www.books.com.tw/products/1")
+    assert scraper._GENERIC._request_headers("https://www.books.com.tw/products/1") == {"User-Agent": scraper.DESKTOP_UA}
+    assert scraper._GENERIC._encoding("https://www.jjwxc.net/onebook.php", "text/html; charset=utf-8", b"") == "gb18030"
+    assert rate_limit.resolve_limit("https://m.banxia.cc/1")[0] == rate_limit.resolve_limit("https://www.xbanxia.cc/2")[0]
+    assert rate_limit.resolve_limit("https://unknown.example.org/x") == ("unknown.example.org", rate_limit.DEFAULT_LIMIT)
+
+def test_register_site_plugin():
+    class DemoScraper(scraper.GenericScraper): pass
+    try:
+        scraper.register_site("demo", ["demo-novel.test"], strategy=DemoScraper(), source_name="示範書城")
+        assert isinstance(scraper._get_scraper("https://m.demo-novel.test/b/1"), DemoScraper)
+        assert scraper.DOMAIN_NAME_MAP["demo-novel.test"] == "示範書城"
+    finally:
+        site_registry._by_suffix.pop("demo-novel.test", None)
+        site_registry.DOMAIN_NAME_MAP.pop("demo-novel.test", None)
+        site_registry._lookup_host.cache_clear()
+
+# 簡介之後還有大量章節列表的長頁面，用來驗證串流下載提前停止不影響解析結果
+FILLER = "<div class='chapters'>" + "<p>第一章 章節標題</p>" * 20000 + "</div>"
+
+def _chunks(data: bytes, size: int = 4096):
+    return (data[i:i + size] for i in range(0, len(data), size))
+
+def _has_intro_markers(fixture) -> bool:
+    markers = scraper._get_scraper(fixture.url).stream_markers
+    return bool(markers) and all(m in fixture.html.encode("utf-8") for m in markers)
+
+@pytest.mark.parametrize("fixture", [f for f in FIXTURES if _has_intro_markers(f)], ids=lambda f: f"{f.strategy}/{f.name}")
+def test_early_stop_keeps_parse_result(fixture):
+    strategy = scraper._get_scraper(fixture.url)
+    page = fixture.html.replace("</body>", FILLER + "</body>").encode("utf-8")
+    content, truncated, complete = html_stream.read_capped(_chunks(page), strategy.stream_markers)
+    assert truncated and complete and len(content) < len(page) // 2
+    assert asdict(strategy.parse(content.decode("utf-8", "ignore"), fixture.url)) == fixture.expected
+
+def test_read_capped_limits_size():
+    content, truncated, complete = html_stream.read_capped(_chunks(b"x" * 100_000), max_bytes=10_000)
+    assert truncated and complete and len(content) == 10_000
+    content, truncated, complete = html_stream.read_capped(_chunks(b"<html></html>"), (b"novelintro",))
+    assert not truncated and complete and content == b"<html></html>"
+    # 找到簡介標記前就達到上限：內容不完整 (不應寫入快取)
+    page = b"<html><head></head><body>" + b"x" * 100_000 + b"<div id='novelintro'></div>"
+    content, truncated, complete = html_stream.read_capped(_chunks(page), (b"novelintro",), max_bytes=10_000)
+    assert truncated and not complete
+
+def test_markers_in_head_are_ignored():
+    head = b"<html><head><style>.novelintro { color: red; }</style></head><body>"
+    intro = b"<div class='novelintro'>real intro</div>"
+    page = head + b"<p>x</p>" * 10_000 + intro + FILLER.encode("utf-8")
+    content, truncated, complete = html_stream.read_capped(_chunks(page), (b"novelintro",))
+    assert truncated and complete and intro in content
+
+def test_detect_encoding_prefers_declared_charset():
+    body = "<html><head><meta charset='gbk'></head><body>晉江文學城</body></html>".encode("gb18030")
+    assert html_stream.detect_encoding("text/html; charset=UTF-8", body) == "utf-8"
+    assert html_stream.detect_encoding("text/html", body) == "gb18030"
+    assert html_stream.detect_encoding(None, "<p>沒有宣告編碼的頁面</p>".encode("utf-8") * 20) == "utf-8"
+
+def main():
+    print("=== 開始進行解析器回歸測試 ===\n")
+    test_every_strategy_has_fixtures()
+    for fixture in FIXTURES:
+        test_parse_matches_recorded_result(fixture)
+        test_fast_path_agrees_with_soup_path(fixture)
+        print(f"✅ {fixture.strategy}/{fixture.name}")
+        if _has_intro_markers(fixture):
+            test_early_stop_keeps_parse_result(fixture)
+    test_fast_path_skips_beautifulsoup()
+    test_fast_text_matches_get_text()
+    test_read_capped_limits_size()
+    test_markers_in_head_are_ignored()
+    test_host_level_config()
+    test_register_site_plugin()
+    test_detect_encoding_prefers_declared_charset()
+    print("\n=== 測試結束 ===")
+
+if __name__ == "__main__":
+    main()
+
+# // 功能: 爬蟲策略離線回歸測試
+# // input: fixtures/html 合成頁面
+# // output: 終端機列印測試結果 (失敗時 AssertionError)
@@ -0,0 +1,209 @@
+# 新增 [test_resilience.py] 區塊 A: 爬蟲重試 / 斷路器測試 (Retry & Circuit Breaker)
+# 修正原因：以假的網路回應驗證 429/5xx 重試、斷路後立即失敗，以及 scrape_book 留下的結構化失敗原因；
+#           asyncio 後端的 Cloudflare 站點只請求一次，改走 cloudscraper 時與 httpx 共用站點的同時連線數。不需網路。
+# 替換/新增指示：這是新檔案，請放置於專案根目錄。執行方式：python test_resilience.py (或 pytest test_resilience.py)
+
+import asyncio
+import threading
+import time
+from contextlib import contextmanager
+from unittest import mock
+
+import httpx
+import requests
+
+from modules import rate_limit, resilience, scraper
+from modules.resilience import CircuitBreaker, FailureKind, RetryPolicy
+
+NO_WAIT = RetryPolicy(max_attempts=3, base_delay=0, max_delay=0)
+
+def _response(status: int, body: bytes = b"<html><head><title>t</title></head></html>") -> requests.Response:
+    response = requests.Response()
+    response.status_code = status
+    response._content = body
+    response.encoding = "utf-8"
+    return response
+
+@contextmanager
+def _fake_network(outcomes: list, policy: RetryPolicy = NO_WAIT):
+    """依序回傳 outcomes (回應或例外)；略過快取與等待，每次測試使用新的斷路器"""
+    calls = []
+    def request_once(strategy, url, validators):
+        calls.append(url)
+        outcome = outcomes[min(len(calls), len(outcomes)) - 1]
+        if isinstance(outcome, Exception): raise outcome
+        return outcome
+    with mock.patch.multiple(scraper, _request_once=request_once, SCRAPE_RETRY=policy,
+                             _lookup_cache=lambda url, refresh=False: (None, None),
+                             _store_response=lambda url, entry, response: response), \
+            mock.patch.dict(resilience._breakers, clear=True):
+        yield calls
+
+def test_retries_transient_status_then_succeeds():
+    url = "https://retry.example.test/book/1"
+    with _fake_network([_response(503), _response(429), _response(200)]) as calls:
+        data = scraper.scrape_book(url)
+    assert len(calls) == 3 and data is not None
+    assert resilience.last_failure(url) is None
+
+def test_gives_up_with_structured_reason():
+    url = "https://down.example.test/book/1"
+    with _fake_network([requests.ConnectTimeout("timed out")]) as calls:
+        assert scraper.scrape_book(url) is None
+    failure = resilience.last_failure(url)
+    assert len(calls) == 3
+    assert failure.kind is FailureKind.TIMEOUT and failure.attempts == 3 and failure.retryable
+    assert "連線逾時" in failure.describe()
+
+def test_client_error_is_not_retried():
+    url = "https://gone.example.test/book/404"
+    with _fake_network([_response(404)]) as calls:
+        assert scraper.scrape_book(url) is None
+    failure = resilience.last_failure(url)
+    assert len(calls) == 1 and failure.kind is FailureKind.HTTP_STATUS and failure.status == 404
+    assert not failure.retryable
+
+def test_invalid_url_is_not_retried_and_skips_breaker():
+    with _fake_network([_response(200)]) as calls:
+        for url in ("", "notaurl", "ftp://example.test/book"):
+            assert scraper.scrape_book(url) is None
+            failure = resilience.last_failure(url)
+            assert failure.kind is FailureKind.INVALID_URL and not failure.retryable, url
+        assert calls == [] and resilience._breakers == {}   # 未送出請求，也沒有建立斷路器
+
+    url = "https://bad.example.test/book"   # 建立請求時才被 requests 拒絕的網址
+    with _fake_network([requests.exceptions.InvalidURL("bad")]) as calls:
+        assert scraper.scrape_book(url) is None
+        breaker = resilience.get_breaker(scraper.rate_limit.resolve_limit(url)[0])
+        assert len(calls) == 1 and breaker.state == "closed" and breaker._failures == 0
+    assert resilience.last_failure(url).kind is FailureKind.INVALID_URL
+
+def test_circuit_opens_and_fails_fast():
+    with _fake_network([_response(500)]) as calls:
+        scraper.scrape_book("https://flaky.example.test/a")   # 3 次失敗
+        scraper.scrape_book("https://flaky.example.test/b")   # 第 5 次失敗後斷路
+        sent = len(calls)
+        assert scraper.scrape_book("https://flaky.example.test/c") is None
+        assert len(calls) == sent  # 斷路中不再送出請求
+    assert resilience.last_failure("https://flaky.example.test/c").kind is FailureKind.CIRCUIT_OPEN
+
+def test_breaker_half_open_probe():
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=0)
+    breaker.record_failure(); breaker.record_failure()
+    assert breaker.allow()          # 逾時後放行一個試探請求
+    assert not breaker.allow()      # 試探進行中，其他請求仍失敗
+    breaker.record_success()
+    assert breaker.state == "closed" and breaker.allow()
+
+def test_probe_answered_with_429_is_released():
+    url = "https://probe.example.test/book/1"
+    with _fake_network([_response(429)], RetryPolicy(max_attempts=1, base_delay=0, max_delay=0)) as calls:
+        breaker = resilience.get_breaker(scraper.rate_limit.resolve_limit(url)[0])
+        breaker.reset_timeout = 0
+        for _ in range(breaker.failure_threshold):
+            breaker.record_failure()
+        assert scraper.scrape_book(url) is None and len(calls) == 1   # 試探請求收到 429
+        assert breaker.state == "half-open" and breaker.allow()     # 試探已釋放，下一個請求可再試探
+    assert resilience.last_failure(url).kind is FailureKind.RATE_LIMITED
+
+def test_backoff_is_bounded_and_honours_retry_after():
+    policy = RetryPolicy(base_delay=1.0, max_delay=8.0)
+    assert all(0 <= policy.delay(attempt) <= min(8.0, 2 ** (attempt - 1)) for attempt in range(1, 8))
+    assert policy.delay(1, retry_after="5") >= 5
+    assert policy.delay(1, retry_after="120") == 8.0
+
+@contextmanager
+def _fake_async_backends(on_httpx, on_cloudscraper):
+    """以 on_httpx 取代 _fetch_async、on_cloudscraper 取代同步的 scrape_book；記錄兩條路徑收到的網址"""
+    calls = {"httpx": [], "cloudscraper": []}
+    async def fetch_async(strategy, url, client, slots, refresh=False):
+        calls["httpx"].append(url)
+        return await on_httpx(url, slots)
+    def scrape_book(url, refresh=False):
+        calls["cloudscraper"].append(url)
+        return on_cloudscraper(url)
+    with mock.patch.object(scraper, "_fetch_async", fetch_async), \
+            mock.patch.object(scraper, "scrape_book", scrape_book), \
+            mock.patch.object(scraper, "_challenged_sites", set()):
+        yield calls
+
+def _forbidden(url):
+    request = httpx.Request("GET", url)
+    return httpx.HTTPStatusError("403", request=request, response=httpx.Response(403, request=request))
+
+def test_cloudflare_sites_are_requested_once():
+    async def on_httpx(url, slots):
+        raise _forbidden(url)
+    async def run(urls):
+        slots = rate_limit.AsyncDomainSlots()
+        return [await scraper.scrape_book_async(url, None, slots) for url in urls]
+
+    with _fake_async_backends(on_httpx, lambda url: url) as calls:
+        # 註冊為 cloudflare 的站點不先以 httpx 嘗試
+        assert asyncio.run(run(["https://czbooks.net/n/abc"])) == ["https://czbooks.net/n/abc"]
+        assert calls == {"httpx": [], "cloudscraper": ["https://czbooks.net/n/abc"]}
+        # 未註冊的站點回應 403 後改走 cloudscraper，同站點的後續網址直接改走 cloudscraper
+        urls = ["https://shield.example.test/1", "https://shield.example.test/2"]
+        assert asyncio.run(run(urls)) == urls
+        assert calls["httpx"] == urls[:1] and calls["cloudscraper"][1:] == urls
+
+def test_thread_fallback_shares_async_domain_limit():
+    limit = rate_limit.DomainLimit(concurrency=2, rate=1000.0, burst=1000)
+    site_registry = scraper.site_registry
+    in_flight, peak, lock = [0], [0], threading.Lock()
+
+    @contextmanager
+    def track():
+        with lock:
+            in_flight[0] += 1
+            peak[0] = max(peak[0], in_flight[0])
+        try:
+            yield
+        finally:
+            with lock:
+                in_flight[0] -= 1
+
+    async def on_httpx(url, slots):
+        async with slots.slot(url):
+            with track():
+                await asyncio.sleep(0.02)
+        return _response(200)
+    def on_cloudscraper(url):
+        with rate_limit.domain_slot(url), track():
+            time.sleep(0.02)
+        return url
+
+    async def run(urls):
+        slots = rate_limit.AsyncDomainSlots()
+        return await asyncio.gather(*(scraper.scrape_book_async(url, None, slots) for url in urls))
+
+    urls = [f"https://limited.example.test/{i}/{'cf' if i % 2 else 'ok'}" for i in range(8)]
+    with mock.patch.dict(site_registry._by_suffix), mock.patch.dict(rate_limit._limiters), \
+            _fake_async_backends(on_httpx, on_cloudscraper) as calls, \
+            mock.patch.object(scraper, "_needs_cloudscraper", lambda url: url.endswith("/cf")):
+        site_registry.register_site("limited", ["limited.example.test"], limit=limit)
+        try:
+            results = asyncio.run(run(urls))
+        finally:
+            site_registry._lookup_host.cache_clear()
+    assert len(calls["httpx"]) == 4 and len(calls["cloudscraper"]) == 4 and all(results)
+    assert peak[0] == limit.concurrency     # httpx 與執行緒中的 cloudscraper 合計不超過站點的同時連線數
+
+def main():
+    print("=== 開始進行爬蟲重試 / 斷路器測試 ===\n")
+    for test in (test_retries_transient_status_then_succeeds, test_gives_up_with_structured_reason,
+                 test_client_error_is_not_retried, test_invalid_url_is_not_retried_and_skips_breaker,
+                 test_circuit_opens_and_fails_fast,
+                 test_breaker_half_open_probe, test_probe_answered_with_429_is_released,
+                 test_backoff_is_bounded_and_honours_retry_after, test_cloudflare_sites_are_requested_once,
+                 test_thread_fallback_shares_async_domain_limit):
+        test()
+        print(f"✅ {test.__name__}")
+    print("\n=== 測試結束 ===")
+
+if __name__ == "__main__":
+    main()
+
+# // 功能: 爬蟲重試 / 斷路器測試
+# // input: 假的網路回應
+# // output: 終端機列印測試結果 (失敗時 AssertionError)
@@ -0,0 +1,48 @@
+# 新增 [test_services.py] 區塊 A: 服務層讀取快取測試 (LibraryCache)
+# 修正原因：驗證查詢結果快取的命中、未命中，以及任何寫入後整批失效；以暫存資料庫執行，不需網路。
+# 替換/新增指示：這是新檔案，請放置於專案根目錄。執行方式：python test_services.py (或 pytest test_services.py)
+
+from modules import database, services
+from testing_helpers import make_book, temp_library
+
+def test_cache_hit_miss_and_invalidation():
+    with temp_library([make_book("a"), make_book("b")]):
+        start = services.get_cache_stats()
+        first = services.get_books()
+        second = services.get_books()
+        stats = services.get_cache_stats()
+        assert (stats["misses"] - start["misses"], stats["hits"] - start["hits"]) == (1, 1)
+        assert [b.id for b in first] == [b.id for b in second]
+        assert first[0] is second[0]          # 命中時直接回傳快取中的物件，不做複製
+        assert first is not second            # 清單本身為淺複本，呼叫端可自行增刪
+
+        services.remove_book("a")
+        after = services.get_books()
+        assert [b.id for b in after] == ["b"]
+        assert services.get_cache_stats()["misses"] - start["misses"] == 2
+
+        # 繞過服務層直接寫入資料庫也會讓快取失效
+        database.insert_book(make_book("c"))
+        assert sorted(b.id for b in services.get_books()) == ["b", "c"]
+
+def test_get_book_returns_independent_copy():
+    with temp_library([make_book("a", tags=["言情"])]):
+        cached = services.get_books()[0]
+        book = services.get_book("a")
+        book.tags.append("古代")
+        book.title = "改過的書名"
+        assert cached.tags == ["言情"] and cached.title == "書名a"
+
+def main():
+    print("=== 開始進行服務層快取測試 ===\n")
+    for test in (test_cache_hit_miss_and_invalidation, test_get_book_returns_independent_copy):
+        test()
+        print(f"✅ {test.__name__}")
+    print("\n=== 測試結束 ===")
+
+if __name__ == "__main__":
+    main()
+
+# // 功能: 服務層讀取快取測試
+# // input: 暫存資料庫
+# // output: 終端機列印測試結果 (失敗時 AssertionError)
@@ -0,0 +1,93 @@
+# 新增 [test_session_pool.py] 區塊 A: 爬蟲 Session 連線池測試 (SessionPool)
+# 修正原因：驗證 HTTP 狀態碼錯誤時 session 仍歸還重用、連線層錯誤時關閉丟棄、閒置超過時限後不再借出；
+#           以假的 session 與可控時鐘執行，不需網路。
+# 替換/新增指示：這是新檔案，請放置於專案根目錄。執行方式：python test_session_pool.py (或 pytest test_session_pool.py)
+
+from unittest import mock
+
+import requests
+
+from modules import session_pool
+from modules.session_pool import SessionPool
+
+URL = "https://pool.example.test/book/1"
+
+class _FakeSession:
+    def __init__(self):
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+class _Clock:
+    """可手動前進的時鐘 (取代 session_pool 模組中的 time)"""
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+def _checkout_raising(pool: SessionPool, error: BaseException) -> _FakeSession:
+    """借用 session 並在 with 區塊內拋出 error，回傳被借出的 session"""
+    try:
+        with pool.checkout(URL) as session:
+            raise error
+    except type(error):
+        return session
+    raise AssertionError("例外未傳出 checkout")
+
+def test_session_returned_on_http_error():
+    pool = SessionPool(_FakeSession)
+    session = _checkout_raising(pool, requests.HTTPError("404 Client Error"))
+    assert not session.closed
+    with pool.checkout(URL.replace("/1", "/2")) as again:
+        assert again is session
+    assert pool.stats() == {"created": 1, "reused": 1, "idle": 1}
+
+def test_session_closed_on_transport_error():
+    pool = SessionPool(_FakeSession)
+    for error in (requests.ConnectionError("reset"), requests.Timeout("timed out"), KeyboardInterrupt()):
+        session = _checkout_raising(pool, error)
+        assert session.closed, error
+        assert pool.stats()["idle"] == 0
+    with pool.checkout(URL) as fresh:
+        assert fresh is not session and not fresh.closed
+    assert pool.stats()["created"] == 4 and pool.stats()["reused"] == 0
+
+def test_session_expires_after_idle_limit():
+    clock = _Clock()
+    with mock.patch.object(session_pool, "time", clock):
+        pool = SessionPool(_FakeSession, idle_seconds=300)
+        with pool.checkout(URL) as first:
+            pass
+        clock.now += 300
+        with pool.checkout(URL) as second:
+            assert second is first                     # 剛好到時限仍可重用
+        clock.now += 301
+        with pool.checkout(URL) as third:
+            assert third is not first and first.closed   # 過期的 session 被關閉並改建新的
+    assert pool.stats() == {"created": 2, "reused": 1, "idle": 1}
+
+def test_idle_sessions_are_capped_per_host():
+    pool = SessionPool(_FakeSession, max_idle_per_host=1)
+    with pool.checkout(URL) as a, pool.checkout(URL) as b, pool.checkout("https://other.example.test/") as c:
+        assert len({id(a), id(b), id(c)}) == 3       # 借出中的 session 不會重複借給他人
+    # with 由內而外歸還：b 先歸還並保留，a 超過同網域的閒置上限而直接關閉
+    assert a.closed and not b.closed and not c.closed
+    pool.close_all()
+    assert b.closed and c.closed and pool.stats()["idle"] == 0
+
+def main():
+    print("=== 開始進行 Session 連線池測試 ===\n")
+    for test in (test_session_returned_on_http_error, test_session_closed_on_transport_error,
+                 test_session_expires_after_idle_limit, test_idle_sessions_are_capped_per_host):
+        test()
+        print(f"✅ {test.__name__}")
+    print("\n=== 測試結束 ===")
+
+if __name__ == "__main__":
+    main()
+
+# // 功能: 爬蟲 Session 連線池測試
+# // input: 假的 session / 可控時鐘
+# // output: 終端機列印測試結果 (失敗時 AssertionError)
@@ -0,0 +1,52 @@
+# 新增 [test_text_normalize.py] 區塊 A: 批次簡繁轉換測試 (convert_many)
+# 修正原因：convert_many 以換行串接多個字串一次轉換，需驗證結果與逐一呼叫 OpenCC 完全相同
+#           (含空字串、重複字串、本身含換行、跨字串可能組成詞組等邊界情況)。
+# 替換/新增指示：這是新檔案，請放置於專案根目錄。執行方式：python test_text_normalize.py (或 pytest test_text_normalize.py)
+
+from collections import OrderedDict
+from unittest import mock
+
+from opencc import OpenCC
+
+from modules import text_normalize
+
+TEXTS = [
+    "", "我的青春恋爱物语果然有问题", "", "头", "发", "头发", "理发", "发展", "系统", "干净",   # 「头」「发」相鄰時不可被當成「頭髮」
+    "作者：佚名", "  前后空白  ", " ", "\t", "第一行\n第二行", "\n", "尾端换行\n", "\r\n回车换行\r\n", "回车\r换行", "分\u2028隔",
+    "头发", "我的青春恋爱物语果然有问题", "English only 123", "皇后：后来", "🙂表情符号",
+]
+
+def _expected(config: str) -> list:
+    converter = OpenCC(config)
+    return [converter.convert(t) if t else t for t in TEXTS]
+
+def test_convert_many_matches_per_string_opencc():
+    for config in ("s2t", "s2twp"):
+        with mock.patch.object(text_normalize, "_memo", OrderedDict()):
+            assert text_normalize.convert_many(TEXTS, config) == _expected(config), config
+            # 第二次全部由記憶命中，結果仍相同；單本轉換也共用同一份記憶
+            assert text_normalize.convert_many(TEXTS, config) == _expected(config), config
+            assert [text_normalize.convert(t, config) for t in TEXTS] == _expected(config), config
+
+def test_convert_many_edge_cases():
+    with mock.patch.object(text_normalize, "_memo", OrderedDict()):
+        assert text_normalize.convert_many([]) == []
+        assert text_normalize.convert_many(["", ""]) == ["", ""]
+        assert text_normalize.convert_many(iter(["发", "发"])) == ["發", "發"]     # 接受任意 iterable，重複字串只轉換一次
+        assert len(text_normalize._memo) == 1
+        # 含換行的字串不參與合併 (否則會打亂切分位置)，其餘字串的位置仍正確
+        assert text_normalize.convert_many(["a\nb", "发", "\n\n", "头"]) == ["a\nb", "發", "\n\n", "頭"]
+
+def main():
+    print("=== 開始進行批次簡繁轉換測試 ===\n")
+    for test in (test_convert_many_matches_per_string_opencc, test_convert_many_edge_cases):
+        test()
+        print(f"✅ {test.__name__}")
+    print("\n=== 測試結束 ===")
+
+if __name__ == "__main__":
+    main()
+
+# // 功能: 批次簡繁轉換測試
+# // input: 測試字串
+# // output: 終端機列印測試結果 (失敗時 AssertionError)
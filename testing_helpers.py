@@ -0,0 +1,44 @@
+# 新增 [testing_helpers.py] 區塊 A: 測試共用工具 (Temporary Library Database)
+# 修正原因：資料庫 / 服務層的測試都需要一個暫存的資料庫檔案，並在結束 (含失敗) 時還原連線池、快取與索引，
+#           集中在此，避免各測試檔自行儲存、還原模組全域變數。
+# 替換/新增指示：這是新檔案，請放置於專案根目錄 (非測試檔，由 test_*.py 匯入)。
+
+import os
+import tempfile
+from contextlib import contextmanager
+from datetime import date
+from unittest import mock
+
+from modules import database, services
+from modules.models import Book, BookStatus
+
+@contextmanager
+def temp_library(books=()):
+    """
+    以暫存目錄中的新資料庫取代 database.DB_PATH (with 區塊)
+    books 會先以 bulk_upsert_books 寫入；離開時關閉連線並清空服務層快取與索引。
+    """
+    with tempfile.TemporaryDirectory() as workdir, \
+            mock.patch.object(database, "DB_PATH", os.path.join(workdir, "library.db")):
+        services._cache.clear()
+        services._index = None
+        try:
+            database.init_db()
+            if books:
+                database.bulk_upsert_books(books)
+            yield workdir
+        finally:
+            database.close_connections()
+            services._cache.clear()
+            services._index = None
+
+def make_book(book_id: str, title: str = None, author: str = "作者", status: BookStatus = BookStatus.UNREAD,
+              tags=(), added: date = date(2025, 1, 1), completed: date = None, rating: int = 0, **fields) -> Book:
+    """測試用書籍 (只需指定關心的欄位)"""
+    return Book(id=book_id, title=title or f"書名{book_id}", author=author, url=f"https://example.test/{book_id}",
+                status=status, tags=list(tags), added_date=added, completed_date=completed, user_rating=rating,
+                **fields)
+
+# // 功能: 測試共用工具
+# // input: 測試用書籍
+# // output: 暫存資料庫 (with 區塊)
@@ -30,7 +30,12 @@ def render_detail_dialog():
         st.rerun()
         return
 
-    book: Book = st.session_state.selected_book
+    # // 【關鍵修正點】 列表只保存摘要 (BookSummary)，開啟詳情時才讀取完整書籍
+    book = services.get_book(st.session_state.selected_book.id)
+    if book is None:
+        st.session_state.selected_book = None
+        st.rerun()
+        return
 
     # 上下文檢查
     if "last_viewed_book_id" not in st.session_state:
@@ -159,6 +164,8 @@ def _render_edit_mode(book: Book):
     # AI 重跑功能
     with st.expander("🤖 進階功能：重新觸發 AI 分析", expanded=False):
         st.caption("使用下方輸入框的內容進行分析 (不需先存檔)。")
+        # 內容未變時預設直接使用快取結果 (不重新呼叫 Gemini)
+        force_refresh = st.checkbox("略過快取，強制重新生成", key=f"ai_refresh_{book.id}")
         
         if st.button("🚀 僅重跑 AI 分析", use_container_width=True):
             draft_desc = st.session_state.get(k_desc, book.official_desc)
@@ -171,7 +178,7 @@ def _render_edit_mode(book: Book):
                 with st.spinner("🤖 AI 正在閱讀草稿..."):
                     try:
                         mock_data = MockScrapedData(draft_title, draft_author, draft_desc, url=book.url)
-                        ai_res = ai_agent.analyze_book(mock_data)
+                        ai_res = ai_agent.analyze_book(mock_data, refresh=force_refresh)
                         if ai_res:
                             book.tags = ai_res.tags
                             book.ai_summary = ai_res.summary
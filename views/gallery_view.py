@@ -3,10 +3,10 @@
 # 替換/新增指示：請完全替換 views/gallery_view.py。
 
 import streamlit as st
-from modules.models import Book
+from modules.models import BookSummary
 from modules import ui_helper
 
-def render_view(books: list[Book], cols_num: int = 5):
+def render_view(books: list[BookSummary], cols_num: int = 5):
     """
     渲染畫廊視圖 (Pure Renderer)
     修正：預設欄位改為 5
@@ -3,7 +3,7 @@
 # 替換/新增指示：請完全替換 views/list_view.py。
 
 import streamlit as st
-from modules.models import Book, BookStatus
+from modules.models import BookStatus, BookSummary
 from modules import ui_helper 
 
 def render_status_badge(status: BookStatus):
@@ -17,7 +17,7 @@ def render_rating(rating: int):
         return '<span style="color: #ccc;">-</span>'
     return f'<span style="color: #D4AF37; font-size: 1rem;">{"★" * rating}</span>'
 
-def render_view(books: list[Book]):
+def render_view(books: list[BookSummary]):
     """渲染列表視圖 (List Item Style)"""
     if not books:
         st.info("📚 找不到符合條件的書籍。")
@@ -66,7 +66,8 @@ def render_view(books: list[Book]):
             st.markdown(f"<div style='{center_style}'>{render_rating(book.user_rating)}</div>", unsafe_allow_html=True)
             
         with col4: # 短評
-            text = book.ai_summary if (book.ai_summary and book.ai_summary != "AI 尚未分析") else book.official_desc
+            # ai_summary 已由資料庫截斷，AI 尚未分析時為官方文案開頭
+            text = book.ai_summary
             if len(text) > 40: text = text[:38] + "..."
             
             st.markdown(f"""
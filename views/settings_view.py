@@ -61,16 +61,17 @@ def render_view():
                     if st.button(f"🚀 開始批次抓取 ({len(urls)} 本)", type="primary", use_container_width=True):
                         progress_bar = st.progress(0)
                         status_text = st.empty()
-                        success_count = 0
-                        
-                        for i, url in enumerate(urls):
-                            status_text.text(f"正在處理 ({i+1}/{len(urls)}): {url} ...")
-                            try:
-                                if services.add_book(url):
-                                    success_count += 1
-                            except: pass
-                            progress_bar.progress((i + 1) / len(urls))
-                            time.sleep(0.5)
+
+                        stage_done = {"爬取": 0, "分析": 0}
+
+                        def on_progress(stage, done, url):
+                            # 爬取與 AI 分析重疊進行，兩個階段的回呼會交錯
+                            stage_done[stage] = done
+                            status_text.text(f"正在{stage} ({done}/{len(urls)}): {url} ...")
+                            progress_bar.progress(sum(stage_done.values()) / (2 * len(urls)))
+
+                        # 並行爬取 (各網站限流由 scraper 處理)，不需再逐本 sleep
+                        success_count = sum(1 for b in services.add_books(urls, progress=on_progress) if b)
                         
                         status_text.text("處理完成！")
                         st.success(f"🎉 批次結束：成功 {success_count} 本")
@@ -146,25 +147,36 @@ def render_view():
                 status_box = st.empty()
                 success = 0
                 
-                for i, book in enumerate(target_books):
-                    status_box.markdown(f"**正在分析**: {book.title} ...")
-                    
-                    # 嘗試重新爬取 + AI
-                    raw_data = scraper.scrape_book(book.url)
-                    if raw_data:
-                        ai_res = ai_agent.analyze_book(raw_data)
-                        if ai_res:
-                            book.title = raw_data.title
-                            book.author = raw_data.author
-                            book.official_desc = raw_data.description
-                            book.tags = ai_res.tags
-                            book.ai_summary = ai_res.summary
-                            book.ai_plot_analysis = ai_res.plot
-                            services.save_book_changes(book)
-                            success += 1
-                    
-                    progress_bar.progress((i + 1) / len(target_books))
-                    time.sleep(1)
+                # 先並行重新爬取，再以 analyze_books 批次 AI 分析 (CSV 匯入的書可能沒有網址，無法重新爬取)
+                with_url = [book for book in target_books if book.url]
+                status_box.markdown(f"**正在重新爬取** {len(with_url)} 本 ...")
+                scraped = scraper.scrape_many(
+                    [book.url for book in with_url],
+                    progress=lambda done, url, _: progress_bar.progress(done / (2 * max(len(with_url), 1)))
+                )
+                
+                pairs = [(book, raw_data) for book, raw_data in zip(with_url, scraped) if raw_data]
+                status_box.markdown(f"**正在分析** {len(pairs)} 本 ...")
+                analyzed = ai_agent.analyze_books(
+                    [raw_data for _, raw_data in pairs],
+                    progress=lambda done, total: progress_bar.progress(0.5 + done / (2 * max(total, 1)))
+                )
+                for (cached, raw_data), ai_res in zip(pairs, analyzed):
+                    # 清單中的 Book 為快取共用物件，修改前另讀一份
+                    book = services.get_book(cached.id) if ai_res else None
+                    if book:
+                        book.title = raw_data.title
+                        book.author = raw_data.author
+                        book.official_desc = raw_data.description
+                        book.tags = ai_res.tags
+                        book.ai_summary = ai_res.summary
+                        book.ai_plot_analysis = ai_res.plot
+                        services.save_book_changes(book)
+                        success += 1
+                progress_bar.progress(1.0)
+                ai_stats = ai_agent.pool_stats()
+                st.caption(f"AI 工作池：最近一分鐘完成 {ai_stats['per_minute']} 批 · "
+                           f"目前速率 {ai_stats['rpm']} RPM · 429 退避 {ai_stats['throttles']} 次")
                 
                 status_box.success(f"✅ 修復完成！成功 {success} 本")
                 time.sleep(2)